@@ -1,12 +1,28 @@
+import hmac
+import io
 import os
+import shlex
+import sqlite3
+import sys
 import logging
-import json
-from flask import Flask, render_template, request, flash, redirect, url_for, send_file, jsonify
+import time
+import click
+from flask import Flask, Response, abort, g, render_template, request, flash, redirect, url_for, send_file, jsonify
 from werkzeug.utils import secure_filename
 from werkzeug.middleware.proxy_fix import ProxyFix
-from document_parser import DocumentParser
+import json_codec
+from document_parser import DocumentParser, options_version
+from parse_cache import create_parse_cache
+from upload_store import UploadStore
+from parse_jobs import JobQueue, JobStore, QueueFullError, JOB_DONE, JOB_FAILED
+from json_patch import apply_patch, changed_items, touches_member, JsonPatchError
+from document_store import (create_document_store, document_summary, download_payload, keeping_metadata,
+                            migrate_json_documents, VersionConflictError)
+from search_index import SearchIndex
+from metrics import Metrics
+from profiling import ParseProfiler, ProfileStore
+from blueprint_conversion.api_version import api as legal_parser_api
 import tempfile
-import uuid
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -20,24 +36,236 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 UPLOAD_FOLDER = 'static/uploads'
 ALLOWED_EXTENSIONS = {'doc', 'docx', 'pdf'}
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+PDF_EXTRACTION_WORKERS = int(os.environ.get("PDF_EXTRACTION_WORKERS", "0"))  # 0 or 1 disables the process pool
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "50"))
+PDF_ENGINE = os.environ.get("PDF_ENGINE", "layout")  # layout (pdfplumber) or chars (character stream)
+DOCX_NUMBERING = os.environ.get("DOCX_NUMBERING", "0").lower() in ("1", "true", "yes")
+STRUCTURED_OUTPUT = os.environ.get("STRUCTURED_OUTPUT", "0").lower() in ("1", "true", "yes")
+PARSE_CACHE_BACKEND = os.environ.get("PARSE_CACHE_BACKEND", "memory")  # memory, disk or none
+PARSE_CACHE_DIR = os.environ.get("PARSE_CACHE_DIR", "parse_cache")
+PARSE_CACHE_MAX_BYTES = int(os.environ.get("PARSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+ASYNC_PARSE_MIN_BYTES = int(os.environ.get("ASYNC_PARSE_MIN_BYTES", "0"))  # 0 parses every upload in the request
+PARSE_JOB_DB = os.environ.get("PARSE_JOB_DB", "parse_jobs.sqlite3")
+PARSE_JOB_WORKERS = int(os.environ.get("PARSE_JOB_WORKERS", "2"))
+PARSE_JOB_MAX_PENDING = int(os.environ.get("PARSE_JOB_MAX_PENDING", "16"))
+PARSE_JOB_STALE_SECONDS = float(os.environ.get("PARSE_JOB_STALE_SECONDS", "3600"))
+DOCUMENT_STORE_BACKEND = os.environ.get("DOCUMENT_STORE_BACKEND", "json")  # json or sqlite
+DOCUMENT_DB = os.environ.get("DOCUMENT_DB", "documents.sqlite3")
+DOCUMENT_COMPRESSION = os.environ.get("DOCUMENT_COMPRESSION", "none")  # none, gzip or zstd (JSON backend only)
+SEARCH_DB = os.environ.get("SEARCH_DB", "search.sqlite3")
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "0").lower() in ("1", "true", "yes")
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))  # share of parses profiled, 0 to 1
+PROFILE_SLOW_SECONDS = float(os.environ.get("PROFILE_SLOW_SECONDS", "0"))  # 0 disables slow-parse capture
+PROFILE_ADMIN_TOKEN = os.environ.get("PROFILE_ADMIN_TOKEN", "")  # enables /admin/profiles and X-Profile-Token
+PROFILE_MAX_CAPTURES = int(os.environ.get("PROFILE_MAX_CAPTURES", "100"))
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+app.config['PDF_EXTRACTION_WORKERS'] = PDF_EXTRACTION_WORKERS
+app.config['PDF_PARALLEL_MIN_PAGES'] = PDF_PARALLEL_MIN_PAGES
+app.config['ASYNC_PARSE_MIN_BYTES'] = ASYNC_PARSE_MIN_BYTES
+
+
+def server_worker_count() -> int:
+    """Worker processes the server was started with, as far as its command line and environment tell.
+
+    Gunicorn workers are forked from the master, so they see its sys.argv;
+    workers set only in a Gunicorn config file are not detected.
+    """
+    args = shlex.split(os.environ.get("GUNICORN_CMD_ARGS", ""))
+    if 'gunicorn' in sys.argv[0]:
+        args += sys.argv[1:]
+
+    counts = [os.environ.get("WEB_CONCURRENCY", "1")]
+    for i, arg in enumerate(args):
+        if arg in ('-w', '--workers') and i + 1 < len(args):
+            counts.append(args[i + 1])
+        elif arg.startswith('--workers='):
+            counts.append(arg.split('=', 1)[1])
+        elif arg.startswith('-w') and not arg.startswith('--'):
+            counts.append(arg[2:])
+    return max((int(count) for count in counts if count.isdigit()), default=1)
+
+# Request, parser-stage and storage timings exported at /metrics when enabled. The values
+# live in this process only, so /metrics refuses to serve one worker's share of them
+metrics = Metrics(enabled=METRICS_ENABLED)
+SERVER_WORKERS = server_worker_count()
+if metrics.enabled and SERVER_WORKERS > 1:
+    logging.warning(f"METRICS_ENABLED is set but the server runs {SERVER_WORKERS} workers; "
+                    f"/metrics is single-process only and will answer 503")
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Uploaded files are stored once per content hash
+upload_store = UploadStore(UPLOAD_FOLDER)
+
+# Parse records live either as JSON files in the upload folder or in SQLite
+document_store = create_document_store(DOCUMENT_STORE_BACKEND, UPLOAD_FOLDER, db_path=DOCUMENT_DB,
+                                       compression=DOCUMENT_COMPRESSION)
+app.extensions['legal_parser_documents'] = document_store
+
+# Full-text index over saved records, served by /api/legal-parser/search
+search_index = SearchIndex(SEARCH_DB)
+app.extensions['legal_parser_search'] = search_index
+
+# Of the microservice API only the read routes are served: search and paged articles.
+# Parsing, batches and jobs go through this app's own upload flow.
+app.config['LEGAL_PARSER_API_ENDPOINTS'] = {'search', 'get_articles'}
+app.register_blueprint(legal_parser_api)
+
+# One parser is shared by every request and job thread; it keeps no per-call state
+document_parser = DocumentParser(extraction_workers=PDF_EXTRACTION_WORKERS,
+                                 parallel_min_pages=PDF_PARALLEL_MIN_PAGES,
+                                 pdf_engine=PDF_ENGINE,
+                                 docx_numbering=DOCX_NUMBERING,
+                                 metrics=metrics)
+
+# Parse results are cached by file content so re-uploads skip parsing;
+# results of non-default extraction options are cached under their own version
+parse_cache_version = options_version(PDF_ENGINE, DOCX_NUMBERING, STRUCTURED_OUTPUT)
+parse_cache = create_parse_cache(PARSE_CACHE_BACKEND, parse_cache_version,
+                                 directory=PARSE_CACHE_DIR, max_bytes=PARSE_CACHE_MAX_BYTES)
+
+# Parses can be profiled on demand, by sampling or when they turn out slow
+profiler = None
+if PROFILE_ADMIN_TOKEN or PROFILE_SAMPLE_RATE > 0 or PROFILE_SLOW_SECONDS > 0:
+    profiler = ParseProfiler(ProfileStore(PROFILE_DIR, max_captures=PROFILE_MAX_CAPTURES),
+                             sample_rate=PROFILE_SAMPLE_RATE, slow_seconds=PROFILE_SLOW_SECONDS)
+
+# Large uploads are parsed in the background so web workers stay free
+job_queue = None
+if ASYNC_PARSE_MIN_BYTES > 0:
+    job_queue = JobQueue(JobStore(PARSE_JOB_DB, stale_seconds=PARSE_JOB_STALE_SECONDS),
+                         max_workers=PARSE_JOB_WORKERS, max_pending=PARSE_JOB_MAX_PENDING)
+    # The API blueprint's job status route reads the same queue instead of a second, empty job database
+    app.extensions['legal_parser_jobs'] = job_queue
+    app.config['LEGAL_PARSER_API_ENDPOINTS'].add('get_job')
+
 # Custom filter for UTF-8 JSON display
 @app.template_filter('tojson_utf8')
 def tojson_utf8(obj, indent=None):
     """Convert object to JSON with proper UTF-8 encoding for display."""
-    return json.dumps(obj, ensure_ascii=False, indent=indent, separators=(',', ': '))
+    return json_codec.dumps(obj, pretty=bool(indent))
 
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension."""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def parse_upload(filepath, file_digest, filename=None, profile=False):
+    """Parse an uploaded file, going through the parse cache when enabled.
+    
+    profile=True skips the cache lookup so the parse really runs under the profiler.
+    """
+    def parse_document(path):
+        return document_parser.parse_document(path, structured=STRUCTURED_OUTPUT)
+    
+    def parse(path):
+        if profiler is None:
+            return parse_document(path)
+        return profiler.parse(parse_document, path, file_digest,
+                              force=profile, original_filename=filename)
+    
+    if parse_cache and not profile:
+        return parse_cache.get_or_parse(filepath, parse, digest=file_digest)
+    
+    result = parse(filepath)
+    if parse_cache:
+        parse_cache.put(file_digest, result)
+    return result
+
+def has_profile_token():
+    """Whether the request carries the profiling admin token in X-Profile-Token."""
+    token = request.headers.get('X-Profile-Token', '')
+    return bool(PROFILE_ADMIN_TOKEN) and hmac.compare_digest(token.encode(), PROFILE_ADMIN_TOKEN.encode())
+
+def write_result_record(result, filename, blob_path, file_extension):
+    """Store a parse result as a mevzuat_*.json record and return its filename."""
+    # Store original file info with result
+    result['_metadata'] = {
+        'original_filename': filename,
+        'original_file_path': blob_path,
+        'file_type': file_extension
+    }
+    
+    with metrics.timer('record_write_seconds', 'Time to store a parse result record.', operation='create'):
+        json_filename = document_store.create(result)
+    update_search_index(json_filename, result)
+    return json_filename
+
+def update_search_index(json_filename, document, articles=None):
+    """Re-index a saved record, or only the given article indexes of it.
+    
+    A failing index must not fail the save itself.
+    """
+    try:
+        with metrics.timer('search_index_seconds', 'Time to (re)index a record for full-text search.'):
+            if articles is None:
+                search_index.index_document(json_filename, document)
+            else:
+                search_index.index_articles(json_filename, document, articles)
+    except sqlite3.Error as e:
+        app.logger.warning(f"Search index update failed for {json_filename}: {str(e)}")
+
+if metrics.enabled:
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            # The route pattern keeps label cardinality bounded; unmatched URLs share one label
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            metrics.observe('http_request_seconds', 'Request latency by route.',
+                            time.perf_counter() - started, route=route, method=request.method)
+            metrics.inc('http_requests_total', 'Requests by route and status code.',
+                        route=route, method=request.method, status=response.status_code)
+        return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text exposition of the collected metrics."""
+    if not metrics.enabled:
+        abort(404)
+    if SERVER_WORKERS > 1:
+        return Response(f"Metrics are collected per process and the server runs {SERVER_WORKERS} workers; "
+                        f"run a single worker (with threads) to scrape /metrics\n",
+                        status=503, mimetype='text/plain; charset=utf-8')
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/admin/profiles')
+def list_profiles():
+    """Stored parse profiles, newest first."""
+    if profiler is None or not has_profile_token():
+        abort(404)
+    return jsonify({'success': True, 'profiles': profiler.store.list()})
+
+@app.route('/admin/profiles/<capture_id>')
+def get_profile(capture_id):
+    """Summary of one profile: top functions by cumulative time and top allocation sites."""
+    if profiler is None or not has_profile_token():
+        abort(404)
+    try:
+        return jsonify({'success': True, 'profile': profiler.store.load(capture_id)})
+    except KeyError:
+        abort(404)
+
+@app.route('/admin/profiles/<capture_id>/stats')
+def download_profile(capture_id):
+    """Binary cProfile stats of a profile, for pstats or snakeviz."""
+    if profiler is None or not has_profile_token():
+        abort(404)
+    try:
+        path = profiler.store.stats_path(capture_id)
+    except KeyError:
+        abort(404)
+    return send_file(os.path.abspath(path), as_attachment=True, download_name=f"{capture_id}.prof",
+                     mimetype='application/octet-stream')
+
 @app.route('/')
 def index():
     """Main page with file upload form."""
@@ -60,44 +288,53 @@ def upload_file():
             return redirect(request.url)
         
         if file and file.filename and allowed_file(file.filename):
-            # Generate unique filename to avoid conflicts
             filename = secure_filename(file.filename or "unknown")
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
             
-            # Save the uploaded file
-            file.save(filepath)
+            # Get file extension
+            file_extension = file.filename.rsplit('.', 1)[1].lower()
+            
+            # Save the uploaded file into the content-addressed store;
+            # identical uploads share a single blob
+            file_digest, blob_path = upload_store.save(file.stream, file_extension)
+            filepath = os.path.join(app.config['UPLOAD_FOLDER'], blob_path)
+            
+            # Admins can ask for a profile of this parse with the X-Profile-Token header
+            profile = has_profile_token()
             
             try:
-                # Get file extension
-                file_extension = filepath.lower().split('.')[-1]
+                # Large files are handed to the job queue and polled from /jobs/<id>
+                if job_queue and os.path.getsize(filepath) >= app.config['ASYNC_PARSE_MIN_BYTES']:
+                    def task():
+                        result = parse_upload(filepath, file_digest, filename, profile)
+                        if result is None:
+                            return None
+                        # The digest links the job to its profiles under /admin/profiles
+                        return {'json_filename': write_result_record(result, filename, blob_path, file_extension),
+                                'file_sha256': file_digest}
+                    
+                    try:
+                        job_id = job_queue.submit(task, filename)
+                    except QueueFullError:
+                        flash('Sunucu şu anda yoğun. Lütfen birkaç saniye sonra tekrar deneyin.', 'error')
+                        return redirect(url_for('index'))
+                    
+                    return redirect(url_for('job_status', job_id=job_id))
                 
                 # Parse the document
-                parser = DocumentParser()
-                result = parser.parse_document(filepath)
+                result = parse_upload(filepath, file_digest, filename, profile)
                 
                 if result is None:
                     flash('Dosya işlenirken hata oluştu. Dosya formatını kontrol edin.', 'error')
                     return redirect(url_for('index'))
                 
                 # Generate JSON file for download
-                json_filename = f"mevzuat_{uuid.uuid4().hex}.json"
-                json_filepath = os.path.join(app.config['UPLOAD_FOLDER'], json_filename)
-                
-                # Store original file info with result
-                result['_metadata'] = {
-                    'original_filename': filename,
-                    'original_file_path': unique_filename,
-                    'file_type': file_extension
-                }
-                
-                with open(json_filepath, 'w', encoding='utf-8') as json_file:
-                    json.dump(result, json_file, ensure_ascii=False, indent=2)
+                json_filename = write_result_record(result, filename, blob_path, file_extension)
                 
                 # Keep the original file for PDF viewing (don't delete it)
                 
+                # The page only needs the header; articles are fetched by the browser in pages
                 return render_template('result.html', 
-                                     result=result, 
+                                     result=document_summary(result), 
                                      json_filename=json_filename,
                                      original_filename=filename)
                 
@@ -105,9 +342,8 @@ def upload_file():
                 app.logger.error(f"Error parsing document: {str(e)}")
                 flash(f'Dosya işlenirken hata oluştu: {str(e)}', 'error')
                 
-                # Clean up uploaded file on error
-                if os.path.exists(filepath):
-                    os.remove(filepath)
+                # The blob may be shared with earlier uploads, so it is not
+                # removed here; unreferenced blobs are left to gc-uploads
                 
                 return redirect(url_for('index'))
         
@@ -120,14 +356,30 @@ def upload_file():
         flash('Dosya yüklenirken hata oluştu.', 'error')
         return redirect(url_for('index'))
 
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Show the progress of a background parse and redirect to the result once done."""
+    job = job_queue.get(job_id) if job_queue else None
+    
+    if job is None:
+        flash('İşlem bulunamadı', 'error')
+        return redirect(url_for('index'))
+    
+    if job['status'] == JOB_DONE:
+        return redirect(url_for('view_result', json_filename=job['result']['json_filename']))
+    
+    if job['status'] == JOB_FAILED:
+        flash('Dosya işlenirken hata oluştu. Dosya formatını kontrol edin.', 'error')
+        return redirect(url_for('index'))
+    
+    return render_template('job.html', job=job)
+
 @app.route('/edit/<json_filename>')
 def edit_document(json_filename):
     """Edit document page with inline editing capabilities."""
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], json_filename)
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                result = json.load(f)
+        if document_store.exists(json_filename):
+            result = document_store.load_summary(json_filename)
             return render_template('edit.html', result=result, json_filename=json_filename)
         else:
             flash('Dosya bulunamadı', 'error')
@@ -142,27 +394,81 @@ def save_document(json_filename):
     """Save edited document data."""
     try:
         data = request.get_json()
-        if not data:
+        if not isinstance(data, dict) or not data:
             return jsonify({'success': False, 'message': 'Geçersiz veri'})
         
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], json_filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if not document_store.exists(json_filename):
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
         
-        return jsonify({'success': True, 'message': 'Değişiklikler kaydedildi'})
+        # A full save still moves the version forward so patch clients notice it;
+        # the stored metadata is kept whatever the client sends
+        with metrics.timer('record_write_seconds', 'Time to store a parse result record.', operation='save'):
+            version = document_store.update(json_filename, keeping_metadata(data))
+        update_search_index(json_filename, data)
+        
+        return jsonify({'success': True, 'message': 'Değişiklikler kaydedildi', 'version': version})
     except Exception as e:
         app.logger.error(f"Save error: {str(e)}")
         return jsonify({'success': False, 'message': 'Kaydetme hatası oluştu'})
 
+@app.route('/save/<json_filename>', methods=['PATCH'])
+def patch_document(json_filename):
+    """Apply an RFC 6902 JSON Patch to a saved document.
+    
+    The body is {"version": <version the patch was made against>, "patch": [...]}.
+    The patch is applied only if the version still matches; otherwise 409 is
+    returned with the current version so the editor can reload.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('version'), int) \
+                or not isinstance(data.get('patch'), list):
+            return jsonify({'success': False, 'message': 'Geçersiz veri'}), 400
+        
+        # Metadata (file paths, version) is managed by the server; moving or copying it counts too
+        if touches_member(data['patch'], '_metadata'):
+            return jsonify({'success': False, 'message': 'Metadata düzenlenemez'}), 400
+        
+        if not document_store.exists(json_filename):
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
+        
+        patched = {}
+        
+        def change(document):
+            patched['document'] = apply_patch(document, data['patch'])
+            return patched['document']
+        
+        try:
+            with metrics.timer('record_write_seconds', 'Time to store a parse result record.', operation='patch'):
+                version = document_store.update(json_filename, change, expected_version=data['version'])
+        except VersionConflictError as e:
+            return jsonify({
+                'success': False,
+                'message': 'Belge başka bir oturumda değiştirilmiş. Sayfayı yenileyin.',
+                'version': e.current_version
+            }), 409
+        except JsonPatchError as e:
+            return jsonify({'success': False, 'message': f'Geçersiz değişiklik: {str(e)}'}), 422
+        
+        # Autosave sends small patches every few seconds: re-index only the articles they changed
+        articles = changed_items(data['patch'], 'maddeler')
+        if articles is None or touches_member(data['patch'], 'mevzuat_basligi'):
+            update_search_index(json_filename, patched['document'])
+        elif articles:
+            update_search_index(json_filename, patched['document'], articles)
+        
+        return jsonify({'success': True, 'message': 'Değişiklikler kaydedildi', 'version': version})
+    except Exception as e:
+        app.logger.error(f"Patch error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Kaydetme hatası oluştu'}), 500
+
 @app.route('/result/<json_filename>')
 def view_result(json_filename):
     """Display the current JSON data as a result page."""
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], json_filename)
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                result = json.load(f)
-            return render_template('result.html', result=result, json_filename=json_filename, tojson_utf8=tojson_utf8)
+        if document_store.exists(json_filename):
+            result = document_store.load_summary(json_filename)
+            return render_template('result.html', result=result, json_filename=json_filename)
         else:
             flash('Dosya bulunamadı', 'error')
             return redirect(url_for('index'))
@@ -175,14 +481,12 @@ def view_result(json_filename):
 def view_pdf(json_filename):
     """Serve the original PDF file for viewing."""
     try:
-        json_filepath = os.path.join(app.config['UPLOAD_FOLDER'], json_filename)
-        if os.path.exists(json_filepath):
-            with open(json_filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        if document_store.exists(json_filename):
+            metadata = document_store.load_metadata(json_filename)
             
-            if '_metadata' in data and data['_metadata']['file_type'] == 'pdf':
-                pdf_path = os.path.join(app.config['UPLOAD_FOLDER'], data['_metadata']['original_file_path'])
-                if os.path.exists(pdf_path):
+            if metadata.get('file_type') == 'pdf':
+                pdf_path = upload_store.resolve(metadata.get('original_file_path') or '')
+                if pdf_path and os.path.exists(pdf_path):
                     return send_file(pdf_path, mimetype='application/pdf')
         
         return "PDF dosyası bulunamadı", 404
@@ -192,8 +496,23 @@ def view_pdf(json_filename):
 
 @app.route('/download/<filename>')
 def download_file(filename):
-    """Download the generated JSON file."""
+    """Download the generated JSON file.
+    
+    A compressed record is sent as stored, with its Content-Encoding, to
+    clients that accept that encoding; otherwise it is pretty-printed.
+    """
     try:
+        if document_store.exists(filename):
+            data, encoding, varies = download_payload(document_store, filename,
+                                                      lambda encoding: request.accept_encodings[encoding])
+            response = send_file(io.BytesIO(data), mimetype='application/json',
+                                 as_attachment=True, download_name=filename)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            if varies:
+                response.vary.add('Accept-Encoding')
+            return response
+        
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         if os.path.exists(filepath):
             return send_file(filepath, as_attachment=True, download_name=filename)
@@ -205,6 +524,41 @@ def download_file(filename):
         flash('Dosya indirilirken hata oluştu', 'error')
         return redirect(url_for('index'))
 
+@app.cli.command('gc-uploads')
+@click.option('--grace-seconds', default=3600, show_default=True,
+              help='Keep unreferenced blobs younger than this.')
+@click.option('--dry-run', is_flag=True, help='Only report what would be removed.')
+def gc_uploads(grace_seconds, dry_run):
+    """Remove uploaded files that no parse record references."""
+    records = (metadata for _, metadata in document_store.iter_metadata())
+    stats = upload_store.collect_garbage(grace_seconds=grace_seconds, dry_run=dry_run, records=records)
+    for path in stats['removed']:
+        click.echo(f"{'would remove' if dry_run else 'removed'} {path}")
+    click.echo(f"{len(stats['removed'])} orphaned blobs, {stats['freed_bytes']} bytes, {stats['kept']} kept")
+
+@app.cli.command('import-legacy-uploads')
+@click.option('--dry-run', is_flag=True, help='Only report what would be moved.')
+def import_legacy_uploads(dry_run):
+    """Move {uuid}_{filename} uploads into the deduplicated blob store."""
+    stats = upload_store.import_legacy(document_store, dry_run=dry_run)
+    click.echo(f"{stats['records_updated']} records, {stats['legacy_files']} legacy files")
+
+@app.cli.command('migrate-documents')
+@click.option('--db', default=DOCUMENT_DB, show_default=True, help='SQLite database to import into.')
+def migrate_documents(db):
+    """Import mevzuat_*.json records into the SQLite document store."""
+    stats = migrate_json_documents(UPLOAD_FOLDER, create_document_store('sqlite', UPLOAD_FOLDER, db_path=db))
+    click.echo(f"{stats['imported']} imported, {stats['skipped']} already present, {stats['failed']} failed")
+
+@app.cli.command('reindex-search')
+def reindex_search():
+    """Rebuild the full-text search index from every stored record."""
+    documents = fikralar = 0
+    for json_filename, _ in document_store.iter_metadata():
+        fikralar += search_index.index_document(json_filename, document_store.load(json_filename))
+        documents += 1
+    click.echo(f"{documents} documents, {fikralar} fıkralar indexed")
+
 @app.errorhandler(413)
 def too_large(e):
     """Handle file too large error."""
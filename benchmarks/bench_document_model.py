@@ -0,0 +1,79 @@
+"""Memory held by a parse result: the compact ParsedDocument against the nested dict.
+
+Usage:
+    python benchmarks/bench_document_model.py [--articles 1000 5000] [--fikralar 3] [--repeat 3]
+
+For each synthetic regulation the text is parsed once into a ParsedDocument
+and once into the dict returned by parse_document (mevzuat_basligi /
+maddeler / fikralar). Retained memory is what tracemalloc still sees
+allocated once the parse has returned (i.e. the size of the result), peak is
+the high-water mark during the parse; the input text is built beforehand
+and is not counted. to_dict() time is the cost of materializing the dict
+from the compact model on demand.
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import synthetic_regulation  # noqa: E402
+from document_model import DictBuilder  # noqa: E402
+from document_parser import DocumentParser  # noqa: E402
+
+
+def traced(build):
+    """(result, retained bytes, peak bytes) of build()."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak
+
+
+def median_seconds(run, repeat: int) -> float:
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - started)
+    return statistics.median(seconds)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--articles', type=int, nargs='*', default=[1000, 5000],
+                            help='sizes of the synthetic regulations')
+    arg_parser.add_argument('--fikralar', type=int, default=3, help='fıkralar per article')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    parser = DocumentParser()
+    mb = 1024 * 1024
+    for size in args.articles:
+        text = synthetic_regulation(articles=size, fikralar=args.fikralar, bent_depth=2)
+
+        document, model_retained, model_peak = traced(lambda: parser._parse_legal_stream([text]))
+        result, dict_retained, dict_peak = traced(lambda: parser._parse_legal_stream([text], builder_class=DictBuilder))
+        identical = document.to_dict() == result
+        del result
+
+        to_dict_seconds = median_seconds(document.to_dict, args.repeat)
+        parse_seconds = median_seconds(lambda: parser._parse_legal_stream([text]), args.repeat)
+
+        print(f"articles={size:6}  paragraphs={document.paragraph_count:7}  "
+              f"dict={dict_retained / mb:7.2f} MB (peak {dict_peak / mb:7.2f})  "
+              f"model={model_retained / mb:7.2f} MB (peak {model_peak / mb:7.2f})  "
+              f"reduction={dict_retained / model_retained:5.2f}x  "
+              f"parse={parse_seconds * 1000:8.1f} ms  to_dict={to_dict_seconds * 1000:6.1f} ms  "
+              f"identical={identical}")
+
+
+if __name__ == '__main__':
+    main()
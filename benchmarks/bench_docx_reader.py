@@ -0,0 +1,80 @@
+"""Speed, memory and output fidelity of the streaming Word reader against python-docx.
+
+Usage:
+    python benchmarks/bench_docx_reader.py [extra.docx ...] [--articles 100 1000] [--repeat 3]
+
+Synthetic regulations of the given sizes are written as .docx files (plus
+the repo's samples and any files given on the command line); for each file
+the paragraph texts of docx_text.iter_paragraph_texts() are compared with
+python-docx's Document(path).paragraphs. Peak memory is measured with
+tracemalloc, which does not see lxml's own allocations, so python-docx's real
+footprint is larger than reported.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import sample_documents, synthetic_regulation, write_docx  # noqa: E402
+from docx import Document  # noqa: E402
+
+import docx_text  # noqa: E402
+
+
+def python_docx_paragraphs(path: str):
+    return [paragraph.text for paragraph in Document(path).paragraphs]
+
+
+def streamed_paragraphs(path: str):
+    return list(docx_text.iter_paragraph_texts(path))
+
+
+def measure(read, path: str, repeat: int):
+    """(paragraphs, median seconds, traced peak bytes) of read(path)."""
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        paragraphs = read(path)
+        seconds.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    read(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return paragraphs, statistics.median(seconds), peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('paths', nargs='*', help='additional .docx files to compare')
+    arg_parser.add_argument('--articles', type=int, nargs='*', default=[100, 1000],
+                            help='sizes of the synthetic regulations')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = [(f'synthetic-{size}',
+                  write_docx(synthetic_regulation(articles=size, bent_depth=2),
+                             os.path.join(directory, f'synthetic-{size}.docx')))
+                 for size in args.articles]
+        files += [(sample['name'], sample['path']) for sample in sample_documents()
+                  if sample['path'].lower().endswith('.docx')]
+        files += [(os.path.basename(path), path) for path in args.paths]
+
+        for name, path in files:
+            reference, docx_seconds, docx_peak = measure(python_docx_paragraphs, path, args.repeat)
+            streamed, stream_seconds, stream_peak = measure(streamed_paragraphs, path, args.repeat)
+
+            print(f"{name[:40]:40} paragraphs={len(reference):6}  "
+                  f"python-docx={docx_seconds * 1000:8.1f} ms / {docx_peak / 1024 / 1024:6.1f} MB  "
+                  f"stream={stream_seconds * 1000:8.1f} ms / {stream_peak / 1024 / 1024:6.1f} MB  "
+                  f"speedup={docx_seconds / stream_seconds:5.2f}x  identical={reference == streamed}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Encode/decode time and on-disk size of parse records, per serialization path.
+
+Usage:
+    python benchmarks/bench_json_codec.py [--articles 1000 5000] [--repeat 5]
+
+A synthetic regulation is parsed once and its record written and read the
+way it used to be (json.dump with indent=2, json.load), then with
+json_codec: compact stdlib JSON, compact orjson (when installed) and the
+compressed forms. Times are medians of --repeat runs, in memory (no disk I/O).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import synthetic_regulation  # noqa: E402
+from document_parser import DocumentParser  # noqa: E402
+
+import json_codec  # noqa: E402
+
+
+def median_seconds(run, repeat: int) -> float:
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - started)
+    return statistics.median(seconds)
+
+
+def stdlib_compact(document):
+    return json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--articles', type=int, nargs='*', default=[1000, 5000],
+                            help='sizes of the synthetic regulations')
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    parser = DocumentParser()
+    paths = [
+        ('stdlib indent=2', lambda d: json.dumps(d, ensure_ascii=False, indent=2).encode('utf-8'),
+         lambda data: json.loads(data)),
+        ('stdlib compact', stdlib_compact, lambda data: json.loads(data)),
+    ]
+    if json_codec.orjson is not None:
+        paths.append(('orjson compact', json_codec.orjson.dumps, json_codec.orjson.loads))
+    for compression in json_codec.COMPRESSIONS[1:]:
+        try:
+            json_codec.check_compression(compression)
+        except ValueError:
+            continue
+        paths.append((f'{compression} record', lambda d, c=compression: json_codec.encode_record(d, c),
+                      json_codec.decode_record))
+
+    for size in args.articles:
+        document = parser._parse_legal_stream([synthetic_regulation(articles=size, bent_depth=2)]).to_dict()
+        print(f"articles={size}")
+        for name, encode, decode in paths:
+            data = encode(document)
+            assert decode(data) == document
+            encode_seconds = median_seconds(lambda: encode(document), args.repeat)
+            decode_seconds = median_seconds(lambda: decode(data), args.repeat)
+            print(f"  {name:16} size={len(data) / 1024 / 1024:7.2f} MB  "
+                  f"encode={encode_seconds * 1000:7.1f} ms  decode={decode_seconds * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""Per-stage parser benchmark over synthetic regulations and the repo's sample documents.
+
+Usage:
+    python benchmarks/bench_parser.py [--quick] [--repeat 3] [--output run.json]
+                                      [--baseline previous.json]
+
+Every case runs in a fresh process, so its peak RSS is its own. Stage times
+(extract_text, strip_furniture, clean_text, extract_title, extract_articles) and the
+end-to-end time are the medians over --repeat runs. The JSON written with
+--output can be passed as --baseline to a later run to compare the two.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import REPO_ROOT, sample_documents, synthetic_regulation, write_docx  # noqa: E402
+from document_parser import DocumentParser, PARSER_VERSION, PDF_ENGINES  # noqa: E402
+from metrics import StageTimings  # noqa: E402
+
+STAGES = ('extract_text', 'strip_furniture', 'clean_text', 'extract_title', 'extract_articles')
+
+
+def synthetic_cases(quick: bool):
+    """(name, generator arguments) for the synthetic part of the matrix."""
+    sizes = (100, 1000) if quick else (100, 1000, 5000)
+    cases = [(f'synthetic-{size}', {'articles': size}) for size in sizes]
+    if quick:
+        return cases
+
+    for depth in (0, 2):
+        cases.append((f'synthetic-1000-depth{depth}', {'articles': 1000, 'bent_depth': depth}))
+    for style in ('dash', 'dot', 'number_first'):
+        cases.append((f'synthetic-1000-{style}', {'articles': 1000, 'header_styles': (style,)}))
+    for density in (0.0, 1.0):
+        cases.append((f'synthetic-1000-subjects{density:g}', {'articles': 1000, 'subject_density': density}))
+    return cases
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_case(case):
+    """Parse one input repeat times in this (fresh) process and summarize the timings."""
+    name, kind, source, params, repeat, pdf_engine = case
+    parser = DocumentParser()
+    text = synthetic_regulation(**params) if kind == 'synthetic' else None
+
+    runs = []
+    result = None
+    for _ in range(repeat):
+        timings = StageTimings()
+        started = time.perf_counter()
+        if text is not None:
+            result = parser._parse_legal_stream([text], timings)
+        else:
+            result = parser._parse_document(source, timings, pdf_engine)
+        total = time.perf_counter() - started
+        runs.append((total, timings))
+
+    totals = [total for total, _ in runs]
+    stages = {stage: statistics.median(timings.seconds.get(stage, 0.0) for _, timings in runs)
+              for stage in STAGES}
+    articles = len(result) if result else 0
+    median_total = statistics.median(totals)
+
+    summary = {
+        'name': name,
+        'kind': kind,
+        'params': params,
+        'input_bytes': len(text.encode('utf-8')) if text is not None else os.path.getsize(source),
+        'articles': articles,
+        'paragraphs': result.paragraph_count if result else 0,
+        'seconds': median_total,
+        'min_seconds': min(totals),
+        'stages': stages,
+        'articles_per_second': articles / median_total if median_total else 0.0,
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+    pages = runs[-1][1].items.get('extract_text') if kind == 'pdf' else None
+    if pages:
+        summary['pages'] = pages
+        summary['pages_per_second'] = pages / median_total
+    return summary
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Print the end-to-end and per-stage ratio of each case against a baseline run."""
+    previous = {case['name']: case for case in baseline['cases']}
+    print(f"\ncompared with {baseline['meta'].get('git_revision') or 'baseline'} "
+          f"({baseline['meta'].get('timestamp')}); < 1.00 is faster")
+    for case in results:
+        old = previous.get(case['name'])
+        if old is None or not old['seconds']:
+            continue
+        stages = '  '.join(
+            f"{stage}={case['stages'][stage] / old['stages'][stage]:.2f}"
+            for stage in STAGES if old['stages'].get(stage)
+        )
+        print(f"{case['name']:48} total={case['seconds'] / old['seconds']:.2f}  {stages}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--quick', action='store_true', help='small synthetic matrix only')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--no-samples', action='store_true', help='skip the sample PDFs/Word files')
+    arg_parser.add_argument('--no-docx', action='store_true', help='skip synthetic Word documents')
+    arg_parser.add_argument('--pdf-engine', choices=PDF_ENGINES, default='layout')
+    arg_parser.add_argument('--output', help='write results as JSON to this file')
+    arg_parser.add_argument('--baseline', help='JSON from an earlier run to compare against')
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cases = [(name, 'synthetic', None, params, args.repeat, args.pdf_engine)
+                 for name, params in synthetic_cases(args.quick)]
+
+        if not args.no_docx:
+            # The Word path includes python-docx loading, which the text cases skip
+            for size in ((100,) if args.quick else (100, 1000)):
+                path = write_docx(synthetic_regulation(articles=size), os.path.join(directory, f'synthetic-{size}.docx'))
+                cases.append((f'docx-synthetic-{size}', 'docx', path, {'articles': size}, args.repeat, args.pdf_engine))
+
+        if not args.no_samples:
+            for sample in sample_documents():
+                kind = sample['name'].rsplit('.', 1)[-1].lower()
+                cases.append((f"{kind}-{sample['name']}", kind, sample['path'], {}, args.repeat, args.pdf_engine))
+
+        results = []
+        context = multiprocessing.get_context('spawn')
+        for case in cases:
+            with context.Pool(1) as pool:
+                summary = pool.apply(run_case, (case,))
+            results.append(summary)
+            stages = '  '.join(f"{stage}={summary['stages'][stage] * 1000:.1f}" for stage in STAGES)
+            pages = f"  {summary['pages_per_second']:.1f} pages/s" if 'pages_per_second' in summary else ''
+            print(f"{summary['name']:48} {summary['seconds'] * 1000:9.1f} ms  [{stages}]  "
+                  f"{summary['articles_per_second']:8.0f} articles/s{pages}  "
+                  f"rss={summary['peak_rss_kb'] / 1024:.0f} MB")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'parser_version': PARSER_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'pdf_engine': args.pdf_engine,
+        },
+        'cases': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Speed and output fidelity of the PDF text extraction engines.
+
+Usage:
+    python benchmarks/bench_pdf_engines.py [extra.pdf ...] [--repeat 3]
+
+For every sample PDF in the repo (plus any given on the command line) the
+page texts of the 'chars' engine are compared with pdfplumber's
+extract_text() ('layout'): identical pages, a line-level similarity ratio
+over the whole text, and whether the final parse results are equal.
+"""
+import argparse
+import difflib
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import sample_documents  # noqa: E402
+from document_parser import DocumentParser, PDF_ENGINES  # noqa: E402
+
+
+def timed_pages(parser: DocumentParser, path: str, engine: str, repeat: int):
+    seconds = []
+    pages = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        pages = list(parser._iter_pdf_pages(path, engine))
+        seconds.append(time.perf_counter() - started)
+    return pages, statistics.median(seconds)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('paths', nargs='*', help='additional PDFs to compare')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    samples = [(sample['name'], sample['path']) for sample in sample_documents()
+               if sample['path'].lower().endswith('.pdf')]
+    samples += [(os.path.basename(path), path) for path in args.paths]
+
+    parser = DocumentParser()
+    totals = dict.fromkeys(PDF_ENGINES, 0.0)
+    for name, path in samples:
+        reference, layout_seconds = timed_pages(parser, path, 'layout', args.repeat)
+        fast, chars_seconds = timed_pages(parser, path, 'chars', args.repeat)
+        totals['layout'] += layout_seconds
+        totals['chars'] += chars_seconds
+
+        identical = sum(a == b for a, b in zip(reference, fast))
+        similarity = difflib.SequenceMatcher(None, '\n'.join(reference).splitlines(),
+                                             '\n'.join(fast).splitlines()).ratio()
+        same_result = parser.parse_document(path, 'layout') == parser.parse_document(path, 'chars')
+
+        print(f"{name[:44]:44} pages={len(reference):4}  layout={layout_seconds * 1000:8.1f} ms  "
+              f"chars={chars_seconds * 1000:8.1f} ms  speedup={layout_seconds / chars_seconds:5.2f}x  "
+              f"identical={identical}/{max(len(reference), len(fast))}  similarity={similarity:.4f}  "
+              f"same_result={same_result}")
+
+    if samples:
+        print(f"{'total':44} layout={totals['layout']:.2f}s  chars={totals['chars']:.2f}s  "
+              f"speedup={totals['layout'] / totals['chars']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Regex micro-benchmark: precompiled, merged patterns against per-call re.match loops.
+
+Usage:
+    python benchmarks/bench_regex.py [--repeat 7] [--ref <git revision>]
+
+The input is the extracted text of the repo's sample documents. Subject
+header detection is timed per non-empty line, as DocumentParser does it
+now (one match against the merged SUBJECT_HEADER_RE) and as it did before
+the patterns were precompiled (re.match over each pattern string, which
+goes through the re module's cache on every call). With --ref, the
+document_parser.py of that revision (e.g. the commit before the patterns
+moved to module level) is loaded from git and _parse_legal_content is timed
+on the whole corpus with both parsers, after checking that their outputs
+are identical. Times are medians of --repeat runs.
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import REPO_ROOT, sample_documents  # noqa: E402
+from document_parser import SUBJECT_HEADER_PATTERNS, SUBJECT_KEYWORDS, DocumentParser  # noqa: E402
+
+
+def median_seconds(run, repeat: int) -> float:
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - started)
+    return statistics.median(seconds)
+
+
+def uncompiled_is_subject_header(line: str) -> bool:
+    """DocumentParser._is_subject_header as it was written before the patterns were precompiled."""
+    line = line.strip()
+    if len(line) < 3:
+        return False
+    for pattern in SUBJECT_HEADER_PATTERNS:
+        if re.match(pattern, line, re.IGNORECASE):
+            return True
+    if (len(line) < 50 and line.isupper() and not line.endswith(('.', ':', ';', '!', '?'))
+            and not re.search(r'\d', line)):
+        return True
+    return len(line) < 80 and any(keyword in line.lower() for keyword in SUBJECT_KEYWORDS) and len(line.split()) <= 5
+
+
+def corpus_texts(parser):
+    texts = []
+    for sample in sample_documents():
+        if sample['path'].lower().endswith('.pdf'):
+            texts.append(parser._extract_text_from_pdf(sample['path']))
+        else:
+            texts.append(parser._extract_text_from_word(sample['path']))
+    return [text for text in texts if text]
+
+
+def parser_at(revision: str):
+    """DocumentParser class from document_parser.py at a git revision."""
+    source = subprocess.run(['git', 'show', f'{revision}:document_parser.py'], cwd=REPO_ROOT,
+                            capture_output=True, check=True).stdout
+    with tempfile.NamedTemporaryFile('wb', suffix='.py', delete=False) as f:
+        f.write(source)
+    try:
+        spec = importlib.util.spec_from_file_location('document_parser_at_ref', f.name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.remove(f.name)
+    return module.DocumentParser
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--repeat', type=int, default=7)
+    arg_parser.add_argument('--ref', help='git revision whose parser _parse_legal_content is compared with')
+    args = arg_parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    parser = DocumentParser()
+    texts = corpus_texts(parser)
+    lines = [line for text in texts for line in text.split('\n') if line.strip()]
+    print(f"documents={len(texts)} non-empty lines={len(lines)}")
+
+    assert [parser._is_subject_header(line) for line in lines] == [uncompiled_is_subject_header(line) for line in lines]
+    for name, classify in (('re.match loop', uncompiled_is_subject_header),
+                           ('precompiled', parser._is_subject_header)):
+        seconds = median_seconds(lambda: [classify(line) for line in lines], args.repeat)
+        print(f"  _is_subject_header {name:14} {seconds / len(lines) * 1e6:6.1f} us/line")
+
+    if args.ref:
+        old_parser = parser_at(args.ref)()
+        assert [old_parser._parse_legal_content(text) for text in texts] == \
+            [parser._parse_legal_content(text) for text in texts], 'parser output differs'
+        for name, candidate in ((args.ref, old_parser), ('working tree', parser)):
+            seconds = median_seconds(lambda: [candidate._parse_legal_content(text) for text in texts], args.repeat)
+            print(f"  _parse_legal_content {name:14} {seconds * 1000:7.1f} ms (whole corpus)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Query latency of the full-text search index at 100k articles.
+
+Usage:
+    python benchmarks/bench_search.py [--articles 100000] [--fikralar 3]
+
+Builds a throwaway index of synthetic regulations (Turkish legal vocabulary,
+random sentences) and reports p50/p95 latency for typical queries.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from search_index import SearchIndex  # noqa: E402
+
+VOCABULARY = (
+    'öğrenci öğretim üyesi danışman tez enstitü yönetim kurulu senato karar başvuru sınav '
+    'jüri savunma dönem yarıyıl kayıt ders kredi mezuniyet diploma yönetmelik madde fıkra '
+    'süre gün ay yıl içinde tarafından ile ve veya en az en fazla olmak üzere şartıyla '
+    'lisansüstü yüksek lisans doktora bilim dalı anabilim ilgili birim görevlendirme şirket '
+    'teknoloji geliştirme bölgesi izin ücret katkı payı disiplin itiraz ilan yürürlük'
+).split()
+
+QUERIES = ['danışman', 'tez savunma', 'OGRENCI kayit', 'yönetim kurulu karar', 'şirket', 'xyzabsent']
+
+
+def sentence(rng):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(12, 40))).capitalize() + '.'
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--articles', type=int, default=100000)
+    arg_parser.add_argument('--fikralar', type=int, default=3, help='fıkralar per article')
+    arg_parser.add_argument('--articles-per-document', type=int, default=100)
+    arg_parser.add_argument('--repeat', type=int, default=50)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        index = SearchIndex(os.path.join(directory, 'search.sqlite3'))
+
+        started = time.perf_counter()
+        for number in range(0, args.articles, args.articles_per_document):
+            count = min(args.articles_per_document, args.articles - number)
+            index.index_document(f"mevzuat_{number}.json", {
+                'mevzuat_basligi': f"Yönetmelik {number}",
+                'maddeler': [
+                    {'madde_numarasi': f"Madde {i + 1}",
+                     'fikralar': [sentence(rng) for _ in range(args.fikralar)]}
+                    for i in range(count)
+                ]
+            })
+        build_seconds = time.perf_counter() - started
+        print(f"indexed {args.articles} articles ({args.articles * args.fikralar} fıkralar) "
+              f"in {build_seconds:.1f}s, {os.path.getsize(index.db_path) / 1e6:.0f} MB")
+
+        # Re-indexing one document is what every save costs
+        started = time.perf_counter()
+        index.index_document('mevzuat_0.json', {'maddeler': [
+            {'madde_numarasi': f"Madde {i + 1}", 'fikralar': [sentence(rng) for _ in range(args.fikralar)]}
+            for i in range(args.articles_per_document)
+        ]})
+        print(f"re-index one {args.articles_per_document}-article document: "
+              f"{(time.perf_counter() - started) * 1000:.1f} ms")
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                result = index.search(query, per_page=20)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            total = f"{result['total']}{'+' if result['truncated'] else ''}"
+            print(f"{query!r:24} total={total:>7}  "
+                  f"p50={statistics.median(timings):7.2f} ms  p95={timings[int(len(timings) * 0.95) - 1]:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
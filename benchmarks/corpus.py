@@ -0,0 +1,139 @@
+"""Benchmark inputs: synthetic Turkish regulations and the sample documents in the repo.
+
+synthetic_regulation() builds the text of a regulation with a controllable
+number of articles, fıkra/bent depth, article header styles and density of
+subject headers, deterministically from a seed. sample_documents() lists the
+real PDFs and Word files shipped with the repo, one per distinct content.
+"""
+import hashlib
+import os
+import random
+import re
+from typing import Dict, Iterable, List, Sequence
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SAMPLE_DIRECTORIES = ('static/uploads', 'attached_assets')
+SAMPLE_EXTENSIONS = ('.pdf', '.docx')
+
+HEADER_STYLES = {
+    'dash': 'MADDE {n} –',
+    'dot': 'Madde {n}.',
+    'number_first': '{n}. Madde –',
+}
+
+SUBJECT_HEADERS = (
+    'Amaç', 'Kapsam', 'Dayanak', 'Tanımlar', 'Danışman', 'Danışman değişikliği',
+    'Başvuru şartları', 'Uygulama esasları', 'Değerlendirme kriterleri', 'Yürürlük',
+    'Tez savunma sınavı', 'Kayıt yenileme', 'Ders yükü ve kredi',
+)
+
+VOCABULARY = (
+    'öğrenci öğretim üyesi danışman tez enstitü yönetim kurulu senato karar başvuru sınav '
+    'jüri savunma dönem yarıyıl kayıt ders kredi mezuniyet diploma yönetmelik hüküm '
+    'süre gün ay yıl içinde tarafından ile ve veya en az en fazla olmak üzere şartıyla '
+    'lisansüstü yüksek lisans doktora bilim dalı anabilim ilgili birim görevlendirme şirket '
+    'teknoloji geliştirme bölgesi izin ücret katkı payı disiplin itiraz ilan yürürlük'
+).split()
+
+_LETTERS = 'abcçdefgğhıijklmnoöprsştuüvyz'
+_HASH_PREFIX_RE = re.compile(r'^[0-9a-f]{32}_')
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words)).capitalize()
+
+
+def synthetic_regulation(articles: int = 100, fikralar: int = 3, bent_depth: int = 1,
+                         header_styles: Sequence[str] = tuple(HEADER_STYLES),
+                         subject_density: float = 0.5, seed: int = 42) -> str:
+    """Text of a synthetic regulation as the PDF/Word extractors would return it.
+
+    Args:
+        articles: number of articles (madde)
+        fikralar: numbered paragraphs per article; 0 writes one unnumbered paragraph
+        bent_depth: 0 for plain fıkralar, 1 adds lettered bentler to every other
+            fıkra, 2 also adds numbered alt bentler under the first bent
+        header_styles: keys of HEADER_STYLES, used round-robin
+        subject_density: share of articles preceded by a subject header line
+        seed: random seed; equal arguments always give equal text
+    """
+    rng = random.Random(seed)
+    styles = [HEADER_STYLES[style] for style in header_styles]
+    lines = [
+        'T.C.',
+        'ÖRNEK ÜNİVERSİTESİ',
+        'LİSANSÜSTÜ EĞİTİM VE ÖĞRETİM YÖNETMELİĞİ',
+        '',
+        'BİRİNCİ BÖLÜM',
+        'Amaç, Kapsam, Dayanak ve Tanımlar',
+    ]
+
+    for number in range(1, articles + 1):
+        if rng.random() < subject_density:
+            lines.append(rng.choice(SUBJECT_HEADERS))
+        header = styles[(number - 1) % len(styles)].format(n=number)
+
+        paragraphs = []
+        for index in range(1, max(fikralar, 1) + 1):
+            marker = f'({index}) ' if fikralar else ''
+            paragraphs.append(f'{marker}{_sentence(rng, rng.randint(12, 40))}.')
+            if bent_depth >= 1 and index % 2 == 1:
+                paragraphs[-1] = paragraphs[-1][:-1] + ':'
+                for letter in _LETTERS[:rng.randint(2, 5)]:
+                    paragraphs.append(f'{letter}) {_sentence(rng, rng.randint(6, 20))},')
+                    if bent_depth >= 2 and letter == 'a':
+                        paragraphs[-1] = paragraphs[-1][:-1] + ':'
+                        for sub in range(1, rng.randint(2, 4) + 1):
+                            paragraphs.append(f'{sub}) {_sentence(rng, rng.randint(4, 12))},')
+
+        lines.append(f'{header} {paragraphs[0]}')
+        lines.extend(paragraphs[1:])
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_docx(text: str, path: str) -> str:
+    """Write text as a Word document, one paragraph per line."""
+    from docx import Document
+
+    document = Document()
+    for line in text.splitlines():
+        if line:
+            document.add_paragraph(line)
+    document.save(path)
+    return path
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sample_documents(directories: Iterable[str] = SAMPLE_DIRECTORIES) -> List[Dict]:
+    """Real sample files under the repo, skipping copies of the same content.
+
+    Returns dicts with name (upload prefix stripped), path and size in bytes.
+    """
+    samples = []
+    seen = set()
+    for directory in directories:
+        directory = os.path.join(REPO_ROOT, directory)
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            path = os.path.join(directory, filename)
+            if not filename.lower().endswith(SAMPLE_EXTENSIONS) or not os.path.isfile(path):
+                continue
+            digest = _file_digest(path)
+            if digest in seen:
+                continue
+            seen.add(digest)
+            samples.append({
+                'name': _HASH_PREFIX_RE.sub('', filename),
+                'path': os.path.abspath(path),
+                'size': os.path.getsize(path),
+            })
+    return samples
@@ -3,25 +3,170 @@ Legal Parser API Version - Mikroservis API Entegrasyonu için
 Sadece API endpoint'leri sağlar, UI olmadan
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, url_for, Response, stream_with_context, abort
 from werkzeug.utils import secure_filename
 import os
-import json
 import uuid
+import shutil
 import tempfile
-from .document_parser import DocumentParser
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from .document_parser import get_default_parser, PARSER_VERSION
+from parse_cache import create_parse_cache, file_sha256
+from parse_jobs import JobQueue, JobStore, QueueFullError, JOB_DONE, JOB_FAILED, JOB_QUEUED
+from search_index import SearchIndex
+from document_store import DocumentStore
+import json_codec
 
 # API Blueprint
 api = Blueprint('legal_parser_api', __name__, url_prefix='/api/legal-parser')
 
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
+ARTICLE_PAGE_MAX = 200
+BATCH_MAX_BYTES = 256 * 1024 * 1024  # toplu istekte açılmış toplam boyut
+
+class BatchLimitError(Exception):
+    """Toplu istek dosya sayısı veya toplam boyut sınırını aştı"""
+    
+    def __init__(self, error, message, status):
+        super().__init__(message)
+        self.error = error
+        self.status = status
+
+def get_parse_cache():
+    """Uygulama başına paylaşılan ayrıştırma önbelleğini al ('none' ise None döner)"""
+    if 'legal_parser_cache' not in current_app.extensions:
+        current_app.extensions['legal_parser_cache'] = create_parse_cache(
+            current_app.config.get('LEGAL_PARSER_CACHE_BACKEND', 'memory'),
+            PARSER_VERSION,
+            directory=current_app.config.get('LEGAL_PARSER_CACHE_DIR',
+                                             os.path.join(current_app.instance_path, 'legal_parser_cache')),
+            max_bytes=current_app.config.get('LEGAL_PARSER_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        )
+    return current_app.extensions['legal_parser_cache']
+
+def get_job_queue():
+    """Uygulama başına paylaşılan asenkron ayrıştırma kuyruğunu al"""
+    if 'legal_parser_jobs' not in current_app.extensions:
+        store = JobStore(current_app.config.get('LEGAL_PARSER_JOB_DB',
+                                                os.path.join(current_app.instance_path, 'legal_parser_jobs.sqlite3')),
+                         stale_seconds=current_app.config.get('LEGAL_PARSER_JOB_STALE_SECONDS', 3600))
+        current_app.extensions['legal_parser_jobs'] = JobQueue(
+            store,
+            max_workers=current_app.config.get('LEGAL_PARSER_JOB_WORKERS', 2),
+            max_pending=current_app.config.get('LEGAL_PARSER_JOB_MAX_PENDING', 16)
+        )
+    return current_app.extensions['legal_parser_jobs']
+
+def get_search_index():
+    """Uygulama başına paylaşılan tam metin arama dizinini al"""
+    if 'legal_parser_search' not in current_app.extensions:
+        current_app.extensions['legal_parser_search'] = SearchIndex(
+            current_app.config.get('LEGAL_PARSER_SEARCH_DB',
+                                   os.path.join(current_app.instance_path, 'legal_parser_search.sqlite3'))
+        )
+    return current_app.extensions['legal_parser_search']
+
+def get_document_store():
+    """Uygulama başına paylaşılan kayıt deposunu al (varsayılan: upload klasöründeki JSON kayıtlar)"""
+    if 'legal_parser_documents' not in current_app.extensions:
+        upload_folder = current_app.config.get('LEGAL_PARSER_UPLOAD_FOLDER',
+                                               os.path.join(current_app.instance_path, 'legal_parser_uploads'))
+        os.makedirs(upload_folder, exist_ok=True)
+        current_app.extensions['legal_parser_documents'] = DocumentStore(
+            upload_folder, compression=current_app.config.get('LEGAL_PARSER_DOCUMENT_COMPRESSION')
+        )
+    return current_app.extensions['legal_parser_documents']
+
+def get_batch_executor():
+    """Toplu ayrıştırma için uygulama başına paylaşılan işlem havuzunu al"""
+    if 'legal_parser_batch_executor' not in current_app.extensions:
+        current_app.extensions['legal_parser_batch_executor'] = ProcessPoolExecutor(
+            max_workers=current_app.config.get('LEGAL_PARSER_BATCH_WORKERS', 4)
+        )
+    return current_app.extensions['legal_parser_batch_executor']
+
+@api.before_request
+def check_endpoint_enabled():
+    """LEGAL_PARSER_API_ENDPOINTS verilmişse yalnızca listedeki uç noktalar sunulur, diğerleri 404 döner"""
+    enabled = current_app.config.get('LEGAL_PARSER_API_ENDPOINTS')
+    if enabled is not None and (request.endpoint or '').rsplit('.', 1)[-1] not in enabled:
+        abort(404)
 
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension."""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def save_upload_to_temp():
+    """
+    İstekteki dosyayı doğrulayıp geçici bir dosyaya kaydet
+    
+    Returns:
+        - (geçici dosya yolu, None) veya (None, hata yanıtı)
+    """
+    # Dosya kontrolü
+    if 'file' not in request.files:
+        return None, (jsonify({
+            'success': False,
+            'error': 'No file provided',
+            'message': 'Dosya yüklenmedi'
+        }), 400)
+    
+    file = request.files['file']
+    
+    if file.filename == '':
+        return None, (jsonify({
+            'success': False,
+            'error': 'No file selected',
+            'message': 'Dosya seçilmedi'
+        }), 400)
+    
+    if not allowed_file(file.filename):
+        return None, (jsonify({
+            'success': False,
+            'error': 'Invalid file type',
+            'message': 'Desteklenmeyen dosya türü. Sadece PDF, DOC ve DOCX dosyaları kabul edilir.',
+            'allowed_extensions': list(ALLOWED_EXTENSIONS)
+        }), 400)
+    
+    # Dosya boyutu kontrolü
+    file.seek(0, os.SEEK_END)
+    file_size = file.tell()
+    file.seek(0)
+    
+    if file_size > MAX_FILE_SIZE:
+        return None, (jsonify({
+            'success': False,
+            'error': 'File too large',
+            'message': f'Dosya boyutu çok büyük. Maksimum {MAX_FILE_SIZE // (1024*1024)}MB dosya yükleyebilirsiniz.',
+            'max_size_mb': MAX_FILE_SIZE // (1024*1024)
+        }), 413)
+    
+    # Geçici dosya oluştur
+    if not file.filename:
+        return None, (jsonify({
+            'success': False,
+            'error': 'Invalid filename',
+            'message': 'Geçersiz dosya adı'
+        }), 400)
+    
+    file_extension = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else 'tmp'
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
+        file.save(temp_file.name)
+        temp_path = temp_file.name
+    
+    return temp_path, None
+
+def parse_file(filepath):
+    """Dosyayı ayrıştır (aynı içerik daha önce ayrıştırıldıysa önbellekten döner)"""
+    parser = get_default_parser()
+    parse_cache = get_parse_cache()
+    if parse_cache:
+        return parse_cache.get_or_parse(filepath, parser.parse_document)
+    return parser.parse_document(filepath)
+
 @api.route('/parse', methods=['POST'])
 def parse_document():
     """
@@ -34,68 +179,20 @@ def parse_document():
         - JSON formatında ayrıştırılmış belge içeriği
     """
     try:
-        # Dosya kontrolü
-        if 'file' not in request.files:
-            return jsonify({
-                'success': False,
-                'error': 'No file provided',
-                'message': 'Dosya yüklenmedi'
-            }), 400
-        
-        file = request.files['file']
-        
-        if file.filename == '':
-            return jsonify({
-                'success': False,
-                'error': 'No file selected',
-                'message': 'Dosya seçilmedi'
-            }), 400
-        
-        if not allowed_file(file.filename):
-            return jsonify({
-                'success': False,
-                'error': 'Invalid file type',
-                'message': 'Desteklenmeyen dosya türü. Sadece PDF, DOC ve DOCX dosyaları kabul edilir.',
-                'allowed_extensions': list(ALLOWED_EXTENSIONS)
-            }), 400
-        
-        # Dosya boyutu kontrolü
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)
-        
-        if file_size > MAX_FILE_SIZE:
-            return jsonify({
-                'success': False,
-                'error': 'File too large',
-                'message': f'Dosya boyutu çok büyük. Maksimum {MAX_FILE_SIZE // (1024*1024)}MB dosya yükleyebilirsiniz.',
-                'max_size_mb': MAX_FILE_SIZE // (1024*1024)
-            }), 413
-        
-        # Geçici dosya oluştur
-        if not file.filename:
-            return jsonify({
-                'success': False,
-                'error': 'Invalid filename',
-                'message': 'Geçersiz dosya adı'
-            }), 400
-        
-        file_extension = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else 'tmp'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
-            file.save(temp_file.name)
-            temp_path = temp_file.name
+        temp_path, error_response = save_upload_to_temp()
+        if error_response:
+            return error_response
         
         try:
             # Belgeyi ayrıştır
-            parser = DocumentParser()
-            result = parser.parse_document(temp_path)
+            result = parse_file(temp_path)
             
             if result:
                 return jsonify({
                     'success': True,
                     'data': result,
                     'message': 'Belge başarıyla ayrıştırıldı',
-                    'original_filename': file.filename
+                    'original_filename': request.files['file'].filename
                 })
             else:
                 return jsonify({
@@ -117,6 +214,312 @@ def parse_document():
             'message': 'Sunucu hatası oluştu'
         }), 500
 
+@api.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Asenkron belge ayrıştırma işi oluşturma endpoint'i
+    Büyük belgeler için istek beklemeden iş kimliği döner
+    
+    Request:
+        - file: Yüklenecek dosya (multipart/form-data)
+    
+    Response:
+        - 202: İş kimliği ve durum sorgulama adresi
+        - 429: Kuyruk dolu
+    """
+    try:
+        temp_path, error_response = save_upload_to_temp()
+        if error_response:
+            return error_response
+        
+        # Uygulama bağlamı iş parçacığına taşınmaz, ayrıştırıcı ve önbellek burada alınır
+        parser = get_default_parser()
+        parse_cache = get_parse_cache()
+        
+        def task():
+            if parse_cache:
+                return parse_cache.get_or_parse(temp_path, parser.parse_document)
+            return parser.parse_document(temp_path)
+        
+        # Geçici dosya, iş bayat sayılıp task hiç çalışmasa da silinir
+        def cleanup():
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        
+        filename = request.files['file'].filename
+        try:
+            job_id = get_job_queue().submit(task, filename, cleanup)
+        except QueueFullError:
+            os.remove(temp_path)
+            return jsonify({
+                'success': False,
+                'error': 'Queue full',
+                'message': 'Ayrıştırma kuyruğu dolu. Lütfen daha sonra tekrar deneyin.'
+            }), 429, {'Retry-After': '5'}
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': JOB_QUEUED,
+            'status_url': url_for('legal_parser_api.get_job', job_id=job_id),
+            'original_filename': filename
+        }), 202
+        
+    except Exception as e:
+        current_app.logger.error(f"API job submit error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error',
+            'message': 'Sunucu hatası oluştu'
+        }), 500
+
+@api.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Asenkron ayrıştırma işinin durumunu sorgulama endpoint'i
+    
+    Response:
+        - status: queued, running, done veya failed
+        - data: İş tamamlandıysa ayrıştırılmış belge içeriği
+    """
+    job = get_job_queue().get(job_id)
+    
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found',
+            'message': 'İş bulunamadı'
+        }), 404
+    
+    response = {
+        'success': job['status'] != JOB_FAILED,
+        'job_id': job_id,
+        'status': job['status'],
+        'original_filename': job['filename'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at']
+    }
+    
+    if job['status'] == JOB_DONE:
+        response['data'] = job['result']
+    elif job['status'] == JOB_FAILED:
+        response['error'] = job['error']
+        response['message'] = 'Belge ayrıştırılamadı'
+    
+    return jsonify(response)
+
+def _parse_in_worker(filepath):
+    """Toplu ayrıştırmada işçi işlem içinde çalışır"""
+    return get_default_parser().parse_document(filepath)
+
+def _batch_error(index, filename, error, message):
+    return {'index': index, 'filename': filename, 'success': False, 'error': error, 'message': message}
+
+def collect_batch_files(temp_dir, max_files, max_bytes):
+    """
+    Toplu istekteki dosyaları (ve zip arşivlerinin içeriğini) geçici klasöre çıkar
+    
+    Sınırlar çıkarma sırasında uygulanır: zip arşivleri, içerik listesindeki
+    dosya sayısı ve ZipInfo.file_size toplamı sınırı aşıyorsa hiç açılmaz;
+    bildirilen boyutlar yanlış olabileceği için yazılan baytlar da sayılır.
+    
+    Returns:
+        - [(sıra, dosya adı, geçici yol veya None, hata veya None)]
+    
+    Raises:
+        - BatchLimitError: max_files veya max_bytes aşıldığında
+    """
+    items = []
+    total_bytes = 0
+    
+    def check_limits(file_count, size):
+        if len(items) + file_count > max_files:
+            raise BatchLimitError('Invalid batch size',
+                                  f'Toplu istekte 1 ile {max_files} arasında dosya gönderilmelidir.', 400)
+        if total_bytes + size > max_bytes:
+            raise BatchLimitError('Batch too large', f'Toplu istekteki dosyaların toplam boyutu en fazla '
+                                  f'{max_bytes // (1024*1024)}MB olabilir.', 413)
+    
+    def add_item(filename, source):
+        nonlocal total_bytes
+        check_limits(1, 0)
+        index = len(items)
+        if not allowed_file(filename):
+            items.append((index, filename, None, _batch_error(
+                index, filename, 'Invalid file type',
+                'Desteklenmeyen dosya türü. Sadece PDF, DOC ve DOCX dosyaları kabul edilir.')))
+            return
+        
+        file_extension = filename.rsplit('.', 1)[1].lower()
+        temp_path = os.path.join(temp_dir, f"{index}.{file_extension}")
+        with open(temp_path, 'wb') as f:
+            # Boyut sınırını aşan dosyalar kopyalanırken yakalanır (zip içindeki boyut bilgisine güvenilmez)
+            copied = 0
+            for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                copied += len(chunk)
+                if copied > MAX_FILE_SIZE:
+                    break
+                check_limits(0, copied)
+                f.write(chunk)
+        
+        if copied > MAX_FILE_SIZE:
+            os.remove(temp_path)
+            items.append((index, filename, None, _batch_error(
+                index, filename, 'File too large',
+                f'Dosya boyutu çok büyük. Maksimum {MAX_FILE_SIZE // (1024*1024)}MB dosya yükleyebilirsiniz.')))
+            return
+        
+        total_bytes += copied
+        items.append((index, filename, temp_path, None))
+    
+    for file in request.files.getlist('files') + request.files.getlist('file'):
+        if not file.filename:
+            continue
+        
+        if file.filename.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(file.stream) as archive:
+                    members = [info for info in archive.infolist() if not info.is_dir()]
+                    check_limits(len(members), sum(info.file_size for info in members))
+                    for info in members:
+                        # Arşiv içindeki klasör yapısı yok sayılır, sadece dosya adı kullanılır
+                        with archive.open(info) as source:
+                            add_item(os.path.basename(info.filename), source)
+            except zipfile.BadZipFile:
+                index = len(items)
+                items.append((index, file.filename, None, _batch_error(
+                    index, file.filename, 'Invalid archive', 'Zip arşivi okunamadı')))
+        else:
+            add_item(file.filename, file.stream)
+    
+    return items
+
+@api.route('/parse-batch', methods=['POST'])
+def parse_batch():
+    """
+    Toplu belge ayrıştırma API endpoint'i
+    
+    Request:
+        - files: Yüklenecek dosyalar (multipart/form-data, birden fazla) veya zip arşivi
+        - stream: 'ndjson' ise her dosyanın sonucu bittiği anda satır satır döner
+    
+    Response:
+        - Her dosya için ayrıştırma sonucu veya hata
+    """
+    temp_dir = tempfile.mkdtemp(prefix='legal_parser_batch_')
+    max_files = current_app.config.get('LEGAL_PARSER_BATCH_MAX_FILES', 100)
+    max_bytes = current_app.config.get('LEGAL_PARSER_BATCH_MAX_BYTES', BATCH_MAX_BYTES)
+    
+    try:
+        items = collect_batch_files(temp_dir, max_files, max_bytes)
+    except BatchLimitError as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return jsonify({
+            'success': False,
+            'error': e.error,
+            'message': str(e),
+            'max_files': max_files,
+            'max_bytes': max_bytes
+        }), e.status
+    except Exception as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        current_app.logger.error(f"API batch upload error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error',
+            'message': 'Sunucu hatası oluştu'
+        }), 500
+    
+    if not items:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return jsonify({
+            'success': False,
+            'error': 'Invalid batch size',
+            'message': f'Toplu istekte 1 ile {max_files} arasında dosya gönderilmelidir.',
+            'max_files': max_files,
+            'max_bytes': max_bytes
+        }), 400
+    
+    parse_cache = get_parse_cache()
+    executor = get_batch_executor()
+    
+    def iter_results():
+        """Önbellekte olanları hemen, diğerlerini işlem havuzunda bittikçe döner"""
+        futures = {}
+        try:
+            for index, filename, temp_path, error in items:
+                if error:
+                    yield error
+                    continue
+                
+                digest = file_sha256(temp_path) if parse_cache else None
+                result = parse_cache.get(digest) if parse_cache else None
+                if result is not None:
+                    yield {'index': index, 'filename': filename, 'success': True, 'data': result}
+                    continue
+                
+                futures[executor.submit(_parse_in_worker, temp_path)] = (index, filename, digest)
+            
+            for future in as_completed(futures):
+                index, filename, digest = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    current_app.logger.error(f"API batch parse error ({filename}): {str(e)}")
+                    result = None
+                
+                if result is None:
+                    yield _batch_error(index, filename, 'Parsing failed',
+                                       'Belge ayrıştırılamadı. Dosyanın geçerli bir mevzuat belgesi olduğundan emin olun.')
+                    continue
+                
+                if parse_cache:
+                    parse_cache.put(digest, result)
+                yield {'index': index, 'filename': filename, 'success': True, 'data': result}
+        finally:
+            # İstemci NDJSON akışını yarıda bırakırsa üreteç burada kapanır: bekleyen işler
+            # iptal edilir, çalışanlar dosyalarını okurken klasör silinmesin diye beklenir
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    if request.args.get('stream') == 'ndjson' or request.form.get('stream') == 'ndjson':
+        def generate():
+            succeeded = failed = 0
+            for item in iter_results():
+                if item['success']:
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield json_codec.dumps(item) + '\n'
+            yield json_codec.dumps({'summary': {'total': len(items), 'succeeded': succeeded, 'failed': failed}}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    try:
+        results = sorted(iter_results(), key=lambda item: item['index'])
+    except Exception as e:
+        current_app.logger.error(f"API batch parse error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error',
+            'message': 'Sunucu hatası oluştu'
+        }), 500
+    
+    succeeded = sum(1 for item in results if item['success'])
+    return jsonify({
+        'success': True,
+        'results': results,
+        'message': 'Toplu ayrıştırma tamamlandı',
+        'statistics': {
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded
+        }
+    })
+
 @api.route('/parse-text', methods=['POST'])
 def parse_text():
     """
@@ -149,7 +552,7 @@ def parse_text():
             }), 400
         
         # Ayrıştırıcı oluştur ve metni işle
-        parser = DocumentParser()
+        parser = get_default_parser()
         result = parser._parse_legal_content(text)
         
         # Başlık override edilmişse kullan
@@ -265,21 +668,109 @@ def validate_document():
             'message': 'Validasyon sırasında hata oluştu'
         }), 500
 
+@api.route('/search', methods=['GET'])
+def search():
+    """
+    Kaydedilmiş belgelerde tam metin arama
+    
+    Query:
+        - q: Aranacak kelimeler (hepsi geçmeli; büyük/küçük harf ve Türkçe karakterlerden bağımsız)
+        - page, per_page: Sayfalama (per_page en fazla 100)
+        - document: Sadece bu belgede ara (opsiyonel)
+    
+    Response:
+        - Fıkra düzeyinde sonuçlar; snippet HTML olarak kaçırılmış metin ve <mark> etiketleri içerir
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({
+            'success': False,
+            'error': 'Empty query',
+            'message': 'Arama metni (q) boş olamaz'
+        }), 400
+    
+    try:
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = min(100, max(1, request.args.get('per_page', 20, type=int)))
+        
+        results = get_search_index().search(query, page=page, per_page=per_page,
+                                            document=request.args.get('document'))
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            **results
+        })
+    except Exception as e:
+        current_app.logger.error(f"API search error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error',
+            'message': 'Arama sırasında hata oluştu'
+        }), 500
+
+@api.route('/documents/<document_id>/articles', methods=['GET'])
+def get_articles(document_id):
+    """
+    Kaydedilmiş bir belgenin maddelerini parça parça döndür
+    
+    Query:
+        - offset: İlk maddenin sırası (varsayılan 0)
+        - limit: Madde sayısı (varsayılan 50, en fazla 200)
+    
+    Response:
+        - Sadece istenen maddeler ve toplam madde sayısı; belgenin tamamı okunmaz
+    """
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = min(ARTICLE_PAGE_MAX, max(1, request.args.get('limit', 50, type=int)))
+    
+    try:
+        articles, total = get_document_store().load_articles(secure_filename(document_id), offset, limit)
+    except KeyError:
+        return jsonify({
+            'success': False,
+            'error': 'Document not found',
+            'message': 'Belge bulunamadı'
+        }), 404
+    except Exception as e:
+        current_app.logger.error(f"API articles error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error',
+            'message': 'Maddeler okunurken hata oluştu'
+        }), 500
+    
+    return jsonify({
+        'success': True,
+        'document': document_id,
+        'offset': offset,
+        'limit': limit,
+        'total': total,
+        'maddeler': articles
+    })
+
 @api.route('/health', methods=['GET'])
 def health_check():
     """API sağlık kontrolü"""
     try:
         # Parser test
-        parser = DocumentParser()
+        parser = get_default_parser()
+        parse_cache = get_parse_cache()
         
         return jsonify({
             'status': 'healthy',
             'service': 'legal-parser-api',
             'version': '1.0.0',
+            'cache': parse_cache.stats() if parse_cache else None,
             'endpoints': [
                 '/api/legal-parser/parse',
+                '/api/legal-parser/parse-batch',
                 '/api/legal-parser/parse-text',
+                '/api/legal-parser/jobs',
+                '/api/legal-parser/jobs/<job_id>',
                 '/api/legal-parser/validate',
+                '/api/legal-parser/search',
+                '/api/legal-parser/documents/<document_id>/articles',
                 '/api/legal-parser/health'
             ]
         })
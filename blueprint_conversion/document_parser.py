@@ -5,29 +5,53 @@ Mevcut document_parser.py dosyasının kopyası (değişiklik yok)
 
 import re
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional
 from docx import Document
 import pdfplumber
 
+import doc_text
+
 # Logging setup
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Ayrıştırma kuralları değiştiğinde artırılmalı; önbellekteki eski sonuçlar geçersiz olur
+PARSER_VERSION = "1.0.0"
+
+# Regex'ler modül yüklenirken bir kez derlenir ve tüm örnekler tarafından paylaşılır
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+_NUMBERED_LINE_RE = re.compile(r'^\d+\.?\s')
+_ARTICLE_RE = re.compile(
+    r'(?:^|\n)\s*(?:MADDE\s+(\d+)|Madde\s+(\d+))\s*[-–—]?\s*(.*?)(?=(?:\n\s*(?:MADDE\s+\d+|Madde\s+\d+))|$)',
+    re.MULTILINE | re.DOTALL | re.IGNORECASE
+)
+_PARENTHETICAL_RE = re.compile(r'^\(.*\)$')
+_NUMBERED_MARKER_RE = re.compile(r'^(\d+\)|[a-zA-Z]\)|\(\d+\)|\([a-zA-Z]\))')
+
+SUBJECT_HEADERS = frozenset({
+    'dayanak', 'amaç', 'kapsam', 'tanımlar', 'tanım', 'ilkeler',
+    'başvuru', 'değerlendirme', 'kabul', 'kayıt', 'öğretim',
+    'sınav', 'mezuniyet', 'yürürlük', 'geçici', 'son hükümler',
+    'ek madde', 'geçici madde'
+})
+
 class DocumentParser:
-    """Parser for Turkish legal documents in Word and PDF formats."""
+    """
+    Parser for Turkish legal documents in Word and PDF formats.
     
-    def __init__(self):
-        self.subject_headers = {
-            'dayanak', 'amaç', 'kapsam', 'tanımlar', 'tanım', 'ilkeler',
-            'başvuru', 'değerlendirme', 'kabul', 'kayıt', 'öğretim',
-            'sınav', 'mezuniyet', 'yürürlük', 'geçici', 'son hükümler',
-            'ek madde', 'geçici madde'
-        }
+    Örnek durum tutmaz; ayrıştırma sırasındaki tüm veriler çağrıya özeldir.
+    Bu yüzden tek bir örnek istekler ve iş parçacıkları arasında paylaşılabilir.
+    """
+    
+    subject_headers = SUBJECT_HEADERS
     
     def _is_subject_header(self, line: str) -> bool:
         """Check if a line is a subject header that should be excluded from paragraphs."""
         line_clean = line.strip().lower()
-        line_clean = re.sub(r'[^\w\s]', '', line_clean)
+        line_clean = _PUNCTUATION_RE.sub('', line_clean)
         
         return any(header in line_clean for header in self.subject_headers)
     
@@ -62,12 +86,16 @@ class DocumentParser:
     def _extract_text_from_word(self, filepath: str) -> str:
         """Extract text from Word document."""
         try:
-            doc = Document(filepath)
+            # Eski Word 97-2003 (.doc) dosyaları python-docx ile açılamaz
+            if doc_text.is_ole_file(filepath):
+                paragraphs = doc_text.iter_paragraph_texts(filepath)
+            else:
+                paragraphs = (paragraph.text for paragraph in Document(filepath).paragraphs)
             text = []
             
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text.append(paragraph.text.strip())
+            for paragraph in paragraphs:
+                if paragraph.strip():
+                    text.append(paragraph.strip())
             
             return '\n'.join(text)
             
@@ -107,10 +135,10 @@ class DocumentParser:
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         
         # Remove excessive line breaks
-        text = re.sub(r'\n\s*\n', '\n', text)
+        text = _BLANK_LINES_RE.sub('\n', text)
         
         return text.strip()
     
@@ -138,7 +166,7 @@ class DocumentParser:
         
         # Fallback to first substantial line
         for line in lines[:5]:
-            if len(line.strip()) > 20 and not re.match(r'^\d+\.?\s', line.strip()):
+            if len(line.strip()) > 20 and not _NUMBERED_LINE_RE.match(line.strip()):
                 return line.strip()
         
         return "Belge Başlığı Bulunamadı"
@@ -147,10 +175,7 @@ class DocumentParser:
         """Extract articles and their paragraphs."""
         articles = []
         
-        # Improved article pattern to catch various formats
-        article_pattern = r'(?:^|\n)\s*(?:MADDE\s+(\d+)|Madde\s+(\d+))\s*[-–—]?\s*(.*?)(?=(?:\n\s*(?:MADDE\s+\d+|Madde\s+\d+))|$)'
-        
-        matches = re.finditer(article_pattern, text, re.MULTILINE | re.DOTALL | re.IGNORECASE)
+        matches = _ARTICLE_RE.finditer(text)
         
         for match in matches:
             article_num = match.group(1) or match.group(2)
@@ -188,7 +213,7 @@ class DocumentParser:
                 continue
             
             # Skip parenthetical metadata
-            if re.match(r'^\(.*\)$', line):
+            if _PARENTHETICAL_RE.match(line):
                 logger.debug(f"Skipping parenthetical metadata: {line}")
                 continue
             
@@ -198,7 +223,7 @@ class DocumentParser:
                 continue
             
             # Check for numbered paragraphs (1), 2), a), b), etc.
-            numbered_match = re.match(r'^(\d+\)|[a-zA-Z]\)|\(\d+\)|\([a-zA-Z]\))', line)
+            numbered_match = _NUMBERED_MARKER_RE.match(line)
             
             if numbered_match:
                 # Save previous paragraph if exists
@@ -229,10 +254,16 @@ class DocumentParser:
     def _clean_article_header(self, header: str) -> str:
         """Clean and standardize article header."""
         # Remove extra whitespace and normalize
-        header = re.sub(r'\s+', ' ', header.strip())
+        header = _WHITESPACE_RE.sub(' ', header.strip())
         
         # Ensure proper format
         if not header.upper().startswith('MADDE'):
             header = f"Madde {header}"
         
-        return header
\ No newline at end of file
+        return header
+
+
+@lru_cache(maxsize=None)
+def get_default_parser() -> DocumentParser:
+    """İşlem başına paylaşılan ayrıştırıcıyı döndür (ilk çağrıda oluşturulur)"""
+    return DocumentParser()
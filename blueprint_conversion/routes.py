@@ -3,13 +3,18 @@ Legal Parser Routes - Blueprint Version
 Mevcut app.py dosyasının blueprint formatına dönüştürülmüş hali
 """
 
+import io
 import os
 import json
+import sqlite3
 import uuid
 from flask import request, render_template, redirect, url_for, flash, send_file, jsonify, current_app
 from werkzeug.utils import secure_filename
+import json_codec
+from document_store import download_payload, keeping_metadata
 from . import legal_parser
-from .document_parser import DocumentParser
+from .document_parser import get_default_parser
+from .api_version import get_search_index, get_document_store
 
 # Konfigürasyon
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
@@ -27,9 +32,16 @@ def ensure_upload_folder():
         os.makedirs(upload_folder)
     return upload_folder
 
+def update_search_index(json_filename, document):
+    """Kaydı arama dizinine işle; dizin hatası kaydetmeyi başarısız saymaz"""
+    try:
+        get_search_index().index_document(json_filename, document)
+    except sqlite3.Error as e:
+        current_app.logger.warning(f"Search index update failed for {json_filename}: {str(e)}")
+
 def tojson_utf8(obj, indent=None):
     """Convert object to JSON with proper UTF-8 encoding for display."""
-    return json.dumps(obj, ensure_ascii=False, indent=indent)
+    return json_codec.dumps(obj, pretty=bool(indent))
 
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension."""
@@ -84,16 +96,13 @@ def upload_file():
         file.save(filepath)
         
         # Belgeyi ayrıştır
-        parser = DocumentParser()
+        parser = get_default_parser()
         result = parser.parse_document(filepath)
         
         if result:
             # JSON dosyası oluştur
-            json_filename = f"{safe_filename}.json"
-            json_filepath = os.path.join(upload_folder, json_filename)
-            
-            with open(json_filepath, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            json_filename = get_document_store().create(result, f"{safe_filename}.json")
+            update_search_index(json_filename, result)
             
             flash('Dosya başarıyla işlendi!', 'success')
             return render_template('legal_parser/result.html', 
@@ -118,8 +127,7 @@ def edit_document(json_filename):
         filepath = os.path.join(upload_folder, json_filename)
         
         if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                result = json.load(f)
+            result = json_codec.read_record(filepath)
             return render_template('legal_parser/edit.html', 
                                  result=result, 
                                  json_filename=json_filename,
@@ -137,30 +145,44 @@ def save_document(json_filename):
     """Düzenlenmiş belgeyi kaydet"""
     try:
         data = request.get_json()
-        if not data:
+        if not isinstance(data, dict) or not data:
             return jsonify({'success': False, 'message': 'Geçersiz veri'})
         
-        upload_folder = get_upload_folder()
-        filepath = os.path.join(upload_folder, json_filename)
+        document_store = get_document_store()
+        if not document_store.exists(json_filename):
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # _metadata sunucuya aittir: istemcinin gönderdiği yok sayılır, kayıttaki korunur
+        version = document_store.update(json_filename, keeping_metadata(data))
+        update_search_index(json_filename, data)
         
-        return jsonify({'success': True, 'message': 'Değişiklikler kaydedildi'})
+        return jsonify({'success': True, 'message': 'Değişiklikler kaydedildi', 'version': version})
     except Exception as e:
         current_app.logger.error(f"Save error: {str(e)}")
         return jsonify({'success': False, 'message': 'Kaydetme hatası oluştu'})
 
 @legal_parser.route('/download/<filename>')
 def download_file(filename):
-    """JSON dosyası indirme"""
+    """JSON dosyası indirme
+
+    Sıkıştırılmış (gzip/zstd) kayıtlar, istemci o kodlamayı kabul ediyorsa
+    yeniden sıkıştırılmadan Content-Encoding başlığıyla gönderilir; diğer
+    tüm kayıtlar (diskte girintisiz duran düz kayıtlar dahil) girintili JSON
+    olarak gönderilir.
+    """
     try:
-        upload_folder = get_upload_folder()
-        return send_file(
-            os.path.join(upload_folder, filename),
-            as_attachment=True,
-            download_name=filename
-        )
+        data, encoding, varies = download_payload(get_document_store(), filename,
+                                                  lambda encoding: request.accept_encodings[encoding])
+        response = send_file(io.BytesIO(data), mimetype='application/json', as_attachment=True,
+                             download_name=filename)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if varies:
+            response.vary.add('Accept-Encoding')
+        return response
+    except KeyError:
+        flash('Dosya bulunamadı', 'error')
+        return redirect(url_for('legal_parser.index'))
     except Exception as e:
         current_app.logger.error(f"Download error: {str(e)}")
         flash('Dosya indirilirken hata oluştu', 'error')
@@ -181,7 +203,7 @@ def health_check():
             }), 503
         
         # Parser kontrolü
-        parser = DocumentParser()
+        parser = get_default_parser()
         
         return jsonify({
             'status': 'healthy',
@@ -0,0 +1,190 @@
+"""Offline bulk ingestion: parse a directory tree of documents into JSON Lines.
+
+Usage:
+    python bulk_ingest.py ARSIV_DIZINI -o mevzuat.jsonl --workers 4
+
+Every output line is a parse result with a _metadata block holding the source
+path, its SHA-256 digest and the parser version, tagged with the non-default
+options used (e.g. "1.2.0+structured"). Re-running against the same output
+file skips documents whose digest was already ingested with the same parser
+version and options, so only new or changed files are parsed.
+"""
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+import click
+import pdfplumber
+
+import json_codec
+from document_model import ParsedDocument
+from document_parser import DocumentParser, PDF_ENGINES, options_version
+from parse_cache import file_sha256
+
+SUPPORTED_EXTENSIONS = {'pdf', 'doc', 'docx'}
+
+# One parser per worker process, built on first use
+_parser = None
+
+
+def iter_documents(paths) -> Iterator[str]:
+    """Yield supported files under the given files/directories in a stable order."""
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.rsplit('.', 1)[-1].lower() in SUPPORTED_EXTENSIONS:
+                    yield os.path.join(dirpath, filename)
+
+
+def load_ingested_digests(output_path: str, parser_version: str) -> Set[str]:
+    """Digests already present in an existing output file for parser_version (see options_version)."""
+    digests = set()
+    if not os.path.exists(output_path):
+        return digests
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                metadata = json_codec.loads(line).get('_metadata') or {}
+            except ValueError:
+                # A torn last line from an interrupted run; that file is simply parsed again
+                continue
+            if metadata.get('parser_version') == parser_version and metadata.get('file_sha256'):
+                digests.add(metadata['file_sha256'])
+
+    return digests
+
+
+def _count_pages(filepath: str) -> int:
+    if not filepath.lower().endswith('.pdf'):
+        return 0
+    with pdfplumber.open(filepath) as pdf:
+        return len(pdf.pages)
+
+
+def _ingest_file(filepath: str, pdf_engine: str = 'layout', docx_numbering: bool = False,
+                 structured: bool = False) -> Tuple[Optional[ParsedDocument], int, Optional[str]]:
+    """Parse one file in a worker; returns (result, page count, error).
+
+    The compact ParsedDocument is what crosses the process boundary; the
+    writer serializes it article by article, never building the whole dict.
+    """
+    global _parser
+    if _parser is None or _parser.docx_numbering != docx_numbering:
+        _parser = DocumentParser(docx_numbering=docx_numbering)
+
+    try:
+        result = _parser.parse_document_model(filepath, pdf_engine=pdf_engine, structured=structured)
+        if result is None:
+            return None, 0, 'Parsing failed'
+        return result, _count_pages(filepath), None
+    except Exception as e:
+        return None, 0, str(e)
+
+
+def ingest(paths, output, workers: int = 0, skip_existing: bool = True, pdf_engine: str = 'layout',
+           docx_numbering: bool = False, structured: bool = False) -> Dict:
+    """Parse every document under paths and write one JSON object per line to output.
+
+    output is a file path or '-' for stdout. Returns throughput statistics.
+    """
+    logger = logging.getLogger(__name__)
+    to_stdout = output == '-'
+    parser_version = options_version(pdf_engine, docx_numbering, structured)
+    known = load_ingested_digests(output, parser_version) if skip_existing and not to_stdout else set()
+
+    stats = {'parsed': 0, 'skipped': 0, 'failed': 0, 'pages': 0}
+    started = time.perf_counter()
+
+    # Hashing happens up front so unchanged and duplicate files never reach a worker
+    pending = []
+    for filepath in iter_documents(paths):
+        digest = file_sha256(filepath)
+        if digest in known:
+            stats['skipped'] += 1
+            continue
+        known.add(digest)
+        pending.append((filepath, digest))
+
+    out = sys.stdout if to_stdout else open(output, 'a', encoding='utf-8')
+
+    def write_result(filepath, digest, outcome):
+        document, pages, error = outcome
+        if document is None:
+            logger.error(f"Failed to parse {filepath}: {error}")
+            stats['failed'] += 1
+            return
+
+        metadata = {
+            'original_filename': os.path.basename(filepath),
+            'source_path': filepath,
+            'file_type': filepath.rsplit('.', 1)[-1].lower(),
+            'file_sha256': digest,
+            'parser_version': parser_version
+        }
+        out.write(json_codec.dumps_document(document, {'_metadata': metadata}).decode('utf-8') + '\n')
+        out.flush()
+        stats['parsed'] += 1
+        stats['pages'] += pages
+
+    try:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_ingest_file, filepath, pdf_engine, docx_numbering,
+                                           structured): (filepath, digest)
+                           for filepath, digest in pending}
+                for future in as_completed(futures):
+                    write_result(*futures[future], future.result())
+        else:
+            for filepath, digest in pending:
+                write_result(filepath, digest, _ingest_file(filepath, pdf_engine, docx_numbering, structured))
+    finally:
+        if not to_stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    stats['seconds'] = round(elapsed, 3)
+    stats['docs_per_second'] = round(stats['parsed'] / elapsed, 2) if elapsed else 0.0
+    stats['pages_per_second'] = round(stats['pages'] / elapsed, 2) if elapsed else 0.0
+    return stats
+
+
+@click.command()
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('-o', '--output', default='-', show_default=True,
+              help="JSON Lines output file, appended to; '-' writes to stdout.")
+@click.option('-w', '--workers', default=os.cpu_count() or 1, show_default=True,
+              help='Number of parser processes; 1 parses in this process.')
+@click.option('--skip-existing/--no-skip-existing', default=True, show_default=True,
+              help='Skip files whose digest is already in the output file.')
+@click.option('--pdf-engine', type=click.Choice(PDF_ENGINES), default='layout', show_default=True,
+              help="PDF text extraction engine; 'chars' skips pdfplumber's layout analysis.")
+@click.option('--docx-numbering', is_flag=True,
+              help='Prefix Word paragraphs with their automatic list markers, e.g. "(1)" or "a)".')
+@click.option('--structured', is_flag=True,
+              help='Add each article\'s fıkra/bent/alt bent tree with offsets into the cleaned text.')
+def main(paths, output, workers, skip_existing, pdf_engine, docx_numbering, structured):
+    """Parse legal documents under PATHS into JSON Lines."""
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    stats = ingest(paths, output, workers=workers, skip_existing=skip_existing, pdf_engine=pdf_engine,
+                   docx_numbering=docx_numbering, structured=structured)
+
+    click.echo(
+        f"{stats['parsed']} parsed, {stats['skipped']} skipped, {stats['failed']} failed "
+        f"in {stats['seconds']}s ({stats['docs_per_second']} docs/s, "
+        f"{stats['pages_per_second']} pages/s)",
+        err=True
+    )
+    sys.exit(1 if stats['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""Text extraction from legacy binary Word (.doc, Word 97-2003) files in pure Python.
+
+A .doc file is a Compound File Binary (OLE2) container. The document text
+lives in the WordDocument stream as a sequence of pieces, described by the
+piece table (Clx) in the 0Table or 1Table stream; each piece is either
+8-bit (cp1252) or UTF-16LE text. Only the main document text (the first
+ccpText characters) is returned: headers, footnotes and text boxes follow it
+in the character stream and are skipped. Field codes are dropped and only
+their displayed results are kept, so e.g. a PAGE field reads as its number.
+
+Nothing is converted through an external program, so there is no process
+startup per file and no converter to keep alive; malformed sector chains
+raise DocFormatError instead of looping.
+"""
+import re
+import struct
+from typing import Dict, Iterator, List
+
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+_END_OF_CHAIN = 0xFFFFFFFE
+_FREE_SECTOR = 0xFFFFFFFF
+_MAX_REGULAR_SECTOR = 0xFFFFFFFA
+
+_WORD_IDENT = 0xA5EC
+_MIN_WORD97_NFIB = 0x00C1
+
+# Word's in-text control characters and their plain-text equivalents
+_CONTROL_CHARS = str.maketrans({
+    '\r': '\n',      # paragraph end
+    '\x0b': '\n',    # line break
+    '\x0c': '\n',    # page or section break
+    '\x07': '\n',    # table cell / row end
+    '\x0e': '\n',    # column break
+    '\x1e': '-',     # non-breaking hyphen
+    '\x1f': '',      # optional hyphen
+    '\x01': '',      # picture
+    '\x02': '',      # auto-numbered footnote reference
+    '\x05': '',      # annotation reference
+    '\x08': '',      # drawn object
+})
+_FIELD_BEGIN, _FIELD_SEPARATOR, _FIELD_END = '\x13', '\x14', '\x15'
+_FIELD_MARK_RE = re.compile('[\x13\x14\x15]')
+
+
+class DocFormatError(ValueError):
+    """The file is not a readable Word 97-2003 document."""
+
+
+def is_ole_file(filepath: str) -> bool:
+    """True when the file starts with the Compound File signature, whatever its extension."""
+    with open(filepath, 'rb') as f:
+        return f.read(len(OLE_SIGNATURE)) == OLE_SIGNATURE
+
+
+class CompoundFile:
+    """Read-only access to the streams of a Compound File Binary container."""
+
+    def __init__(self, data: bytes):
+        if len(data) < 512 or data[:8] != OLE_SIGNATURE:
+            raise DocFormatError('Not a Compound File (OLE2) document')
+        self.data = data
+
+        (sector_shift, mini_sector_shift) = struct.unpack_from('<HH', data, 0x1E)
+        (fat_sectors, first_directory, _, self.mini_cutoff, first_mini_fat, mini_fat_sectors,
+         first_difat, difat_sectors) = struct.unpack_from('<IIIIIIII', data, 0x2C)
+        if not 7 <= sector_shift <= 16 or mini_sector_shift >= sector_shift:
+            raise DocFormatError('Invalid sector size')
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_sector_shift
+        self.sector_count = max(0, (len(data) - self.sector_size) // self.sector_size)
+
+        # The DIFAT lists the sectors holding the FAT: 109 entries in the header, then a chain
+        fat_locations = list(struct.unpack_from('<109I', data, 0x4C))
+        sector = first_difat
+        for _ in range(difat_sectors):
+            if sector > _MAX_REGULAR_SECTOR:
+                break
+            entries = struct.unpack_from(f'<{self.sector_size // 4}I', self._sector(sector))
+            fat_locations.extend(entries[:-1])
+            sector = entries[-1]
+        fat_locations = [location for location in fat_locations[:fat_sectors] if location <= _MAX_REGULAR_SECTOR]
+        self.fat = self._read_table(b''.join(self._sector(location) for location in fat_locations))
+
+        self.entries = self._read_directory(first_directory)
+        root = self.entries[0]
+        self.mini_stream = self._read_chain(root['start'], root['size']) if root['size'] else b''
+        self.mini_fat = self._read_table(self._read_chain(first_mini_fat)) if mini_fat_sectors else []
+
+    @staticmethod
+    def _read_table(raw: bytes) -> List[int]:
+        return list(struct.unpack(f'<{len(raw) // 4}I', raw[:len(raw) // 4 * 4]))
+
+    def _sector(self, sector: int) -> bytes:
+        if sector >= self.sector_count:
+            raise DocFormatError(f'Sector {sector} is out of range')
+        offset = (sector + 1) * self.sector_size
+        return self.data[offset:offset + self.sector_size]
+
+    def _chain(self, start: int, table: List[int], limit: int) -> Iterator[int]:
+        """Follow a sector chain, refusing chains longer than the table (i.e. cycles)."""
+        sector = start
+        for _ in range(limit):
+            if sector == _END_OF_CHAIN or sector == _FREE_SECTOR:
+                return
+            if sector >= len(table):
+                raise DocFormatError(f'Sector {sector} is outside the allocation table')
+            yield sector
+            sector = table[sector]
+        if sector not in (_END_OF_CHAIN, _FREE_SECTOR):
+            raise DocFormatError('Sector chain does not terminate')
+
+    def _read_chain(self, start: int, size: int = -1) -> bytes:
+        data = b''.join(self._sector(sector) for sector in self._chain(start, self.fat, len(self.fat)))
+        return data if size < 0 else data[:size]
+
+    def _read_mini_chain(self, start: int, size: int) -> bytes:
+        parts = []
+        for sector in self._chain(start, self.mini_fat, len(self.mini_fat)):
+            offset = sector * self.mini_sector_size
+            parts.append(self.mini_stream[offset:offset + self.mini_sector_size])
+        return b''.join(parts)[:size]
+
+    def _read_directory(self, first_sector: int) -> List[Dict]:
+        raw = self._read_chain(first_sector)
+        entries = []
+        for offset in range(0, len(raw) - 127, 128):
+            name_length, entry_type = struct.unpack_from('<HB', raw, offset + 64)
+            start, size = struct.unpack_from('<IQ', raw, offset + 116)
+            if self.sector_size == 512:
+                # Version 3 files only use the low 32 bits of the size
+                size &= 0xFFFFFFFF
+            name = raw[offset:offset + max(0, min(name_length, 64) - 2)].decode('utf-16-le', 'replace')
+            entries.append({'name': name, 'type': entry_type, 'start': start, 'size': size})
+        if not entries or entries[0]['type'] != 5:
+            raise DocFormatError('Missing root directory entry')
+        return entries
+
+    def read_stream(self, name: str) -> bytes:
+        for entry in self.entries[1:]:
+            if entry['type'] == 2 and entry['name'] == name:
+                if entry['size'] < self.mini_cutoff:
+                    return self._read_mini_chain(entry['start'], entry['size'])
+                return self._read_chain(entry['start'], entry['size'])
+        raise KeyError(name)
+
+
+def _strip_fields(text: str) -> str:
+    """Drop field codes, keeping each field's displayed result."""
+    if _FIELD_BEGIN not in text:
+        return text
+    parts = []
+    # One entry per open field: True while inside its code (before the separator)
+    fields = []
+    position = 0
+    for match in _FIELD_MARK_RE.finditer(text):
+        if not any(fields):
+            parts.append(text[position:match.start()])
+        mark = match.group()
+        if mark == _FIELD_BEGIN:
+            fields.append(True)
+        elif mark == _FIELD_SEPARATOR and fields:
+            fields[-1] = False
+        elif mark == _FIELD_END and fields:
+            fields.pop()
+        position = match.end()
+    if not any(fields):
+        parts.append(text[position:])
+    return ''.join(parts)
+
+
+def _piece_table(table: bytes, fc_clx: int, lcb_clx: int):
+    """CP boundaries and piece descriptors of the PlcPcd inside the Clx."""
+    position = fc_clx
+    end = fc_clx + lcb_clx
+    while position < end:
+        clxt = table[position]
+        if clxt == 0x01:
+            # Prc: property modifiers, not needed for text
+            (size,) = struct.unpack_from('<H', table, position + 1)
+            position += 3 + size
+        elif clxt == 0x02:
+            (size,) = struct.unpack_from('<I', table, position + 1)
+            count = (size - 4) // 12
+            cps = struct.unpack_from(f'<{count + 1}I', table, position + 5)
+            pieces = [struct.unpack_from('<HIH', table, position + 5 + (count + 1) * 4 + i * 8)[1]
+                      for i in range(count)]
+            return cps, pieces
+        else:
+            break
+    raise DocFormatError('Piece table not found')
+
+
+def extract_text(filepath: str) -> str:
+    """Main document text of a Word 97-2003 file, with paragraphs separated by newlines."""
+    with open(filepath, 'rb') as f:
+        container = CompoundFile(f.read())
+
+    try:
+        word = container.read_stream('WordDocument')
+    except KeyError:
+        raise DocFormatError('Not a Word document (no WordDocument stream)')
+
+    if len(word) < 154:
+        raise DocFormatError('Truncated Word document')
+    ident, n_fib = struct.unpack_from('<HH', word, 0)
+    (flags,) = struct.unpack_from('<H', word, 0x0A)
+    if ident != _WORD_IDENT:
+        raise DocFormatError('Not a Word document')
+    if n_fib < _MIN_WORD97_NFIB:
+        raise DocFormatError('Word 6.0/95 documents are not supported')
+    if flags & 0x0100:
+        raise DocFormatError('Encrypted Word documents are not supported')
+
+    # FibBase (32 bytes), then three length-prefixed arrays: fibRgW, fibRgLw and fibRgFcLcb
+    (csw,) = struct.unpack_from('<H', word, 32)
+    rg_lw = 34 + csw * 2 + 2
+    (cslw,) = struct.unpack_from('<H', word, rg_lw - 2)
+    (ccp_text,) = struct.unpack_from('<I', word, rg_lw + 12)
+    rg_fc_lcb = rg_lw + cslw * 4 + 2
+    fc_clx, lcb_clx = struct.unpack_from('<II', word, rg_fc_lcb + 33 * 8)
+
+    try:
+        table = container.read_stream('1Table' if flags & 0x0200 else '0Table')
+    except KeyError:
+        raise DocFormatError('Word table stream is missing')
+    if fc_clx + lcb_clx > len(table):
+        raise DocFormatError('Piece table is out of range')
+    cps, pieces = _piece_table(table, fc_clx, lcb_clx)
+
+    parts = []
+    for index, fc in enumerate(pieces):
+        start, stop = cps[index], min(cps[index + 1], ccp_text)
+        if start >= stop:
+            break
+        length = stop - start
+        if fc & 0x40000000:
+            offset = (fc & 0x3FFFFFFF) // 2
+            parts.append(word[offset:offset + length].decode('cp1252', 'replace'))
+        else:
+            offset = fc & 0x3FFFFFFF
+            parts.append(word[offset:offset + length * 2].decode('utf-16-le', 'replace'))
+
+    return _strip_fields(''.join(parts)).translate(_CONTROL_CHARS)
+
+
+def iter_paragraph_texts(filepath: str) -> Iterator[str]:
+    """Yield the paragraphs of a Word 97-2003 file, in order (empty ones included)."""
+    yield from extract_text(filepath).split('\n')
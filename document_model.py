@@ -0,0 +1,147 @@
+"""Compact in-memory representation of a parse result.
+
+A parse result as a nested dict holds one dict per article plus one str
+object per fıkra, each with its own header (about 50 bytes before the first
+character). ParsedDocument instead writes every fıkra text into a single
+shared UTF-8 buffer and keeps only their end offsets in an array; articles
+are slotted objects pointing at a range of that array. UTF-8 also halves the
+text itself: a Python str holding any of ğ, ı or ş stores every character in
+two bytes, while Turkish text is mostly ASCII. The familiar
+mevzuat_basligi / maddeler / fikralar dict is produced on demand by
+to_dict(), or streamed article by article with iter_article_dicts() (see
+json_codec.dumps_document). Callers that need the dict anyway build it
+directly with DictBuilder instead of going through the model.
+"""
+import io
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class Article:
+    """One madde: its number and the range of its fıkralar in the document's buffer."""
+
+    __slots__ = ('number', 'first', 'stop', 'extra')
+
+    def __init__(self, number: str, first: int, stop: int, extra: Optional[Dict] = None):
+        self.number = number
+        # Indexes into ParsedDocument.bounds: fıkra i spans bounds[i]..bounds[i + 1]
+        self.first = first
+        self.stop = stop
+        # Optional keys added after "fikralar" (e.g. the structured tree)
+        self.extra = extra
+
+    def __len__(self) -> int:
+        return self.stop - self.first
+
+
+class ParsedDocument:
+    """Title and articles of a parsed document, with all fıkra texts in one UTF-8 buffer."""
+
+    __slots__ = ('title', 'articles', 'buffer', 'bounds', 'extra')
+
+    def __init__(self, title: str, articles: List[Article], buffer: bytes, bounds: array,
+                 extra: Optional[Dict] = None):
+        self.title = title
+        self.articles = articles
+        # Byte offsets: fıkra i is buffer[bounds[i]:bounds[i + 1]]
+        self.buffer = buffer
+        self.bounds = bounds
+        # Optional top-level keys added after "maddeler" (e.g. kaynak_metin)
+        self.extra = extra
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def __iter__(self) -> Iterator[Article]:
+        return iter(self.articles)
+
+    @property
+    def paragraph_count(self) -> int:
+        return len(self.bounds) - 1
+
+    def paragraphs(self, article: Article) -> List[str]:
+        """The fıkra texts of one of this document's articles."""
+        buffer, bounds = self.buffer, self.bounds
+        return [buffer[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(article.first, article.stop)]
+
+    def article_dict(self, article: Article) -> Dict:
+        data = {
+            "madde_numarasi": article.number,
+            "fikralar": self.paragraphs(article)
+        }
+        if article.extra:
+            data.update(article.extra)
+        return data
+
+    def iter_article_dicts(self) -> Iterator[Dict]:
+        """Materialize articles one at a time, e.g. to stream them out."""
+        for article in self.articles:
+            yield self.article_dict(article)
+
+    def to_dict(self) -> Dict:
+        """The result in the parser's dict shape (mevzuat_basligi, maddeler, fikralar)."""
+        data = {
+            "mevzuat_basligi": self.title,
+            "maddeler": list(self.iter_article_dicts())
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+class DocumentBuilder:
+    """Collects articles as the parser produces them and packs them into a ParsedDocument.
+
+    Fıkra texts are copied into the buffer as they are added, so the
+    per-article strings can be freed right away instead of living as long
+    as the result.
+    """
+
+    __slots__ = ('_buffer', '_length', '_bounds', '_articles')
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+        self._length = 0
+        self._bounds = array('L', [0])
+        self._articles = []
+
+    def add_article(self, number: str, paragraphs: Iterable[str], extra: Optional[Dict] = None) -> None:
+        first = len(self._bounds) - 1
+        for paragraph in paragraphs:
+            self._length += self._buffer.write(paragraph.encode('utf-8'))
+            self._bounds.append(self._length)
+        self._articles.append(Article(number, first, len(self._bounds) - 1, extra))
+
+    def build(self, title: str, extra: Optional[Dict] = None) -> ParsedDocument:
+        return ParsedDocument(title, self._articles, self._buffer.getvalue(), self._bounds, extra)
+
+
+class DictBuilder:
+    """DocumentBuilder's counterpart that builds the result dict directly.
+
+    For callers that need the nested dict anyway (to store, index or render
+    it): packing the texts into a buffer first would only add a copy.
+    """
+
+    __slots__ = ('_articles',)
+
+    def __init__(self):
+        self._articles = []
+
+    def add_article(self, number: str, paragraphs: Iterable[str], extra: Optional[Dict] = None) -> None:
+        article = {
+            "madde_numarasi": number,
+            "fikralar": list(paragraphs)
+        }
+        if extra:
+            article.update(extra)
+        self._articles.append(article)
+
+    def build(self, title: str, extra: Optional[Dict] = None) -> Dict:
+        data = {
+            "mevzuat_basligi": title,
+            "maddeler": self._articles
+        }
+        if extra:
+            data.update(extra)
+        return data
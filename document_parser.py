@@ -1,58 +1,226 @@
+import os
 import re
 import logging
+import time
+from collections import Counter
+from heapq import merge
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from docx import Document
 import pdfplumber
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import doc_text
+import docx_text
+import pdf_text
+from document_model import DictBuilder, DocumentBuilder, ParsedDocument
+from metrics import Metrics, StageTimings, size_class
+
+# Bump whenever parsing rules change so cached results are invalidated
+PARSER_VERSION = "1.2.0"
+
+# PDF text extraction engines: 'layout' is pdfplumber's extract_text(), 'chars'
+# builds lines straight from pdfminer's character stream (see pdf_text.py)
+PDF_ENGINES = ('layout', 'chars')
+
+# Regex patterns for Turkish legal documents
+ARTICLE_PATTERNS = [
+    r'(?:^|\n)\s*(?:MADDE|Madde)\s+(\d+|[IVXLCDM]+)\s*[–\-:]\s*',
+    r'(?:^|\n)\s*(?:MADDE|Madde)\s+(\d+|[IVXLCDM]+)\s*\.?\s*',
+    r'(?:^|\n)\s*(\d+)\s*\.\s*(?:MADDE|Madde)\s*[–\-:]?\s*'
+]
+
+# Pattern for numbered paragraph markers (main paragraphs) - handles both (1) and 1) formats
+MAIN_PARAGRAPH_PATTERNS = [
+    r'^\s*\((\d+)\)\s*',  # Format: (1), (2), (3)
+    r'^\s*(\d+)\)\s*'     # Format: 1), 2), 3)
+]
+
+# Pattern for lettered sub-items - handles both (a) and a) formats
+SUB_ITEM_PATTERNS = [
+    r'^\s*\(([a-z])\)\s*',  # Format: (a), (b), (c)
+    r'^\s*([a-z])\)\s*'     # Format: a), b), c)
+]
+
+# Patterns for subject headers that should be excluded from paragraphs
+SUBJECT_HEADER_PATTERNS = [
+    r'^\s*(?:DAYANAK|dayanak)\s*(?:/|\|)?\s*(?:AMAÇ|amaç)\s*(?:/|\|)?\s*(?:KAPSAM|kapsam)?\s*$',
+    r'^\s*(?:TANIM|tanım|TANIMLAR|tanımlar|TARİF|tarif|TARİFLER|tarifler)\s*$',
+    r'^\s*(?:DANIŞMAN|danışman)\s*$',
+    r'^\s*(?:DANIŞMANLIK|danışmanlık)\s+(?:KRİTERLERİ|kriterleri)\s*$',
+    r'^\s*(?:DANIŞMANIN|danışmanın)\s+(?:GÖREVLERİ|görevleri)\s*$',
+    r'^\s*(?:DANIŞMAN|danışman)\s+(?:GÖREVLENDİRİLMESİ|görevlendirilmesi)\s*$',
+    r'^\s*(?:DANIŞMAN|danışman)\s+(?:TERCİHİ|tercihi)\s+(?:VE|ve)\s+(?:ATANMASI|atanması)\s*$',
+    r'^\s*(?:DANIŞMAN|danışman)\s+(?:DEĞİŞİKLİĞİ|değişikliği)\s*$',
+    r'^\s*(?:ZORUNLU|zorunlu)\s+(?:HALLERDE|hallerde)\s+(?:DANIŞMAN|danışman)\s+(?:DEĞİŞİKLİĞİ|değişikliği)\s*$',
+    r'^\s*(?:İKİNCİ|ikinci)\s+(?:TEZ|tez)\s+(?:DANIŞMANI|danışmanı)\s+(?:ATAMA|atama)\s*(?:\(.*\))?\s*$',
+    r'^\s*(?:YÜRÜRLÜK|yürürlük)\s*$',
+    r'^\s*(?:AMAÇ|amaç)\s*$',
+    r'^\s*(?:KAPSAM|kapsam)\s*$',
+    r'^\s*(?:DAYANAK|dayanak)\s*$',
+    r'^\s*(?:BAŞVURU|başvuru)\s*(?:ŞARTLARI|şartları)?\s*$',
+    r'^\s*(?:UYGULAMA|uygulama)\s*(?:ESASLARI|esasları)?\s*$',
+    r'^\s*(?:DEĞERLENDIRME|değerlendirme)\s*(?:KRİTERLERİ|kriterleri)?\s*$',
+    r'^\s*(?:İLGİLİ|ilgili)\s+(?:MEVZUAT|mevzuat)\s*$',
+    r'^\s*(?:GENEL|genel)\s+(?:HÜKÜMLER|hükümler)\s*$',
+    r'^\s*(?:ÖZEL|özel)\s+(?:HÜKÜMLER|hükümler)\s*$',
+    r'^\s*(?:SON|son)\s+(?:HÜKÜMLER|hükümler)\s*$'
+]
+
+# Common section headers that end the title search
+SECTION_HEADER_PATTERNS = [
+    r'^\s*(?:amaç|kapsam|dayanak)\s*(?:,|\s|ve\s)*(?:amaç|kapsam|dayanak)*\s*$',
+    r'^\s*(?:genel|özel|son)\s+(?:hükümler|esaslar)\s*$',
+    r'^\s*(?:tanım|tanımlar)\s*$'
+]
+
+SUBJECT_KEYWORDS = (
+    'dayanak', 'amaç', 'kapsam', 'tanım', 'danışman', 'yürürlük',
+    'başvuru', 'uygulama', 'değerlendirme', 'genel', 'özel', 'son'
+)
+
+INSTITUTION_KEYWORDS = (
+    'üniversite', 'university', 'fakülte', 'enstitü', 'yönetim', 'senato',
+    'program', 'esaslar', 'yönetmelik', 'tüzük', 'yönerge'
+)
+
+
+def options_version(pdf_engine: str = 'layout', docx_numbering: bool = False, structured: bool = False) -> str:
+    """PARSER_VERSION tagged with the non-default options results were parsed with.
+
+    Stored results (cache entries, bulk ingest lines) are only reused when this
+    matches, e.g. "1.2.0+chars+structured".
+    """
+    version = PARSER_VERSION
+    if pdf_engine != 'layout':
+        version += f"+{pdf_engine}"
+    if docx_numbering:
+        version += "+docx-numbering"
+    if structured:
+        version += "+structured"
+    return version
+
+
+def _any_of(patterns: List[str]) -> str:
+    """Merge a list of patterns into a single alternation."""
+    return '|'.join(f'(?:{pattern})' for pattern in patterns)
+
+
+# Compiled once at import time and shared by every DocumentParser instance,
+# so the per-line checks below never go through the re module cache.
+ARTICLE_HEADER_RE = re.compile(_any_of(ARTICLE_PATTERNS), re.IGNORECASE | re.MULTILINE)
+# Segmentation scans with each pattern separately: an alternation would let one
+# pattern's match swallow the newline another pattern's match starts at
+ARTICLE_RES = tuple(re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in ARTICLE_PATTERNS)
+# Upper bound on the length of an article header match in cleaned text, where
+# whitespace runs are collapsed: a chunk can only complete a header that
+# starts this close to the end of the text scanned before it
+HEADER_LOOKBACK = 64
+MAIN_PARAGRAPH_RE = re.compile(_any_of(MAIN_PARAGRAPH_PATTERNS))
+SUB_ITEM_RE = re.compile(_any_of(SUB_ITEM_PATTERNS))
+SUBJECT_HEADER_RE = re.compile(_any_of(SUBJECT_HEADER_PATTERNS), re.IGNORECASE)
+SECTION_HEADER_RE = re.compile(_any_of(SECTION_HEADER_PATTERNS), re.IGNORECASE)
+
+_DIGIT_RE = re.compile(r'\d')
+_DATE_RE = re.compile(r'\d{1,2}[./]\d{1,2}[./]\d{4}')
+_DECISION_RE = re.compile(r'sayılı.*?karar', re.IGNORECASE)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+_INLINE_SPACE_RE = re.compile(r'[ \t]+')
+_HEADER_DASH_RE = re.compile(r'(?i)(madde)\s+(\d+|[ivxlcdm]+)\s*[–\-:]\s*')
+_HEADER_DOT_RE = re.compile(r'(?i)(madde)\s+(\d+|[ivxlcdm]+)\s*\.?\s*')
+_HEADER_NUMBER_FIRST_RE = re.compile(r'(?i)^(\d+)\s*\.\s*(madde)')
+
+# Running headers, footers and page numbers are looked for in this many
+# non-empty lines at the top and at the bottom of every PDF page
+PAGE_EDGE_LINES = 3
+# A line is page furniture when the same text (digits ignored) sits at the same
+# edge of at least this share of the pages, and of at least FURNITURE_MIN_PAGES
+FURNITURE_MIN_SHARE = 0.4
+FURNITURE_MIN_PAGES = 3
+
+# Word paragraphs are handed to the segmenter in chunks of about this many characters
+WORD_CHUNK_CHARS = 64 * 1024
+
+# Alt bent markers: "1)" (or "aa)") under a bent
+_ALT_ITEM_RE = re.compile(r'^\s*(\d+|([a-zçğıöşü])\2)\)\s*')
+
+_DIGITS_RE = re.compile(r'\d+')
+_PAGE_NUMBER_RE = re.compile(r'^(?:sayfa|page)?\W*#(?:\W+#)?\W*$')
+
+
+def _extract_pdf_page_range(filepath: str, first_page: int, last_page: int,
+                            engine: str = 'layout') -> List[str]:
+    """Extract the text of pages [first_page, last_page) of a PDF; runs inside a worker process."""
+    if engine == 'chars':
+        return list(pdf_text.iter_page_texts(filepath, first_page, last_page))
+    
+    page_texts = []
+    
+    with pdfplumber.open(filepath, pages=range(first_page + 1, last_page + 1)) as pdf:
+        for page in pdf.pages:
+            page_texts.append(page.extract_text() or '')
+            page.close()
+    
+    return page_texts
+
 
 class DocumentParser:
-    """Parser for Turkish legal documents in Word and PDF formats."""
+    """Parser for Turkish legal documents in Word and PDF formats.
     
-    def __init__(self):
+    An instance only holds its configuration, which is fixed at construction;
+    everything a parse needs lives in locals of the call. Build one per app (or
+    per set of options) and share it across requests and threads.
+    """
+    
+    __slots__ = ('logger', '_extraction_workers', '_parallel_min_pages', '_pdf_engine', '_docx_numbering',
+                 '_metrics')
+    
+    article_patterns = ARTICLE_PATTERNS
+    main_paragraph_patterns = MAIN_PARAGRAPH_PATTERNS
+    sub_item_patterns = SUB_ITEM_PATTERNS
+    subject_header_patterns = SUBJECT_HEADER_PATTERNS
+    
+    def __init__(self, extraction_workers: int = 0, parallel_min_pages: int = 50,
+                 pdf_engine: str = 'layout', docx_numbering: bool = False,
+                 metrics: Optional[Metrics] = None):
         self.logger = logging.getLogger(__name__)
         
-        # Regex patterns for Turkish legal documents
-        self.article_patterns = [
-            r'(?:^|\n)\s*(?:MADDE|Madde)\s+(\d+|[IVXLCDM]+)\s*[–\-:]\s*',
-            r'(?:^|\n)\s*(?:MADDE|Madde)\s+(\d+|[IVXLCDM]+)\s*\.?\s*',
-            r'(?:^|\n)\s*(\d+)\s*\.\s*(?:MADDE|Madde)\s*[–\-:]?\s*'
-        ]
-        
-        # Pattern for numbered paragraph markers (main paragraphs) - handles both (1) and 1) formats
-        self.main_paragraph_patterns = [
-            r'^\s*\((\d+)\)\s*',  # Format: (1), (2), (3)
-            r'^\s*(\d+)\)\s*'     # Format: 1), 2), 3)
-        ]
-        
-        # Pattern for lettered sub-items - handles both (a) and a) formats
-        self.sub_item_patterns = [
-            r'^\s*\(([a-z])\)\s*',  # Format: (a), (b), (c)
-            r'^\s*([a-z])\)\s*'     # Format: a), b), c)
-        ]
-        
-        # Patterns for subject headers that should be excluded from paragraphs
-        self.subject_header_patterns = [
-            r'^\s*(?:DAYANAK|dayanak)\s*(?:/|\|)?\s*(?:AMAÇ|amaç)\s*(?:/|\|)?\s*(?:KAPSAM|kapsam)?\s*$',
-            r'^\s*(?:TANIM|tanım|TANIMLAR|tanımlar|TARİF|tarif|TARİFLER|tarifler)\s*$',
-            r'^\s*(?:DANIŞMAN|danışman)\s*$',
-            r'^\s*(?:DANIŞMANLIK|danışmanlık)\s+(?:KRİTERLERİ|kriterleri)\s*$',
-            r'^\s*(?:DANIŞMANIN|danışmanın)\s+(?:GÖREVLERİ|görevleri)\s*$',
-            r'^\s*(?:DANIŞMAN|danışman)\s+(?:GÖREVLENDİRİLMESİ|görevlendirilmesi)\s*$',
-            r'^\s*(?:DANIŞMAN|danışman)\s+(?:TERCİHİ|tercihi)\s+(?:VE|ve)\s+(?:ATANMASI|atanması)\s*$',
-            r'^\s*(?:DANIŞMAN|danışman)\s+(?:DEĞİŞİKLİĞİ|değişikliği)\s*$',
-            r'^\s*(?:ZORUNLU|zorunlu)\s+(?:HALLERDE|hallerde)\s+(?:DANIŞMAN|danışman)\s+(?:DEĞİŞİKLİĞİ|değişikliği)\s*$',
-            r'^\s*(?:İKİNCİ|ikinci)\s+(?:TEZ|tez)\s+(?:DANIŞMANI|danışmanı)\s+(?:ATAMA|atama)\s*(?:\(.*\))?\s*$',
-            r'^\s*(?:YÜRÜRLÜK|yürürlük)\s*$',
-            r'^\s*(?:AMAÇ|amaç)\s*$',
-            r'^\s*(?:KAPSAM|kapsam)\s*$',
-            r'^\s*(?:DAYANAK|dayanak)\s*$',
-            r'^\s*(?:BAŞVURU|başvuru)\s*(?:ŞARTLARI|şartları)?\s*$',
-            r'^\s*(?:UYGULAMA|uygulama)\s*(?:ESASLARI|esasları)?\s*$',
-            r'^\s*(?:DEĞERLENDIRME|değerlendirme)\s*(?:KRİTERLERİ|kriterleri)?\s*$',
-            r'^\s*(?:İLGİLİ|ilgili)\s+(?:MEVZUAT|mevzuat)\s*$',
-            r'^\s*(?:GENEL|genel)\s+(?:HÜKÜMLER|hükümler)\s*$',
-            r'^\s*(?:ÖZEL|özel)\s+(?:HÜKÜMLER|hükümler)\s*$',
-            r'^\s*(?:SON|son)\s+(?:HÜKÜMLER|hükümler)\s*$'
-        ]
+        # PDF pages are extracted in a process pool when more than one worker
+        # is configured and the document has at least parallel_min_pages pages
+        self._extraction_workers = extraction_workers
+        self._parallel_min_pages = parallel_min_pages
+        
+        # Default PDF engine; parse_document() can override it per call
+        self._pdf_engine = self._check_engine(pdf_engine)
+        
+        # Prefix Word paragraphs with the list markers (e.g. "(1)", "a)") Word
+        # renders from automatic numbering, which are not part of their text
+        self._docx_numbering = docx_numbering
+        
+        # Per-stage timings and document counters are only collected with an enabled Metrics
+        self._metrics = metrics if metrics is not None and metrics.enabled else None
+    
+    @property
+    def extraction_workers(self) -> int:
+        return self._extraction_workers
+    
+    @property
+    def parallel_min_pages(self) -> int:
+        return self._parallel_min_pages
+    
+    @property
+    def pdf_engine(self) -> str:
+        return self._pdf_engine
+    
+    @property
+    def docx_numbering(self) -> bool:
+        return self._docx_numbering
+    
+    @staticmethod
+    def _check_engine(engine: str) -> str:
+        if engine not in PDF_ENGINES:
+            raise ValueError(f"Unknown PDF engine: {engine!r} (expected one of {', '.join(PDF_ENGINES)})")
+        return engine
         
     def _is_subject_header(self, line: str) -> bool:
         """Check if a line is a subject header that should be excluded from paragraphs."""
@@ -63,104 +231,315 @@ class DocumentParser:
             return False
             
         # Check against subject header patterns
-        for pattern in self.subject_header_patterns:
-            if re.match(pattern, line, re.IGNORECASE):
-                return True
+        if SUBJECT_HEADER_RE.match(line):
+            return True
         
         # Additional heuristics for subject headers
         # Check if line is short (less than 50 chars), mostly uppercase, and doesn't end with punctuation
         if (len(line) < 50 and 
             line.isupper() and 
             not line.endswith(('.', ':', ';', '!', '?')) and
-            not re.search(r'\d', line)):  # No numbers
+            not _DIGIT_RE.search(line)):  # No numbers
             return True
             
         # Check if line contains common subject header words and is relatively short
-        subject_keywords = [
-            'dayanak', 'amaç', 'kapsam', 'tanım', 'danışman', 'yürürlük', 
-            'başvuru', 'uygulama', 'değerlendirme', 'genel', 'özel', 'son'
-        ]
-        
         if (len(line) < 80 and 
-            any(keyword in line.lower() for keyword in subject_keywords) and
+            any(keyword in line.lower() for keyword in SUBJECT_KEYWORDS) and
             len(line.split()) <= 5):  # Maximum 5 words
             return True
             
         return False
         
-    def parse_document(self, filepath: str) -> Optional[Dict]:
-        """Parse a document and extract legal content."""
+    def parse_document(self, filepath: str, pdf_engine: Optional[str] = None,
+                       structured: bool = False) -> Optional[Dict]:
+        """Parse a document and extract legal content.
+        
+        pdf_engine selects the PDF text extraction engine for this call
+        (see PDF_ENGINES); the parser's default is used when it is None.
+        With structured=True every article also carries its fıkra → bent →
+        alt bent tree with offsets into the cleaned text, which is returned
+        as kaynak_metin (see _extract_paragraphs).
+        """
+        return self._parse(filepath, pdf_engine, structured, DictBuilder)
+    
+    def parse_document_model(self, filepath: str, pdf_engine: Optional[str] = None,
+                             structured: bool = False) -> Optional[ParsedDocument]:
+        """Like parse_document, but return the compact ParsedDocument.
+        
+        Callers that only serialize or count the result can skip building the
+        nested dict until (or unless) they need it.
+        """
+        return self._parse(filepath, pdf_engine, structured, DocumentBuilder)
+    
+    def _parse(self, filepath: str, pdf_engine: Optional[str], structured: bool, builder_class):
+        engine = self._pdf_engine if pdf_engine is None else self._check_engine(pdf_engine)
+        if self._metrics is None:
+            return self._parse_document(filepath, pdf_engine=engine, structured=structured,
+                                        builder_class=builder_class)
+        return self._parse_document_instrumented(filepath, engine, structured, builder_class)
+    
+    def _parse_document(self, filepath: str, timings: Optional[StageTimings] = None,
+                        pdf_engine: str = 'layout', structured: bool = False,
+                        builder_class=DocumentBuilder):
         try:
             file_extension = filepath.lower().split('.')[-1]
             
             if file_extension in ['doc', 'docx']:
-                text = self._extract_text_from_word(filepath)
+                # Word paragraphs are streamed in chunks, like PDF pages
+                chunks = self._iter_word_chunks(filepath)
+                if timings is not None:
+                    chunks = timings.iterate('extract_text', chunks)
+                first_chunk = next(chunks, None)
+                
+                if first_chunk is None:
+                    self.logger.error("No text extracted from document")
+                    return None
+                
+                return self._parse_legal_stream(chain([first_chunk], chunks), timings, structured, builder_class)
             elif file_extension == 'pdf':
-                text = self._extract_text_from_pdf(filepath)
+                # Pages are extracted one at a time, releasing each page's layout, and
+                # only their texts are kept: header/footer detection needs all of them
+                pages = self._iter_pdf_pages(filepath, pdf_engine)
+                if timings is not None:
+                    pages = timings.iterate('extract_text', pages)
+                
+                if timings is None:
+                    pages = self._strip_page_furniture(list(pages))
+                else:
+                    pages = list(pages)
+                    with timings.stage('strip_furniture'):
+                        pages = self._strip_page_furniture(pages)
+                
+                if not pages:
+                    self.logger.error("No text extracted from document")
+                    return None
+                
+                return self._parse_legal_stream(pages, timings, structured, builder_class)
             else:
                 self.logger.error(f"Unsupported file format: {file_extension}")
                 return None
-                
-            if not text:
-                self.logger.error("No text extracted from document")
-                return None
-                
-            return self._parse_legal_content(text)
             
         except Exception as e:
             self.logger.error(f"Error parsing document: {str(e)}")
             return None
     
+    def _parse_document_instrumented(self, filepath: str, pdf_engine: str,
+                                     structured: bool = False, builder_class=DocumentBuilder):
+        """parse_document with per-stage timings and document counters recorded in self._metrics."""
+        metrics = self._metrics
+        file_type = filepath.lower().split('.')[-1]
+        try:
+            file_size = size_class(os.path.getsize(filepath))
+        except OSError:
+            file_size = 'unknown'
+        
+        timings = StageTimings()
+        started = time.perf_counter()
+        result = self._parse_document(filepath, timings, pdf_engine, structured, builder_class)
+        elapsed = time.perf_counter() - started
+        
+        status = 'ok' if result is not None else 'failed'
+        metrics.inc('parser_documents_total', 'Documents parsed, by outcome.',
+                    file_type=file_type, status=status)
+        metrics.observe('parser_document_seconds', 'End-to-end parse_document latency.',
+                        elapsed, file_type=file_type, size=file_size)
+        
+        for stage, seconds in timings.seconds.items():
+            metrics.observe('parser_stage_seconds', 'Time spent in each parser stage per document.',
+                            seconds, stage=stage, file_type=file_type)
+        
+        if file_type == 'pdf':
+            # Only pages with text are yielded by the extractor
+            metrics.inc('parser_pages_total', 'PDF pages with text extracted.',
+                        timings.items.get('extract_text', 0))
+        if result is not None:
+            if isinstance(result, ParsedDocument):
+                articles, paragraphs = len(result), result.paragraph_count
+            else:
+                articles = len(result['maddeler'])
+                paragraphs = sum(len(article['fikralar']) for article in result['maddeler'])
+            metrics.inc('parser_articles_total', 'Articles (madde) extracted.',
+                        articles, file_type=file_type)
+            metrics.inc('parser_paragraphs_total', 'Paragraphs (fıkra) extracted.',
+                        paragraphs, file_type=file_type)
+        
+        return result
+    
     def _extract_text_from_word(self, filepath: str) -> str:
         """Extract text from Word document."""
         try:
-            doc = Document(filepath)
-            paragraphs = []
-            
-            for paragraph in doc.paragraphs:
-                text = paragraph.text.strip()
-                if text:
-                    paragraphs.append(text)
-            
-            return '\n'.join(paragraphs)
+            return '\n'.join(self._iter_word_paragraphs(filepath))
             
         except Exception as e:
             self.logger.error(f"Error extracting text from Word document: {str(e)}")
             return ""
     
-    def _extract_text_from_pdf(self, filepath: str) -> str:
+    def _iter_word_paragraphs(self, filepath: str) -> Iterator[str]:
+        """Yield the stripped, non-empty paragraphs of a Word document.
+        
+        The format is taken from the file's content rather than its extension:
+        Word 97-2003 binaries are read by doc_text.py, while for .docx packages
+        word/document.xml is streamed straight out of the zip (see
+        docx_text.py) and python-docx is only used when that reader cannot
+        open the file.
+        """
+        if doc_text.is_ole_file(filepath):
+            paragraphs = doc_text.iter_paragraph_texts(filepath)
+        else:
+            try:
+                paragraphs = docx_text.iter_paragraph_texts(filepath, numbering=self._docx_numbering)
+            except Exception as e:
+                self.logger.warning(f"Streaming Word reader failed, falling back to python-docx: {str(e)}")
+                paragraphs = (paragraph.text for paragraph in Document(filepath).paragraphs)
+        
+        for paragraph in paragraphs:
+            text = paragraph.strip()
+            if text:
+                yield text
+    
+    def _iter_word_chunks(self, filepath: str) -> Iterator[str]:
+        """Newline-joined runs of Word paragraphs of about WORD_CHUNK_CHARS characters."""
+        chunk = []
+        size = 0
+        for paragraph in self._iter_word_paragraphs(filepath):
+            chunk.append(paragraph)
+            size += len(paragraph) + 1
+            if size >= WORD_CHUNK_CHARS:
+                yield '\n'.join(chunk)
+                chunk = []
+                size = 0
+        if chunk:
+            yield '\n'.join(chunk)
+    
+    def _extract_text_from_pdf(self, filepath: str, pdf_engine: str = 'layout') -> str:
         """Extract text from PDF document."""
         try:
-            text_content = []
-            
-            with pdfplumber.open(filepath) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append(page_text)
-            
-            return '\n'.join(text_content)
+            return '\n'.join(self._iter_pdf_pages(filepath, pdf_engine))
+        except Exception:
+            return ""
+    
+    def _iter_pdf_pages(self, filepath: str, pdf_engine: str = 'layout') -> Iterator[str]:
+        """Yield the text of each non-empty PDF page, releasing its layout cache once consumed."""
+        try:
+            if pdf_engine == 'chars':
+                page_texts = self._iter_pdf_pages_chars(filepath)
+            else:
+                page_texts = self._iter_pdf_pages_layout(filepath)
             
+            for page_text in page_texts:
+                if page_text:
+                    yield page_text
+                    
         except Exception as e:
             self.logger.error(f"Error extracting text from PDF: {str(e)}")
-            return ""
+            raise
+    
+    def _iter_pdf_pages_layout(self, filepath: str) -> Iterator[str]:
+        """Page texts from pdfplumber's extract_text(), in a process pool for long documents."""
+        with pdfplumber.open(filepath) as pdf:
+            page_count = len(pdf.pages)
+            
+            if self.extraction_workers > 1 and page_count >= self.parallel_min_pages:
+                yield from self._iter_pdf_pages_parallel(filepath, page_count, 'layout')
+            else:
+                yield from self._iter_pdf_pages_sequential(pdf)
     
-    def _parse_legal_content(self, text: str) -> Dict:
+    def _iter_pdf_pages_chars(self, filepath: str) -> Iterator[str]:
+        """Page texts from the character-stream engine, in a process pool for long documents."""
+        if self.extraction_workers > 1:
+            page_count = pdf_text.count_pages(filepath)
+            if page_count >= self.parallel_min_pages:
+                yield from self._iter_pdf_pages_parallel(filepath, page_count, 'chars')
+                return
+        
+        yield from pdf_text.iter_page_texts(filepath)
+    
+    def _iter_pdf_pages_sequential(self, pdf) -> Iterator[str]:
+        """Extract pages one after another in the current process."""
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            page.close()
+            yield page_text
+    
+    def _iter_pdf_pages_parallel(self, filepath: str, page_count: int, engine: str) -> Iterator[str]:
+        """Shard page ranges across a process pool and yield the pages back in order."""
+        # A few ranges per worker keeps the pool busy when some pages are slower than others
+        pages_per_task = max(1, -(-page_count // (self.extraction_workers * 4)))
+        starts = range(0, page_count, pages_per_task)
+        stops = [min(start + pages_per_task, page_count) for start in starts]
+        
+        self.logger.debug(f"Extracting {page_count} pages with {self.extraction_workers} workers")
+        
+        with ProcessPoolExecutor(max_workers=self.extraction_workers) as executor:
+            for page_texts in executor.map(_extract_pdf_page_range, [filepath] * len(starts), starts, stops,
+                                           [engine] * len(starts)):
+                yield from page_texts
+    
+    def _strip_page_furniture(self, pages: List[str]) -> List[str]:
+        """Remove running headers, footers and page numbers from PDF page texts.
+        
+        Looks at the top and bottom PAGE_EDGE_LINES lines of every page at
+        once: a line whose text, with digits masked, recurs at the same edge of
+        enough pages is dropped everywhere. Article and paragraph markers are
+        never dropped. The first page only loses page numbers, since repeated
+        headers there usually carry the title and issuing institution.
+        """
+        if len(pages) < FURNITURE_MIN_PAGES:
+            return pages
+        
+        page_lines = [page.split('\n') for page in pages]
+        
+        # Indices of the edge lines of each page, as (top, bottom) candidates
+        edges = []
+        for lines in page_lines:
+            filled = [i for i, line in enumerate(lines) if line.strip()]
+            edges.append((filled[:PAGE_EDGE_LINES], filled[-PAGE_EDGE_LINES:]))
+        
+        # Count each signature once per page and edge
+        counts = Counter()
+        for lines, (top, bottom) in zip(page_lines, edges):
+            for edge, indices in (('top', top), ('bottom', bottom)):
+                signatures = {self._furniture_signature(lines[i]) for i in indices}
+                signatures.discard(None)
+                counts.update((edge, signature) for signature in signatures)
+        
+        threshold = max(FURNITURE_MIN_PAGES, FURNITURE_MIN_SHARE * len(pages))
+        furniture = {key for key, count in counts.items() if count >= threshold}
+        if not furniture:
+            return pages
+        
+        stripped = []
+        for number, (lines, (top, bottom)) in enumerate(zip(page_lines, edges)):
+            drop = set()
+            for edge, indices in (('top', top), ('bottom', bottom)):
+                for i in indices:
+                    signature = self._furniture_signature(lines[i])
+                    if (edge, signature) in furniture and (number > 0 or _PAGE_NUMBER_RE.match(signature)):
+                        drop.add(i)
+            
+            if drop:
+                text = '\n'.join(line for i, line in enumerate(lines) if i not in drop)
+                if text.strip():
+                    stripped.append(text)
+            else:
+                stripped.append(pages[number])
+        
+        self.logger.debug(f"Stripped {len(furniture)} repeated header/footer lines from {len(pages)} pages")
+        return stripped
+    
+    @staticmethod
+    def _furniture_signature(line: str) -> Optional[str]:
+        """Comparable form of a page edge line, or None when it must be kept."""
+        line = line.strip()
+        if ARTICLE_HEADER_RE.match(line) or MAIN_PARAGRAPH_RE.match(line) or SUB_ITEM_RE.match(line):
+            return None
+        return _DIGITS_RE.sub('#', ' '.join(line.lower().split()))
+    
+    def _parse_legal_content(self, text: str, timings: Optional[StageTimings] = None,
+                             structured: bool = False) -> Dict:
         """Parse the extracted text to identify title, articles, and paragraphs."""
         try:
-            # Clean up the text
-            text = self._clean_text(text)
-            
-            # Extract title
-            title = self._extract_title(text)
-            
-            # Extract articles
-            articles = self._extract_articles(text)
-            
-            return {
-                "mevzuat_basligi": title,
-                "maddeler": articles
-            }
+            return self._parse_legal_stream([text], timings, structured, DictBuilder)
             
         except Exception as e:
             self.logger.error(f"Error parsing legal content: {str(e)}")
@@ -169,12 +548,88 @@ class DocumentParser:
                 "maddeler": []
             }
     
+    def _parse_legal_stream(self, chunks: Iterable[str], timings: Optional[StageTimings] = None,
+                            structured: bool = False, builder_class=DocumentBuilder) -> Union[ParsedDocument, Dict]:
+        """Parse text arriving in chunks (e.g. PDF pages) without holding the whole document.
+        
+        With timings, the time of each stage (extract_text, clean_text,
+        extract_title, extract_articles) is accumulated as the stream is pulled.
+        With structured, the cleaned chunks are also kept and returned as
+        kaynak_metin, the text the articles' offsets point into. The result is
+        a ParsedDocument, or the nested dict with builder_class=DictBuilder.
+        """
+        title = None
+        head = ''
+        source = [] if structured else None
+        
+        def extract_title(text: str) -> str:
+            if timings is None:
+                return self._extract_title(text)
+            with timings.stage('extract_title'):
+                return self._extract_title(text)
+        
+        clean_chunks = self._iter_clean_chunks(chunks)
+        if timings is not None:
+            clean_chunks = timings.iterate('clean_text', clean_chunks)
+        
+        def cleaned_chunks() -> Iterator[str]:
+            nonlocal title, head
+            
+            for chunk in clean_chunks:
+                # The title only depends on the first 10 lines of the document
+                if title is None:
+                    head = (head + chunk).lstrip()
+                    if head.count('\n') >= 10:
+                        title = extract_title(head)
+                        head = ''
+                if source is not None:
+                    source.append(chunk)
+                yield chunk
+        
+        articles = self._iter_articles(cleaned_chunks(), structured)
+        if timings is not None:
+            articles = timings.iterate('extract_articles', articles)
+        
+        # Each article's fıkralar are packed into the document's shared buffer as it arrives
+        builder = builder_class()
+        for article in articles:
+            extra = None
+            if structured:
+                extra = {key: article[key] for key in ("baslangic", "bitis", "yapi")}
+            builder.add_article(article["madde_numarasi"], article["fikralar"], extra)
+        
+        if title is None:
+            title = extract_title(head)
+        
+        return builder.build(title, {"kaynak_metin": ''.join(source)} if source is not None else None)
+    
+    def _iter_clean_chunks(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Join chunks with newlines and clean them incrementally.
+        
+        Whitespace cleanup only ever rewrites runs of whitespace, so text can be
+        cleaned independently on either side of a non-whitespace character.
+        Trailing whitespace of each chunk is carried over to the next one.
+        """
+        pending = None
+        
+        for chunk in chunks:
+            raw = chunk if pending is None else pending + '\n' + chunk
+            cut = len(raw.rstrip())
+            pending = raw[cut:]
+            
+            if cut:
+                yield self._normalize_whitespace(raw[:cut])
+    
+    def _normalize_whitespace(self, text: str) -> str:
+        """Collapse blank lines and runs of spaces."""
+        text = _BLANK_LINES_RE.sub('\n\n', text)
+        text = _INLINE_SPACE_RE.sub(' ', text)
+        return text
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         # Remove excessive whitespace
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        text = re.sub(r'[ \t]+', ' ', text)
-        return text.strip()
+        return self._normalize_whitespace(text).strip()
     
     def _extract_title(self, text: str) -> str:
         """Extract document title using improved heuristics."""
@@ -199,17 +654,11 @@ class DocumentParser:
                 continue
                 
             # Skip lines that look like article headers
-            if any(re.search(pattern, line, re.IGNORECASE) for pattern in self.article_patterns):
+            if ARTICLE_HEADER_RE.search(line):
                 break  # Stop searching when we hit article content
                 
             # Skip common section headers that aren't main titles
-            section_headers = [
-                r'^\s*(?:amaç|kapsam|dayanak)\s*(?:,|\s|ve\s)*(?:amaç|kapsam|dayanak)*\s*$',
-                r'^\s*(?:genel|özel|son)\s+(?:hükümler|esaslar)\s*$',
-                r'^\s*(?:tanım|tanımlar)\s*$'
-            ]
-            
-            if any(re.match(pattern, line, re.IGNORECASE) for pattern in section_headers):
+            if SECTION_HEADER_RE.match(line):
                 break  # Stop searching when we hit section headers
             
             # Check if this line looks like a title
@@ -226,12 +675,7 @@ class DocumentParser:
                 is_title_candidate = True
             
             # Bonus for containing institution names
-            institution_keywords = [
-                'üniversite', 'university', 'fakülte', 'enstitü', 'yönetim', 'senato',
-                'program', 'esaslar', 'yönetmelik', 'tüzük', 'yönerge'
-            ]
-            
-            if any(keyword in line.lower() for keyword in institution_keywords):
+            if any(keyword in line.lower() for keyword in INSTITUTION_KEYWORDS):
                 score += 20
                 is_title_candidate = True
             
@@ -244,10 +688,10 @@ class DocumentParser:
             score += (10 - i) * 2
             
             # Penalty for lines with dates or numbers that look like metadata
-            if re.search(r'\d{1,2}[./]\d{1,2}[./]\d{4}', line):  # Date patterns
+            if _DATE_RE.search(line):  # Date patterns
                 score -= 15
             
-            if re.search(r'sayılı.*?karar', line, re.IGNORECASE):  # Decision references
+            if _DECISION_RE.search(line):  # Decision references
                 score -= 20
             
             if is_title_candidate:
@@ -284,72 +728,159 @@ class DocumentParser:
     
     def _extract_articles(self, text: str) -> List[Dict]:
         """Extract articles and their paragraphs."""
-        articles = []
+        return list(self._iter_articles([text]))
+    
+    def _iter_articles(self, chunks: Iterable[str], structured: bool = False) -> Iterator[Dict]:
+        """Yield articles as soon as they are complete.
         
-        # Find all article positions
-        article_matches = []
-        for pattern in self.article_patterns:
-            matches = list(re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE))
-            for match in matches:
-                article_matches.append((match.start(), match.end(), match.group().strip()))
+        An article is complete once the next article header has been seen, so
+        only the text from the last header onwards is kept between chunks; an
+        article spanning several chunks is stitched back together here. With
+        structured, the position of the buffer in the whole stream is tracked
+        so articles can carry absolute offsets.
         
-        # Sort by position
-        article_matches.sort(key=lambda x: x[0])
+        Each chunk only triggers a scan of the new text plus HEADER_LOOKBACK
+        characters before it, so an article spanning many chunks (or text
+        before the first header) is not searched again for every chunk.
+        """
+        buffer = ''
+        # Offset of buffer[0] in the concatenated chunks; None when offsets are not needed
+        base = 0 if structured else None
+        found_articles = False
+        # buffer[:scanned] holds no header except the one buffer starts with (head)
+        scanned = 0
+        head = None
+        
+        for chunk in chunks:
+            buffer += chunk
+            
+            # Find all article positions; near the start of the buffer a rescan is
+            # cheap and also covers a header that the new chunk might extend
+            resume = scanned - HEADER_LOOKBACK if scanned > 2 * HEADER_LOOKBACK else 0
+            article_matches = self._segment_articles(buffer, resume)
+            if resume and head is not None:
+                article_matches.insert(0, head)
+            scanned = len(buffer)
+            if not article_matches:
+                continue
+            found_articles = True
+            
+            # Every article except the last one is followed by another header
+            for i in range(len(article_matches) - 1):
+                article = self._build_article(buffer, article_matches[i], article_matches[i + 1][0], base)
+                if article:
+                    yield article
+            
+            # Restart from the last header, which may continue in the next chunk
+            start_pos, end_pos, header = article_matches[-1]
+            if base is not None:
+                base += start_pos
+            buffer = buffer[start_pos:]
+            scanned = len(buffer)
+            head = (0, end_pos - start_pos, header)
         
-        if not article_matches:
+        if not found_articles:
             self.logger.warning("No articles found in document")
-            return []
-        
-        # Remove duplicates and overlapping matches
-        filtered_matches = []
-        for start_pos, end_pos, article_header in article_matches:
-            # Check if this match overlaps with any existing match
-            is_duplicate = False
-            for existing_start, existing_end, existing_header in filtered_matches:
-                # If positions are very close (within 10 characters), consider it a duplicate
-                if abs(start_pos - existing_start) <= 10:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                filtered_matches.append((start_pos, end_pos, article_header))
-        
-        # Extract content for each unique article
-        for i, (start_pos, end_pos, article_header) in enumerate(filtered_matches):
-            # Determine the end position of this article's content
-            if i + 1 < len(filtered_matches):
-                content_end = filtered_matches[i + 1][0]
+            return
+        
+        # Flush whatever is left once the input is exhausted
+        article_matches = self._segment_articles(buffer)
+        for i, match in enumerate(article_matches):
+            if i + 1 < len(article_matches):
+                content_end = article_matches[i + 1][0]
             else:
-                content_end = len(text)
-            
-            # Extract article content
-            article_content = text[end_pos:content_end].strip()
+                content_end = len(buffer)
             
-            # Parse paragraphs
+            article = self._build_article(buffer, match, content_end, base)
+            if article:
+                yield article
+    
+    def _build_article(self, text: str, article_match: Tuple[int, int, str], content_end: int,
+                       base: Optional[int] = None) -> Optional[Dict]:
+        """Build a single article from its header match and content end position.
+        
+        base is the offset of text[0] in the whole cleaned text; when given,
+        the article's span and its fıkra/bent tree are added.
+        """
+        start_pos, end_pos, article_header = article_match
+        
+        # Extract article content
+        raw_content = text[end_pos:content_end]
+        article_content = raw_content.strip()
+        
+        # Parse paragraphs
+        structure = None
+        if base is None:
             paragraphs = self._extract_paragraphs(article_content)
+        else:
+            structure = []
+            content_start = base + end_pos + len(raw_content) - len(raw_content.lstrip())
+            paragraphs = self._extract_paragraphs(article_content, content_start, structure)
+        
+        # Clean up article header
+        article_number = self._clean_article_header(article_header)
+        
+        # Only add articles that have content
+        if not paragraphs:
+            return None
+        
+        article = {
+            "madde_numarasi": article_number,
+            "fikralar": paragraphs
+        }
+        if structure is not None:
+            # The header match starts at the newline before "MADDE"; the span starts at the header itself
+            header_start = start_pos + len(text[start_pos:end_pos]) - len(text[start_pos:end_pos].lstrip())
+            article["baslangic"] = base + header_start
+            article["bitis"] = content_start + len(article_content)
+            article["yapi"] = structure
+        return article
+    
+    def _segment_articles(self, text: str, start: int = 0) -> List[Tuple[int, int, str]]:
+        """Find article headers from text[start:], returning (start, end, header) in document order.
+        
+        Every pattern is scanned on its own and the matches are merged by
+        position, earlier patterns first on ties, so the union is the same as
+        sorting all matches of all patterns.
+        """
+        boundaries = []
+        last_start = None
+        
+        scans = [article_re.finditer(text, start) for article_re in ARTICLE_RES]
+        for match in merge(*scans, key=lambda match: match.start()):
+            start_pos = match.start()
+            
+            # Matches are merged in order, so a header only needs to be
+            # compared with the last one kept: if positions are very close
+            # (within 10 characters), consider it a duplicate
+            if last_start is not None and start_pos - last_start <= 10:
+                continue
             
-            # Clean up article header
-            article_number = self._clean_article_header(article_header)
-            
-            # Only add articles that have content
-            if paragraphs:
-                articles.append({
-                    "madde_numarasi": article_number,
-                    "fikralar": paragraphs
-                })
+            boundaries.append((start_pos, match.end(), match.group().strip()))
+            last_start = start_pos
         
-        return articles
+        return boundaries
     
-    def _extract_paragraphs(self, article_content: str) -> List[str]:
-        """Extract paragraphs from article content with proper numbered paragraph and sub-item handling."""
+    def _extract_paragraphs(self, article_content: str, offset: Optional[int] = None,
+                            structure: Optional[List[Dict]] = None) -> List[str]:
+        """Extract paragraphs from article content with proper numbered paragraph and sub-item handling.
+        
+        When structure (a list to fill) and offset (where article_content
+        starts in the cleaned text) are given, the same pass also builds the
+        fıkra → bent → alt bent tree of the article (see _add_structure_line).
+        """
         paragraphs = []
         
         # Process all lines together to maintain order
         lines = article_content.split('\n')
         current_paragraph = []
+        position = offset
         
-        for line in lines:
-            line = line.strip()
+        for raw_line in lines:
+            line = raw_line.strip()
+            line_start = position
+            if position is not None:
+                position += len(raw_line) + 1
             if not line:
                 continue
             
@@ -358,14 +889,12 @@ class DocumentParser:
                 self.logger.debug(f"Skipping subject header: {line}")
                 continue
             
-            # Check if line starts with numbered paragraph marker like "(1)", "1)", etc.
-            main_paragraph_match = None
-            for pattern in self.main_paragraph_patterns:
-                main_paragraph_match = re.match(pattern, line)
-                if main_paragraph_match:
-                    break
+            if structure is not None:
+                start = line_start + len(raw_line) - len(raw_line.lstrip())
+                self._add_structure_line(structure, line, start)
             
-            if main_paragraph_match:
+            # Check if line starts with numbered paragraph marker like "(1)", "1)", etc.
+            if MAIN_PARAGRAPH_RE.match(line):
                 # Save previous paragraph if exists
                 if current_paragraph:
                     paragraph_text = ' '.join(current_paragraph).strip()
@@ -377,13 +906,7 @@ class DocumentParser:
                 
             else:
                 # Check if line starts with lettered sub-item like "(a)", "a)", etc.
-                sub_item_match = None
-                for pattern in self.sub_item_patterns:
-                    sub_item_match = re.match(pattern, line)
-                    if sub_item_match:
-                        break
-                
-                if sub_item_match:
+                if SUB_ITEM_RE.match(line):
                     # This is a sub-item, add it to current paragraph
                     if current_paragraph:
                         current_paragraph.append(line)
@@ -406,14 +929,73 @@ class DocumentParser:
         
         return paragraphs
     
+    def _add_structure_line(self, nodes: List[Dict], line: str, start: int) -> None:
+        """Add one stripped line of an article to its fıkra → bent → alt bent tree.
+        
+        Every node has its marker (isaret; None for an unnumbered fıkra), its
+        own text without marker or children (metin) and the offsets of the
+        node including its children in the cleaned text (baslangic, bitis).
+        The open node is always the last one at each level, so the tree itself
+        is the parsing state. A "1)"-style line, which starts a fıkra in the
+        flat output, is an alt bent when it continues the alt bents of the
+        current bent, or starts them under a bent ending with ':'.
+        """
+        end = start + len(line)
+        fikra = nodes[-1] if nodes else None
+        bent = fikra['bentler'][-1] if fikra and fikra['bentler'] else None
+        
+        def node(match, children: Optional[str]) -> Dict:
+            new = {
+                "isaret": line[:match.end()].strip() if match else None,
+                "metin": line[match.end():] if match else line,
+                "baslangic": start,
+                "bitis": end,
+            }
+            if children:
+                new[children] = []
+            return new
+        
+        sub_item = SUB_ITEM_RE.match(line)
+        alt_item = _ALT_ITEM_RE.match(line)
+        if bent is not None and alt_item and not sub_item:
+            number = alt_item.group(1)
+            alt_bents = bent['alt_bentler']
+            if not number.isdigit() or (int(number) == len(alt_bents) + 1 and (
+                    alt_bents or bent['metin'].rstrip().endswith(':'))):
+                alt_bents.append(node(alt_item, None))
+                bent['bitis'] = fikra['bitis'] = end
+                return
+        
+        main = MAIN_PARAGRAPH_RE.match(line)
+        if main:
+            nodes.append(node(main, 'bentler'))
+        elif sub_item:
+            if fikra is None:
+                fikra = node(None, 'bentler')
+                fikra['metin'] = ''
+                nodes.append(fikra)
+            fikra['bentler'].append(node(sub_item, 'alt_bentler'))
+            fikra['bitis'] = end
+        elif fikra is None:
+            nodes.append(node(None, 'bentler'))
+        else:
+            # Continuation text belongs to the innermost open node
+            innermost = fikra
+            if bent is not None:
+                innermost = bent['alt_bentler'][-1] if bent['alt_bentler'] else bent
+            innermost['metin'] = f"{innermost['metin']} {line}" if innermost['metin'] else line
+            for open_node in (fikra, bent, innermost):
+                if open_node is not None:
+                    open_node['bitis'] = end
+    
     def _clean_article_header(self, header: str) -> str:
         """Clean and standardize article header."""
         # Remove extra whitespace and normalize
         header = ' '.join(header.split())
         
         # Standardize format
-        header = re.sub(r'(?i)(madde)\s+(\d+|[ivxlcdm]+)\s*[–\-:]\s*', r'Madde \2', header)
-        header = re.sub(r'(?i)(madde)\s+(\d+|[ivxlcdm]+)\s*\.?\s*', r'Madde \2', header)
-        header = re.sub(r'(?i)^(\d+)\s*\.\s*(madde)', r'Madde \1', header)
+        header = _HEADER_DASH_RE.sub(r'Madde \2', header)
+        header = _HEADER_DOT_RE.sub(r'Madde \2', header)
+        header = _HEADER_NUMBER_FIRST_RE.sub(r'Madde \1', header)
         
         return header.strip()
@@ -0,0 +1,606 @@
+import glob
+import os
+import queue
+import re
+import sqlite3
+import tempfile
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import json_codec
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_DIRNAME = '.locks'
+# Documents share a fixed set of lock files, so the lock folder does not grow with the archive
+LOCK_STRIPES = 64
+
+# Top-level and per-article keys that get their own columns; anything else is kept as JSON
+_DOCUMENT_KEYS = ('mevzuat_basligi', 'maddeler', '_metadata')
+_ARTICLE_KEYS = ('madde_numarasi', 'fikralar')
+
+_ARTICLE_PREFIX_RE = re.compile(r'^\s*madde\s+', re.IGNORECASE)
+
+
+class VersionConflictError(Exception):
+    """Raised when a document changed since the version the caller based its edit on."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Document is at version {current_version}")
+        self.current_version = current_version
+
+
+def document_version(data: Dict) -> int:
+    """Edit version stored in a record's metadata; records from before versioning are 0."""
+    return (data.get('_metadata') or {}).get('version', 0)
+
+
+def article_key(number: str) -> str:
+    """Normalize an article number for lookups: 'Madde 12', 'MADDE 12' and '12' all match."""
+    return _ARTICLE_PREFIX_RE.sub('', ' '.join(str(number).split())).upper()
+
+
+def document_summary(document: Dict) -> Dict:
+    """Title, article count and metadata of a document, without its articles."""
+    return {
+        'mevzuat_basligi': document.get('mevzuat_basligi'),
+        'madde_sayisi': len(document.get('maddeler') or []),
+        '_metadata': document.get('_metadata') or {}
+    }
+
+
+def keeping_metadata(data: Dict) -> Callable[[Dict], Dict]:
+    """An update() change that replaces a document's content with data but keeps its stored _metadata.
+
+    _metadata (file paths, version) is managed by the server, so whatever a
+    client sends in its place is dropped.
+    """
+    def change(document: Dict) -> Dict:
+        content = {key: value for key, value in data.items() if key != '_metadata'}
+        content['_metadata'] = document.get('_metadata') or {}
+        return content
+    return change
+
+
+def download_payload(repository: 'DocumentRepository', name: str,
+                     accepts: Callable[[str], bool]) -> Tuple[bytes, Optional[str], bool]:
+    """Body of a document download: (bytes, Content-Encoding or None, whether it varies by Accept-Encoding).
+
+    A compressed record is passed through as stored when accepts(encoding)
+    says the client takes that encoding. Anything else, including plain
+    records (which are stored compact), is decoded and pretty-printed.
+    Raises KeyError if the document does not exist.
+    """
+    stored = repository.load_stored(name)
+    if stored is None:
+        return json_codec.dumps_bytes(repository.load(name), pretty=True), None, False
+
+    raw, encoding = stored
+    if encoding and accepts(encoding):
+        return raw, encoding, True
+    return json_codec.dumps_bytes(json_codec.decode_record(raw), pretty=True), None, encoding is not None
+
+
+def atomic_write_json(path: str, data: Dict, compression: Optional[str] = None) -> None:
+    """Write JSON so readers see either the old or the new file, never a partial one.
+
+    The data is written compact (and compressed with gzip or zstd if asked)
+    to a temp file in the same directory, fsynced and then renamed over the
+    target; the directory entry is synced afterwards so the rename itself
+    survives a crash.
+    """
+    directory = os.path.dirname(path) or '.'
+    payload = json_codec.encode_record(data, compression)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private to the owner; records are normally world-readable
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class DocumentRepository:
+    """Interface shared by the document storage backends.
+
+    Documents are parse results ({mevzuat_basligi, maddeler, _metadata, ...})
+    addressed by name. Writes bump _metadata.version; passing expected_version
+    turns a write into a compare-and-set that raises VersionConflictError.
+    """
+
+    def exists(self, name: str) -> bool:
+        raise NotImplementedError
+
+    def load(self, name: str) -> Dict:
+        """Return the whole document; raises KeyError if it does not exist."""
+        raise NotImplementedError
+
+    def load_stored(self, name: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Return (stored bytes, content encoding) when the backend keeps documents as JSON files.
+
+        The encoding is 'gzip' or 'zstd' for compressed records and None for
+        plain JSON; backends without a serialized form return None.
+        """
+        return None
+
+    def load_metadata(self, name: str) -> Dict:
+        """Return only the _metadata block of a document."""
+        return self.load(name).get('_metadata') or {}
+
+    def load_summary(self, name: str) -> Dict:
+        """Return the document without its articles (see document_summary)."""
+        return document_summary(self.load(name))
+
+    def load_articles(self, name: str, offset: int = 0, limit: int = 50) -> Tuple[List[Dict], int]:
+        """Return (articles[offset:offset + limit], total article count)."""
+        articles = self.load(name).get('maddeler') or []
+        return articles[offset:offset + limit], len(articles)
+
+    def load_article(self, name: str, number: str) -> Optional[Dict]:
+        """Return the article whose number matches (see article_key), or None."""
+        key = article_key(number)
+        for article in self.load(name).get('maddeler', []):
+            if article_key(article.get('madde_numarasi', '')) == key:
+                return article
+        return None
+
+    def iter_metadata(self) -> Iterator[Tuple[str, Dict]]:
+        """Yield (name, _metadata) for every stored document."""
+        raise NotImplementedError
+
+    def create(self, data: Dict, name: Optional[str] = None) -> str:
+        """Store a new document and return its name."""
+        raise NotImplementedError
+
+    def update(self, name: str, change: Callable[[Dict], Dict],
+               expected_version: Optional[int] = None) -> int:
+        """Apply change to the stored document atomically and return the new version."""
+        raise NotImplementedError
+
+    def save(self, name: str, data: Dict, expected_version: Optional[int] = None) -> int:
+        """Replace a document's content (creating it if needed) and return the new version."""
+        raise NotImplementedError
+
+
+class DocumentStore(DocumentRepository):
+    """Parse result records (JSON files) with atomic writes and per-document locks.
+
+    Writers take an exclusive lock on the lock file the document's name hashes
+    to (one of LOCK_STRIPES), which coordinates threads and every process
+    (e.g. gunicorn workers) sharing the folder. Readers need no lock because files are only ever replaced by
+    rename. Each write bumps _metadata.version so editors can detect that
+    someone else saved in between. With compression ('gzip' or 'zstd'),
+    records are written compressed; records are read in whichever form
+    they were stored.
+    """
+
+    def __init__(self, folder: str, pattern: str = 'mevzuat_*.json', compression: Optional[str] = None):
+        self.folder = folder
+        self.pattern = pattern
+        self.compression = json_codec.check_compression(compression)
+        self.lock_folder = os.path.join(folder, LOCK_DIRNAME)
+        os.makedirs(self.lock_folder, exist_ok=True)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.folder, name)
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self.path(name))
+
+    def load(self, name: str) -> Dict:
+        try:
+            return json_codec.read_record(self.path(name))
+        except FileNotFoundError:
+            raise KeyError(name)
+
+    def load_stored(self, name: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        try:
+            with open(self.path(name), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise KeyError(name)
+        return data, json_codec.content_encoding(data)
+
+    def iter_metadata(self) -> Iterator[Tuple[str, Dict]]:
+        for path in glob.glob(os.path.join(self.folder, self.pattern)):
+            name = os.path.basename(path)
+            try:
+                yield name, self.load(name).get('_metadata') or {}
+            except (KeyError, ValueError):
+                continue
+
+    @contextmanager
+    def lock(self, name: str):
+        """Hold the cross-process write lock for one document (and the others on its stripe)."""
+        # crc32 rather than hash(): every process must pick the same stripe
+        stripe = zlib.crc32(name.encode('utf-8')) % LOCK_STRIPES
+        with open(os.path.join(self.lock_folder, f"stripe-{stripe:02d}.lock"), 'a+b') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def create(self, data: Dict, name: Optional[str] = None) -> str:
+        """Store a new document and return its name."""
+        name = name or f"mevzuat_{uuid.uuid4().hex}.json"
+        with self.lock(name):
+            atomic_write_json(self.path(name), data, self.compression)
+        return name
+
+    def update(self, name: str, change: Callable[[Dict], Dict],
+               expected_version: Optional[int] = None) -> int:
+        """Apply change to the stored document under its lock and return the new version.
+
+        If expected_version is given and the stored document is at another
+        version, nothing is written and VersionConflictError is raised.
+        """
+        with self.lock(name):
+            return self._update_locked(name, self.load(name), change, expected_version)
+
+    def save(self, name: str, data: Dict, expected_version: Optional[int] = None) -> int:
+        """Replace a document's content, keeping the version sequence going."""
+        with self.lock(name):
+            current = self.load(name) if self.exists(name) else {}
+            return self._update_locked(name, current, lambda _: data, expected_version)
+
+    def _update_locked(self, name: str, document: Dict, change: Callable[[Dict], Dict],
+                       expected_version: Optional[int]) -> int:
+        version = document_version(document)
+        if expected_version is not None and expected_version != version:
+            raise VersionConflictError(version)
+
+        document = change(document)
+        document.setdefault('_metadata', {})
+        document['_metadata']['version'] = version + 1
+        atomic_write_json(self.path(name), document, self.compression)
+        return version + 1
+
+
+class SqliteDocumentStore(DocumentRepository):
+    """Documents, articles and fıkralar in normalized SQLite tables.
+
+    The database runs in WAL mode so readers never block the writer, and
+    connections are pooled per process. Metadata and single articles can be
+    read without loading the rest of the document.
+    """
+
+    def __init__(self, db_path: str, pool_size: int = 8):
+        self.db_path = db_path
+        self._pool_size = pool_size
+        self._pool_pid = os.getpid()
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # The schema connection is closed rather than pooled: stores are often created at
+        # import time, before a pre-forking server starts its workers
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE,
+                    title TEXT,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    metadata TEXT NOT NULL,
+                    extra TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS articles (
+                    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    number TEXT NOT NULL,
+                    number_key TEXT NOT NULL,
+                    extra TEXT,
+                    PRIMARY KEY (document_id, position)
+                );
+                CREATE INDEX IF NOT EXISTS articles_by_number ON articles (document_id, number_key);
+                CREATE TABLE IF NOT EXISTS paragraphs (
+                    document_id INTEGER NOT NULL,
+                    article_position INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (document_id, article_position, position),
+                    FOREIGN KEY (document_id, article_position)
+                        REFERENCES articles (document_id, position) ON DELETE CASCADE
+                );
+            """)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False,
+                               isolation_level=None)
+        conn.execute('PRAGMA foreign_keys=ON')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection (autocommit mode; callers open transactions explicitly)."""
+        if self._pool_pid != os.getpid():
+            # Forked since the pool was filled: SQLite connections must not be used or closed
+            # across a fork, so the inherited ones stay referenced and this process opens its own
+            self._inherited_pool = self._pool
+            self._pool = queue.LifoQueue(maxsize=self._pool_size)
+            self._pool_pid = os.getpid()
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction; BEGIN IMMEDIATE takes the write lock before anything is read."""
+        with self._connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def exists(self, name: str) -> bool:
+        with self._connection() as conn:
+            return conn.execute('SELECT 1 FROM documents WHERE name = ?', (name,)).fetchone() is not None
+
+    def _read(self, conn: sqlite3.Connection, name: str) -> Dict:
+        row = conn.execute('SELECT id, title, metadata, extra FROM documents WHERE name = ?',
+                           (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        document_id, title, metadata, extra = row
+
+        paragraphs = {}
+        for article_position, text in conn.execute(
+                'SELECT article_position, text FROM paragraphs WHERE document_id = ? '
+                'ORDER BY article_position, position', (document_id,)):
+            paragraphs.setdefault(article_position, []).append(text)
+
+        articles = []
+        for position, number, article_extra in conn.execute(
+                'SELECT position, number, extra FROM articles WHERE document_id = ? ORDER BY position',
+                (document_id,)):
+            article = {'madde_numarasi': number, 'fikralar': paragraphs.get(position, [])}
+            if article_extra:
+                article.update(json_codec.loads(article_extra))
+            articles.append(article)
+
+        document = {'mevzuat_basligi': title, 'maddeler': articles}
+        if extra:
+            document.update(json_codec.loads(extra))
+        document['_metadata'] = json_codec.loads(metadata)
+        return document
+
+    def load(self, name: str) -> Dict:
+        with self._connection() as conn:
+            conn.execute('BEGIN')
+            try:
+                return self._read(conn, name)
+            finally:
+                conn.rollback()
+
+    def load_metadata(self, name: str) -> Dict:
+        with self._connection() as conn:
+            row = conn.execute('SELECT metadata FROM documents WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return json_codec.loads(row[0])
+
+    def load_summary(self, name: str) -> Dict:
+        with self._connection() as conn:
+            row = conn.execute(
+                'SELECT title, metadata, (SELECT count(*) FROM articles WHERE document_id = documents.id) '
+                'FROM documents WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return {'mevzuat_basligi': row[0], 'madde_sayisi': row[2], '_metadata': json_codec.loads(row[1])}
+
+    def load_articles(self, name: str, offset: int = 0, limit: int = 50) -> Tuple[List[Dict], int]:
+        with self._connection() as conn:
+            conn.execute('BEGIN')
+            try:
+                row = conn.execute(
+                    'SELECT id, (SELECT count(*) FROM articles WHERE document_id = documents.id) '
+                    'FROM documents WHERE name = ?', (name,)).fetchone()
+                if row is None:
+                    raise KeyError(name)
+                document_id, total = row
+
+                articles = {}
+                for position, number, extra in conn.execute(
+                        'SELECT position, number, extra FROM articles WHERE document_id = ? '
+                        'AND position >= ? AND position < ? ORDER BY position',
+                        (document_id, offset, offset + limit)):
+                    article = {'madde_numarasi': number, 'fikralar': []}
+                    if extra:
+                        article.update(json_codec.loads(extra))
+                    articles[position] = article
+
+                for position, text in conn.execute(
+                        'SELECT article_position, text FROM paragraphs WHERE document_id = ? '
+                        'AND article_position >= ? AND article_position < ? ORDER BY article_position, position',
+                        (document_id, offset, offset + limit)):
+                    articles[position]['fikralar'].append(text)
+            finally:
+                conn.rollback()
+
+        return list(articles.values()), total
+
+    def load_article(self, name: str, number: str) -> Optional[Dict]:
+        with self._connection() as conn:
+            row = conn.execute(
+                'SELECT a.document_id, a.position, a.number, a.extra FROM articles a '
+                'JOIN documents d ON d.id = a.document_id '
+                'WHERE d.name = ? AND a.number_key = ? ORDER BY a.position LIMIT 1',
+                (name, article_key(number))).fetchone()
+            if row is None:
+                if not self.exists(name):
+                    raise KeyError(name)
+                return None
+
+            document_id, position, article_number, extra = row
+            paragraphs = [text for (text,) in conn.execute(
+                'SELECT text FROM paragraphs WHERE document_id = ? AND article_position = ? '
+                'ORDER BY position', (document_id, position))]
+
+        article = {'madde_numarasi': article_number, 'fikralar': paragraphs}
+        if extra:
+            article.update(json_codec.loads(extra))
+        return article
+
+    def iter_metadata(self) -> Iterator[Tuple[str, Dict]]:
+        with self._connection() as conn:
+            rows = conn.execute('SELECT name, metadata FROM documents ORDER BY id').fetchall()
+        for name, metadata in rows:
+            yield name, json_codec.loads(metadata)
+
+    def _write(self, conn: sqlite3.Connection, name: str, data: Dict) -> None:
+        """Replace the stored rows of a document with data (inside a transaction)."""
+        now = time.time()
+        metadata = data.get('_metadata') or {}
+        extra = {key: value for key, value in data.items() if key not in _DOCUMENT_KEYS}
+        values = (data.get('mevzuat_basligi'), document_version(data),
+                  json_codec.dumps(metadata),
+                  json_codec.dumps(extra) if extra else None)
+
+        row = conn.execute('SELECT id FROM documents WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            document_id = conn.execute(
+                'INSERT INTO documents (name, title, version, metadata, extra, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', (name,) + values + (now, now)).lastrowid
+        else:
+            document_id = row[0]
+            conn.execute('UPDATE documents SET title = ?, version = ?, metadata = ?, extra = ?, '
+                         'updated_at = ? WHERE id = ?', values + (now, document_id))
+            conn.execute('DELETE FROM articles WHERE document_id = ?', (document_id,))
+
+        article_rows = []
+        paragraph_rows = []
+        for position, article in enumerate(data.get('maddeler') or []):
+            number = article.get('madde_numarasi', '')
+            article_extra = {key: value for key, value in article.items() if key not in _ARTICLE_KEYS}
+            article_rows.append((document_id, position, number, article_key(number),
+                                 json_codec.dumps(article_extra) if article_extra else None))
+            paragraph_rows.extend((document_id, position, index, text)
+                                  for index, text in enumerate(article.get('fikralar') or []))
+
+        conn.executemany('INSERT INTO articles (document_id, position, number, number_key, extra) '
+                         'VALUES (?, ?, ?, ?, ?)', article_rows)
+        conn.executemany('INSERT INTO paragraphs (document_id, article_position, position, text) '
+                         'VALUES (?, ?, ?, ?)', paragraph_rows)
+
+    def create(self, data: Dict, name: Optional[str] = None) -> str:
+        name = name or f"mevzuat_{uuid.uuid4().hex}.json"
+        with self._transaction() as conn:
+            self._write(conn, name, data)
+        return name
+
+    def update(self, name: str, change: Callable[[Dict], Dict],
+               expected_version: Optional[int] = None) -> int:
+        with self._transaction() as conn:
+            return self._update_locked(conn, name, self._read(conn, name), change, expected_version)
+
+    def save(self, name: str, data: Dict, expected_version: Optional[int] = None) -> int:
+        with self._transaction() as conn:
+            try:
+                current = self._read(conn, name)
+            except KeyError:
+                current = {}
+            return self._update_locked(conn, name, current, lambda _: data, expected_version)
+
+    def _update_locked(self, conn: sqlite3.Connection, name: str, document: Dict,
+                       change: Callable[[Dict], Dict], expected_version: Optional[int]) -> int:
+        version = document_version(document)
+        if expected_version is not None and expected_version != version:
+            raise VersionConflictError(version)
+
+        document = change(document)
+        document.setdefault('_metadata', {})
+        document['_metadata']['version'] = version + 1
+        self._write(conn, name, document)
+        return version + 1
+
+
+def create_document_store(backend: str, folder: str, db_path: Optional[str] = None,
+                          compression: Optional[str] = None) -> DocumentRepository:
+    """Build the document repository from configuration values.
+
+    compression only applies to the JSON file backend.
+    """
+    if backend == 'json':
+        return DocumentStore(folder, compression=compression)
+    if backend == 'sqlite':
+        if not db_path:
+            raise ValueError("SQLite document store requires a database path")
+        return SqliteDocumentStore(db_path)
+    raise ValueError(f"Unknown document store backend: {backend}")
+
+
+def migrate_json_documents(folder: str, repository: DocumentRepository,
+                           pattern: str = 'mevzuat_*.json') -> Dict:
+    """Import JSON records from folder into repository, keeping their names.
+
+    Documents that already exist in the repository are skipped, so the
+    migration can be re-run safely. The JSON files are left in place.
+    """
+    imported = skipped = failed = 0
+
+    for path in sorted(glob.glob(os.path.join(folder, pattern))):
+        name = os.path.basename(path)
+        if repository.exists(name):
+            skipped += 1
+            continue
+
+        try:
+            repository.create(json_codec.read_record(path), name)
+        except (OSError, ValueError):
+            failed += 1
+            continue
+        imported += 1
+
+    return {'imported': imported, 'skipped': skipped, 'failed': failed}
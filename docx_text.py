@@ -0,0 +1,244 @@
+"""Streaming text extraction from .docx files without python-docx.
+
+python-docx parses word/document.xml into a full lxml tree and wraps every
+paragraph and run in Python objects, only for the parser to read
+paragraph.text. This module streams the main document part out of the zip
+with ElementTree's iterparse, yields the text of each body paragraph as soon
+as its closing tag is read and then discards the element, so memory stays
+flat however long the document is.
+
+Paragraph text follows python-docx's rules exactly (only runs directly under
+the paragraph or a hyperlink; w:tab/w:ptab as tabs, w:br/w:cr as newlines,
+w:noBreakHyphen as '-'), so both readers give the same text. With
+numbering=True, list markers Word renders from w:numPr (e.g. "(1)", "a)")
+are prefixed to their paragraphs; these are not part of the text otherwise.
+"""
+import posixpath
+import zipfile
+from typing import Dict, Iterator, Optional, Tuple
+from xml.etree import ElementTree
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_RELS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+_NUMBERING = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering'
+
+_BODY = _W + 'body'
+_P = _W + 'p'
+_R = _W + 'r'
+_HYPERLINK = _W + 'hyperlink'
+_T = _W + 't'
+_VAL = _W + 'val'
+
+# Run children and their text, as in python-docx's CT_R.text
+_RUN_TEXT = {
+    _W + 'tab': '\t',
+    _W + 'ptab': '\t',
+    _W + 'cr': '\n',
+    _W + 'noBreakHyphen': '-',
+}
+
+_ROMAN = (
+    (1000, 'm'), (900, 'cm'), (500, 'd'), (400, 'cd'), (100, 'c'), (90, 'xc'),
+    (50, 'l'), (40, 'xl'), (10, 'x'), (9, 'ix'), (5, 'v'), (4, 'iv'), (1, 'i'),
+)
+
+# numId -> (abstractNumId, {ilvl: startOverride}); abstractNumId -> {ilvl: (numFmt, lvlText, start)}
+Numbering = Tuple[Dict[str, Tuple[str, Dict[int, int]]], Dict[str, Dict[int, Tuple[str, str, int]]]]
+
+
+def _part_relationships(archive: zipfile.ZipFile, part: str) -> Dict[str, str]:
+    """Relationship type -> target part name for a package part ('' for the package itself)."""
+    directory, name = posixpath.split(part)
+    rels_name = posixpath.join(directory, '_rels', f'{name}.rels')
+    try:
+        root = ElementTree.fromstring(archive.read(rels_name))
+    except KeyError:
+        return {}
+
+    targets = {}
+    for relationship in root.iter(_RELS + 'Relationship'):
+        if relationship.get('TargetMode') == 'External':
+            continue
+        target = relationship.get('Target', '')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        targets.setdefault(relationship.get('Type'), target)
+    return targets
+
+
+def _read_numbering(archive: zipfile.ZipFile, part: Optional[str]) -> Numbering:
+    nums, abstracts = {}, {}
+    if part is None:
+        return nums, abstracts
+    try:
+        root = ElementTree.fromstring(archive.read(part))
+    except KeyError:
+        return nums, abstracts
+
+    def val(parent, tag, default=None):
+        element = parent.find(_W + tag)
+        return element.get(_VAL, default) if element is not None else default
+
+    for abstract in root.iter(_W + 'abstractNum'):
+        levels = {}
+        for level in abstract.iter(_W + 'lvl'):
+            levels[int(level.get(_W + 'ilvl', '0'))] = (
+                val(level, 'numFmt', 'decimal'), val(level, 'lvlText', ''), int(val(level, 'start', '1')),
+            )
+        abstracts[abstract.get(_W + 'abstractNumId')] = levels
+
+    for num in root.iter(_W + 'num'):
+        overrides = {}
+        for override in num.iter(_W + 'lvlOverride'):
+            start = val(override, 'startOverride')
+            if start is not None:
+                overrides[int(override.get(_W + 'ilvl', '0'))] = int(start)
+        nums[num.get(_W + 'numId')] = (val(num, 'abstractNumId'), overrides)
+
+    return nums, abstracts
+
+
+def _format_number(value: int, number_format: str) -> Optional[str]:
+    if number_format in ('decimal', 'decimalZero'):
+        return f'{value:02d}' if number_format == 'decimalZero' and value < 10 else str(value)
+    if number_format in ('lowerLetter', 'upperLetter'):
+        letter = chr(ord('a') + (value - 1) % 26) * ((value - 1) // 26 + 1)
+        return letter.upper() if number_format == 'upperLetter' else letter
+    if number_format in ('lowerRoman', 'upperRoman'):
+        roman = ''
+        for amount, digits in _ROMAN:
+            while value >= amount:
+                roman += digits
+                value -= amount
+        return roman.upper() if number_format == 'upperRoman' else roman
+    # Bullets and formats without a plain-text equivalent carry no marker
+    return None
+
+
+class _ListCounters:
+    """Running list numbers, rendered into markers with each level's lvlText."""
+
+    def __init__(self, numbering: Numbering):
+        self.nums, self.abstracts = numbering
+        self.counters: Dict[str, Dict[int, int]] = {}
+        self.started = set()
+
+    def marker(self, num_id: str, ilvl: int) -> Optional[str]:
+        if num_id not in self.nums:
+            return None
+        abstract_id, overrides = self.nums[num_id]
+        levels = self.abstracts.get(abstract_id)
+        if not levels or ilvl not in levels:
+            return None
+
+        # Instances of the same abstract list continue its numbering unless they restart it
+        counters = self.counters.setdefault(abstract_id, {})
+        if num_id not in self.started:
+            self.started.add(num_id)
+            for level, start in overrides.items():
+                counters[level] = start - 1
+
+        counters[ilvl] = counters.get(ilvl, levels[ilvl][2] - 1) + 1
+        for deeper in [level for level in counters if level > ilvl]:
+            del counters[deeper]
+
+        number_format, text, _ = levels[ilvl]
+        if _format_number(counters[ilvl], number_format) is None:
+            return None
+        for level in range(ilvl, -1, -1):
+            if f'%{level + 1}' not in text:
+                continue
+            format_ = levels.get(level, ('decimal', '', 1))[0]
+            value = counters.get(level, levels.get(level, ('', '', 1))[2])
+            text = text.replace(f'%{level + 1}', _format_number(value, format_) or '')
+        return text.strip() or None
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        if child.tag == _T:
+            parts.append(child.text or '')
+        elif child.tag == _W + 'br':
+            # Page and column breaks have no text equivalent
+            if child.get(_W + 'type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        else:
+            parts.append(_RUN_TEXT.get(child.tag, ''))
+    return ''.join(parts)
+
+
+def paragraph_text(paragraph) -> str:
+    """Text of a w:p element, as python-docx's Paragraph.text returns it."""
+    parts = []
+    for child in paragraph:
+        if child.tag == _R:
+            parts.append(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(_run_text(run) for run in child if run.tag == _R)
+    return ''.join(parts)
+
+
+def _numbering_properties(paragraph) -> Optional[Tuple[str, int]]:
+    properties = paragraph.find(_W + 'pPr')
+    num_pr = properties.find(_W + 'numPr') if properties is not None else None
+    if num_pr is None:
+        return None
+    num_id = num_pr.find(_W + 'numId')
+    if num_id is None or num_id.get(_VAL) in (None, '0'):
+        return None
+    ilvl = num_pr.find(_W + 'ilvl')
+    return num_id.get(_VAL), int(ilvl.get(_VAL, '0')) if ilvl is not None else 0
+
+
+def iter_paragraph_texts(filepath: str, numbering: bool = False) -> Iterator[str]:
+    """Yield the text of every body-level paragraph of a .docx file, in order.
+
+    The package is opened and its main document part located before the
+    first paragraph is requested, so an unreadable file (e.g. a legacy .doc)
+    raises from this call rather than midway through the iteration.
+    """
+    archive = zipfile.ZipFile(filepath)
+    try:
+        part = _part_relationships(archive, '').get(_OFFICE_DOCUMENT, 'word/document.xml')
+        stream = archive.open(part)
+        counters = None
+        if numbering:
+            counters = _ListCounters(_read_numbering(archive, _part_relationships(archive, part).get(_NUMBERING)))
+    except Exception:
+        archive.close()
+        raise
+
+    return _iter_body_paragraphs(archive, stream, counters)
+
+
+def _iter_body_paragraphs(archive: zipfile.ZipFile, stream, counters: Optional[_ListCounters]) -> Iterator[str]:
+    with archive, stream:
+        depth = 0
+        body = None
+        for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 2 and element.tag == _BODY:
+                    body = element
+                continue
+
+            depth -= 1
+            # Only direct children of w:body are python-docx's Document.paragraphs
+            if depth != 2 or body is None:
+                continue
+
+            if element.tag == _P:
+                text = paragraph_text(element)
+                if counters is not None:
+                    properties = _numbering_properties(element)
+                    marker = counters.marker(*properties) if properties else None
+                    if marker and text.strip():
+                        text = f'{marker} {text.lstrip()}'
+                yield text
+
+            # Body children are complete once closed; drop them so the tree never grows
+            body.clear()
@@ -0,0 +1,132 @@
+"""JSON encoding for parse records, cache entries and job results.
+
+orjson is used when it is installed and the standard library otherwise;
+both write the same compact UTF-8 JSON with non-ASCII characters as is.
+pretty=True indents by two spaces, like json.dump(..., indent=2), and is
+meant for downloads only: records, cache entries and API payloads are
+written compact.
+
+Records can also be stored compressed (gzip, or zstd when the zstandard
+package is installed). A compressed record keeps its file name and is
+recognized by its magic number when read, so plain and compressed records
+can live side by side and changing the setting needs no migration.
+"""
+import gzip
+import json
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Storage compressions; the names double as HTTP Content-Encoding values
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+# Records are rewritten on every save, so favour speed: gzip level 1 compresses a
+# large record ~5x faster than the default level 6 and still shrinks it 3-4x
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def dumps_bytes(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return dumps(obj, pretty).encode('utf-8')
+
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """Serialize obj to a JSON string."""
+    if orjson is not None:
+        return dumps_bytes(obj, pretty).decode('utf-8')
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def dumps_document(document, extra: Optional[Dict] = None) -> bytes:
+    """Compact JSON of a ParsedDocument's to_dict(), plus extra keys, without building that dict.
+
+    Articles are serialized one at a time from iter_article_dicts(), so at
+    most one article's dict exists at any moment. The bytes are the same as
+    dumps_bytes(dict(document.to_dict(), **extra)).
+    """
+    trailing = dict(document.extra or {})
+    trailing.update(extra or {})
+    parts = [b'{"mevzuat_basligi":', dumps_bytes(document.title), b',"maddeler":[',
+             b','.join(dumps_bytes(article) for article in document.iter_article_dicts()), b']']
+    for key, value in trailing.items():
+        parts += [b',', dumps_bytes(key), b':', dumps_bytes(value)]
+    parts.append(b'}')
+    return b''.join(parts)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from a string or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def check_compression(compression: Optional[str]) -> Optional[str]:
+    """Validate a compression setting; returns None for uncompressed storage."""
+    if compression in (None, '', 'none'):
+        return None
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression} (expected one of {', '.join(COMPRESSIONS)})")
+    if compression == 'zstd' and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+    return compression
+
+
+def compress(data: bytes, compression: Optional[str]) -> bytes:
+    if compression == 'gzip':
+        # mtime=0 keeps the output identical for identical records
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return data
+
+
+def content_encoding(data: bytes) -> Optional[str]:
+    """The compression of stored bytes ('gzip' or 'zstd'), or None for plain JSON."""
+    if data.startswith(_GZIP_MAGIC):
+        return 'gzip'
+    if data.startswith(_ZSTD_MAGIC):
+        return 'zstd'
+    return None
+
+
+def decompress(data: bytes) -> bytes:
+    encoding = content_encoding(data)
+    if encoding == 'gzip':
+        return gzip.decompress(data)
+    if encoding == 'zstd':
+        if zstandard is None:
+            raise ValueError("Record is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def encode_record(obj: Any, compression: Optional[str] = None) -> bytes:
+    """Compact JSON of obj, compressed for storage."""
+    return compress(dumps_bytes(obj), compression)
+
+
+def decode_record(data: bytes) -> Any:
+    """Parse stored record bytes, whether plain or compressed."""
+    return loads(decompress(data))
+
+
+def read_record(path: str) -> Any:
+    with open(path, 'rb') as f:
+        return decode_record(f.read())
@@ -0,0 +1,183 @@
+import copy
+from typing import Any, Dict, List, Optional, Set
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch is malformed or cannot be applied to the document."""
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON pointer into unescaped reference tokens."""
+    if pointer == '':
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith('/'):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _list_index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == '-':
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve_parent(document: Any, tokens: List[str]):
+    """Walk to the container holding the last token of a path."""
+    if not tokens:
+        raise JsonPatchError("Operation on the document root is not supported")
+
+    target = document
+    for token in tokens[:-1]:
+        if isinstance(target, dict):
+            if token not in target:
+                raise JsonPatchError(f"Path not found: {token!r}")
+            target = target[token]
+        elif isinstance(target, list):
+            target = target[_list_index(target, token)]
+        else:
+            raise JsonPatchError(f"Cannot traverse into a scalar at {token!r}")
+    return target, tokens[-1]
+
+
+def _get(document: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        return document
+    parent, token = _resolve_parent(document, tokens)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {token!r}")
+        return parent[token]
+    if isinstance(parent, list):
+        return parent[_list_index(parent, token)]
+    raise JsonPatchError(f"Cannot traverse into a scalar at {token!r}")
+
+
+def _add(document: Any, tokens: List[str], value: Any) -> None:
+    parent, token = _resolve_parent(document, tokens)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_list_index(parent, token, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add into a scalar at {token!r}")
+
+
+def _remove(document: Any, tokens: List[str]) -> Any:
+    parent, token = _resolve_parent(document, tokens)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {token!r}")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_list_index(parent, token))
+    raise JsonPatchError(f"Cannot remove from a scalar at {token!r}")
+
+
+def touches_member(operations: List[Dict], key: str) -> bool:
+    """True if any operation reads or writes the top-level member key or anything under it.
+
+    Both the target path and the source ('from') of move/copy count, since
+    moving a member away changes it as much as writing to it. Malformed
+    operations are left for apply_patch to reject.
+    """
+    for operation in operations:
+        if not isinstance(operation, dict):
+            continue
+        for pointer in (operation.get('path'), operation.get('from')):
+            if pointer is None:
+                continue
+            try:
+                tokens = _parse_pointer(pointer)
+            except JsonPatchError:
+                continue
+            if tokens[:1] == [key]:
+                return True
+    return False
+
+
+def changed_items(operations: List[Dict], key: str) -> Optional[Set[int]]:
+    """Indexes of the items of the top-level array key that operations change.
+
+    None means the items cannot be told apart: the array itself is replaced,
+    or an add, remove, move or copy at the array level shifts the items after
+    it. Edits inside items (e.g. /maddeler/3/fikralar/0) and replacing a
+    whole item keep every other item where it was.
+    """
+    changed = set()
+    for operation in operations:
+        if not isinstance(operation, dict):
+            return None
+        op = operation.get('op')
+        if op == 'test':
+            continue
+        # (pointer, whether writing the whole item there keeps the others in place);
+        # a move changes its source as much as its target, a copy only reads it
+        pointers = [(operation.get('path'), op == 'replace')]
+        if op == 'move':
+            pointers.append((operation.get('from'), False))
+        for pointer, keeps_positions in pointers:
+            try:
+                tokens = _parse_pointer(pointer)
+            except JsonPatchError:
+                return None
+            if tokens[:1] != [key]:
+                continue
+            if len(tokens) == 1 or not tokens[1].isdigit():
+                return None
+            if len(tokens) == 2 and not keeps_positions:
+                return None
+            changed.add(int(tokens[1]))
+    return changed
+
+
+def apply_patch(document: Dict, operations: List[Dict]) -> Dict:
+    """Apply an RFC 6902 JSON Patch and return the patched copy.
+
+    The input document is never modified, so a patch either applies completely
+    or raises JsonPatchError and leaves nothing half-applied.
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("Patch must be a list of operations")
+
+    result = copy.deepcopy(document)
+
+    for operation in operations:
+        if not isinstance(operation, dict) or 'op' not in operation or 'path' not in operation:
+            raise JsonPatchError(f"Invalid operation: {operation!r}")
+
+        op = operation['op']
+        tokens = _parse_pointer(operation['path'])
+
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise JsonPatchError(f"'{op}' operation requires a value")
+        if op in ('move', 'copy') and 'from' not in operation:
+            raise JsonPatchError(f"'{op}' operation requires 'from'")
+
+        if op == 'add':
+            _add(result, tokens, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            _remove(result, tokens)
+        elif op == 'replace':
+            _remove(result, tokens)
+            _add(result, tokens, copy.deepcopy(operation['value']))
+        elif op == 'move':
+            from_tokens = _parse_pointer(operation['from'])
+            if tokens[:len(from_tokens)] == from_tokens and tokens != from_tokens:
+                raise JsonPatchError("Cannot move a value into one of its children")
+            _add(result, tokens, _remove(result, from_tokens))
+        elif op == 'copy':
+            _add(result, tokens, copy.deepcopy(_get(result, _parse_pointer(operation['from']))))
+        elif op == 'test':
+            if _get(result, tokens) != operation['value']:
+                raise JsonPatchError(f"Test failed at {operation['path']}")
+        else:
+            raise JsonPatchError(f"Unknown operation: {op!r}")
+
+    return result
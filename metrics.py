@@ -0,0 +1,194 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Upper bounds in seconds; wide enough for both sub-millisecond stages and minute-long scans
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# File size classes used as a label, so latency can be compared between small and large inputs
+SIZE_CLASSES = ((100 * 1024, 'lt_100kb'), (1024 * 1024, 'lt_1mb'), (10 * 1024 * 1024, 'lt_10mb'))
+
+_NULL_TIMER = nullcontext()
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def size_class(size: int) -> str:
+    """Bucket a file size in bytes into a coarse label value."""
+    for limit, label in SIZE_CLASSES:
+        if size < limit:
+            return label
+    return 'ge_10mb'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """Process-local counters and histograms rendered in the Prometheus text format.
+
+    A disabled instance accepts every call and records nothing; timer() then
+    returns a shared no-op context manager, so instrumented code costs one
+    attribute check per call site.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    def _register(self, name: str, kind: str, help_text: str) -> None:
+        registered = self._help.setdefault(name, (kind, help_text))
+        if registered[0] != kind:
+            raise ValueError(f"Metric {name} is already registered as a {registered[0]}")
+
+    def inc(self, name: str, help_text: str, value: float = 1, **labels) -> None:
+        """Add value to a counter."""
+        if not self.enabled:
+            return
+        key = tuple(sorted((label, str(v)) for label, v in labels.items()))
+        with self._lock:
+            self._register(name, 'counter', help_text)
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, help_text: str, value: float,
+                buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels) -> None:
+        """Record one observation in a histogram."""
+        if not self.enabled:
+            return
+        key = tuple(sorted((label, str(v)) for label, v in labels.items()))
+        with self._lock:
+            self._register(name, 'histogram', help_text)
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def timer(self, name: str, help_text: str, **labels):
+        """Context manager observing the elapsed seconds of its block into a histogram."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timed(name, help_text, labels)
+
+    @contextmanager
+    def _timed(self, name: str, help_text: str, labels: Dict) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, help_text, time.perf_counter() - started, **labels)
+
+    def render(self) -> str:
+        """Serialize every series in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._help):
+                kind, help_text = self._help[name]
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+
+                if kind == 'counter':
+                    for labels, value in sorted(self._counters[name].items()):
+                        lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                    continue
+
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{_format_labels(labels, ("le", repr(bound)))} {cumulative}')
+                    lines.append(f'{name}_bucket{_format_labels(labels, ("le", "+Inf"))} {histogram.count}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+class StageTimings:
+    """Per-call accumulator of the seconds spent in each stage of a pipeline.
+
+    Stages nest: a generator stage pulling from another one, or a block run
+    while a stage is active, pauses the outer stage. Every stage is charged
+    only for its own (exclusive) time, so the stages add up to the total.
+    """
+
+    __slots__ = ('seconds', 'items', '_stack', '_mark')
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.items: Dict[str, int] = {}
+        self._stack = []
+        self._mark = 0.0
+
+    def _switch(self) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            stage = self._stack[-1]
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + now - self._mark
+        self._mark = now
+
+    def _enter(self, stage: str) -> None:
+        self._switch()
+        self._stack.append(stage)
+
+    def _leave(self) -> None:
+        self._switch()
+        self._stack.pop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Charge the time of a block to a stage."""
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._leave()
+
+    def iterate(self, stage: str, iterable: Iterable) -> Iterator:
+        """Yield from iterable, charging the time of every next() call to stage."""
+        iterator = iter(iterable)
+        count = 0
+        while True:
+            self._enter(stage)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                self._leave()
+            count += 1
+            yield item
+        self.items[stage] = self.items.get(stage, 0) + count
@@ -0,0 +1,220 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import json_codec
+
+
+def file_sha256(filepath: str, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 hex digest of a file without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache holding serialized parse results up to max_bytes."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: str, payload: bytes) -> None:
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[1]
+
+        self._entries[key] = (payload, size)
+        self.current_bytes += size
+
+        # Evict least recently used entries until we fit again
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend:
+    """Directory of <key>.json files, evicting the least recently used ones beyond max_bytes.
+
+    The directory is only scanned when this process's running estimate of its
+    size passes max_bytes, or when the last scan is older than rescan_seconds
+    (other workers may be writing to the same directory).
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024, rescan_seconds: float = 60.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rescan_seconds = rescan_seconds
+        self.current_bytes = None
+        self._scanned_at = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return None
+
+        # Touch the entry so eviction sees it as recently used; another
+        # worker may have evicted it since it was read
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return payload
+
+    def set(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+
+        # Write to a temp file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        path = self._path(key)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(temp_path, path)
+
+        if self.current_bytes is not None:
+            self.current_bytes += len(payload) - replaced
+        if (self.current_bytes is None or self.current_bytes > self.max_bytes
+                or time.monotonic() - self._scanned_at >= self.rescan_seconds):
+            self._evict()
+
+    def _evict(self) -> None:
+        """Scan the directory, remove the oldest entries beyond max_bytes and reset the size estimate."""
+        entries = []
+        total_bytes = 0
+
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.json'):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_bytes += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+        self.current_bytes = total_bytes
+        self._scanned_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return sum(1 for name in os.listdir(self.directory) if name.endswith('.json'))
+
+
+class ParseCache:
+    """Content-addressed cache for parse results keyed by file hash and parser version."""
+
+    def __init__(self, backend, parser_version: str):
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend
+        self.parser_version = parser_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, digest: str) -> str:
+        """Combine the file digest with the parser version so rule changes invalidate old entries."""
+        version_digest = hashlib.sha256(self.parser_version.encode('utf-8')).hexdigest()[:16]
+        return f"{digest}-{version_digest}"
+
+    def get(self, digest: str) -> Optional[Dict]:
+        """Return the cached result for a file digest, or None on a miss."""
+        key = self.make_key(digest)
+
+        with self._lock:
+            payload = self.backend.get(key)
+            if payload is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if payload is None:
+            return None
+
+        self.logger.debug(f"Parse cache hit: {key}")
+        return json_codec.loads(payload)
+
+    def put(self, digest: str, result: Optional[Dict]) -> None:
+        """Store a parse result; failed parses are not cached so a fixed parser can retry them."""
+        if result is None:
+            return
+
+        payload = json_codec.dumps_bytes(result)
+        with self._lock:
+            self.backend.set(self.make_key(digest), payload)
+
+    def get_or_parse(self, filepath: str, parse: Callable[[str], Optional[Dict]],
+                     digest: Optional[str] = None) -> Optional[Dict]:
+        """Return the cached result for filepath, or parse it and store the result."""
+        digest = digest or file_sha256(filepath)
+
+        result = self.get(digest)
+        if result is not None:
+            return result
+
+        result = parse(filepath)
+        self.put(digest, result)
+        return result
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            return {
+                'backend': type(self.backend).__name__,
+                'parser_version': self.parser_version,
+                'entries': len(self.backend),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+def create_parse_cache(backend: str, parser_version: str, directory: Optional[str] = None,
+                       max_bytes: int = 64 * 1024 * 1024) -> Optional[ParseCache]:
+    """Build a ParseCache from configuration values; 'none' disables caching."""
+    if backend == 'memory':
+        return ParseCache(MemoryCacheBackend(max_bytes), parser_version)
+    if backend == 'disk':
+        if not directory:
+            raise ValueError("Disk parse cache requires a directory")
+        return ParseCache(DiskCacheBackend(directory, max_bytes), parser_version)
+    if backend == 'none':
+        return None
+    raise ValueError(f"Unknown parse cache backend: {backend}")
@@ -0,0 +1,201 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import json_codec
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+# Error recorded for jobs a crashed or restarted worker left unfinished
+STALE_JOB_ERROR = 'Job was interrupted before it finished'
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its pending limit."""
+
+
+class JobStore:
+    """SQLite-backed job state, shared by every worker process using the same file.
+
+    Jobs still queued or running stale_seconds after they were created or
+    started are taken to be lost with the worker that held them and are
+    marked failed: when the store is opened and whenever such a job is read.
+    """
+
+    def __init__(self, db_path: str, stale_seconds: float = 3600):
+        self.db_path = db_path
+        self.stale_seconds = stale_seconds
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    filename TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT
+                )
+            """)
+
+        self.fail_stale()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, job_id: str, filename: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, status, filename, created_at) VALUES (?, ?, ?, ?)',
+                (job_id, JOB_QUEUED, filename, time.time())
+            )
+
+    def mark_running(self, job_id: str) -> bool:
+        """Start a queued job; False if it is no longer queued (e.g. failed as stale)."""
+        with self._connect() as conn:
+            cursor = conn.execute('UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?',
+                                  (JOB_RUNNING, time.time(), job_id, JOB_QUEUED))
+            return cursor.rowcount == 1
+
+    def mark_done(self, job_id: str, result: Dict) -> None:
+        """Finish a running job; a job already failed as stale stays failed."""
+        with self._connect() as conn:
+            conn.execute('UPDATE jobs SET status = ?, finished_at = ?, result = ? WHERE id = ? AND status = ?',
+                         (JOB_DONE, time.time(), json_codec.dumps(result), job_id, JOB_RUNNING))
+
+    def mark_failed(self, job_id: str, error: str) -> None:
+        with self._connect() as conn:
+            conn.execute('UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ? AND status = ?',
+                         (JOB_FAILED, time.time(), error, job_id, JOB_RUNNING))
+
+    def fail_stale(self, job_id: Optional[str] = None) -> int:
+        """Mark jobs queued or running for longer than stale_seconds as failed.
+
+        Other processes may be running jobs from the same file, so jobs are
+        judged by age, not by which process owns them. Returns the number of
+        jobs failed.
+        """
+        now = time.time()
+        cutoff = now - self.stale_seconds
+        query = ('UPDATE jobs SET status = ?, finished_at = ?, error = ? '
+                 'WHERE ((status = ? AND started_at < ?) OR (status = ? AND created_at < ?))')
+        params = [JOB_FAILED, now, STALE_JOB_ERROR, JOB_RUNNING, cutoff, JOB_QUEUED, cutoff]
+        if job_id is not None:
+            query += ' AND id = ?'
+            params.append(job_id)
+
+        with self._connect() as conn:
+            return conn.execute(query, params).rowcount
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        self.fail_stale(job_id)
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job['result'] = json_codec.loads(job['result']) if job['result'] else None
+        return job
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the given age."""
+        cutoff = time.time() - older_than_seconds
+        with self._connect() as conn:
+            cursor = conn.execute('DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?',
+                                  (JOB_DONE, JOB_FAILED, cutoff))
+            return cursor.rowcount
+
+
+class JobQueue:
+    """Runs parse tasks on a bounded thread pool and records their state in a JobStore.
+
+    At most max_pending jobs (queued or running) are accepted per process;
+    further submissions raise QueueFullError so callers can push back.
+    """
+
+    def __init__(self, store: JobStore, max_workers: int = 2, max_pending: int = 16,
+                 retention_seconds: float = 24 * 3600):
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='parse-job')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, task: Callable[[], Optional[Dict]], filename: str,
+               cleanup: Optional[Callable[[], None]] = None) -> str:
+        """Queue a task and return its job id immediately.
+
+        cleanup (e.g. removing the task's temp upload) runs once the job is
+        over, also when the task itself never runs because the job was
+        failed as stale first.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(f"Parse queue is full ({self.max_pending} pending jobs)")
+
+        try:
+            job_id = uuid.uuid4().hex
+            self.store.create(job_id, filename)
+            self._executor.submit(self._run, job_id, task, cleanup)
+        except Exception:
+            self._slots.release()
+            raise
+
+        return job_id
+
+    def _run(self, job_id: str, task: Callable[[], Optional[Dict]],
+             cleanup: Optional[Callable[[], None]] = None) -> None:
+        try:
+            if not self.store.mark_running(job_id):
+                return
+            result = task()
+
+            if result is None:
+                self.store.mark_failed(job_id, 'Parsing failed')
+            else:
+                self.store.mark_done(job_id, result)
+
+        except Exception as e:
+            self.logger.error(f"Parse job {job_id} failed: {str(e)}")
+            self.store.mark_failed(job_id, str(e))
+
+        finally:
+            if cleanup is not None:
+                try:
+                    cleanup()
+                except Exception as e:
+                    self.logger.warning(f"Cleanup of parse job {job_id} failed: {str(e)}")
+            self._slots.release()
+
+        # Opportunistically drop old finished jobs
+        try:
+            self.store.purge(self.retention_seconds)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not purge old jobs: {str(e)}")
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
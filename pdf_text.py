@@ -0,0 +1,130 @@
+"""Fast PDF text extraction straight from pdfminer's character stream.
+
+pdfplumber's page.extract_text() has pdfminer build a full layout tree
+(LTChar, LTCurve, LTImage objects...), converts every object into a dict and
+then clusters characters into words and lines. For legal text we only need
+the characters in reading order, so this module runs the pdfminer
+interpreter with a device that records a small tuple per character and
+ignores paths, images and annotations altogether. Lines are then formed
+with the same tolerances pdfplumber uses by default, which keeps the output
+close to extract_text() for ordinary single-column documents.
+"""
+from typing import Iterator, List, Optional, Tuple
+
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+
+# Same defaults as pdfplumber's extract_text()
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+# pdfplumber expands these ligatures by default
+LIGATURES = {
+    'ﬀ': 'ff', 'ﬃ': 'ffi', 'ﬄ': 'ffl', 'ﬁ': 'fi', 'ﬂ': 'fl', 'ﬆ': 'st', 'ﬅ': 'st',
+}
+
+# (top, x0, x1, text), with top measured from the top of the page
+Char = Tuple[float, float, float, str]
+
+
+class CharStreamDevice(PDFTextDevice):
+    """pdfminer device keeping only (top, x0, x1, text) for each painted character."""
+
+    def __init__(self, rsrcmgr: PDFResourceManager):
+        super().__init__(rsrcmgr)
+        self.chars: List[Char] = []
+        self.page_top = 0.0
+
+    def begin_page(self, page, ctm) -> None:
+        self.chars = []
+        # Device space has its origin at the bottom left; top is measured from the page's upper edge
+        (_, _, _, y1) = page.mediabox
+        (_, _, _, d, _, f) = ctm
+        self.page_top = d * y1 + f
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate) -> float:
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = f"(cid:{cid})"
+
+        adv = font.char_width(cid) * fontsize * scaling
+        (a, b, c, d, e, f) = matrix
+        # Upper edge of the glyph box, as in pdfminer's LTChar
+        top_y = f + d * (font.get_descent() * fontsize + rise + fontsize)
+        x0 = e
+        x1 = e + a * adv
+        if x1 < x0:
+            x0, x1 = x1, x0
+        self.chars.append((self.page_top - top_y, x0, x1, text))
+        return adv
+
+
+def _cluster_lines(chars: List[Char]) -> List[List[Char]]:
+    """Group characters whose tops lie within Y_TOLERANCE of their neighbours, top to bottom."""
+    if not chars:
+        return []
+    ordered = sorted(chars, key=lambda char: char[0])
+    lines = [[ordered[0]]]
+    last_top = ordered[0][0]
+    for char in ordered[1:]:
+        if char[0] - last_top > Y_TOLERANCE:
+            lines.append([])
+        lines[-1].append(char)
+        last_top = char[0]
+    return lines
+
+
+def chars_to_text(chars: List[Char]) -> str:
+    """Line-ordered text: words split on blanks and on gaps wider than X_TOLERANCE."""
+    lines = []
+    for line in _cluster_lines(chars):
+        line.sort(key=lambda char: char[1])
+        words = []
+        word = []
+        last_x1 = None
+        for _, x0, x1, text in line:
+            if text.isspace():
+                if word:
+                    words.append(''.join(word))
+                    word = []
+                last_x1 = None
+                continue
+            if word and last_x1 is not None and x0 - last_x1 > X_TOLERANCE:
+                words.append(''.join(word))
+                word = []
+            word.append(LIGATURES.get(text, text))
+            last_x1 = x1
+        if word:
+            words.append(''.join(word))
+        if words:
+            lines.append(' '.join(words))
+    return '\n'.join(lines)
+
+
+def count_pages(filepath: str) -> int:
+    with open(filepath, 'rb') as f:
+        document = PDFDocument(PDFParser(f))
+        return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def iter_page_texts(filepath: str, first_page: int = 0, last_page: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of pages [first_page, last_page) of a PDF, in page order."""
+    resources = PDFResourceManager(caching=True)
+    device = CharStreamDevice(resources)
+    interpreter = PDFPageInterpreter(resources, device)
+
+    with open(filepath, 'rb') as f:
+        document = PDFDocument(PDFParser(f))
+        for number, page in enumerate(PDFPage.create_pages(document)):
+            if number < first_page:
+                continue
+            if last_page is not None and number >= last_page:
+                break
+            interpreter.process_page(page)
+            yield chars_to_text(device.chars)
+            device.chars = []
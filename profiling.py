@@ -0,0 +1,197 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from typing import Callable, Dict, List, Optional
+
+_CAPTURE_ID_RE = re.compile(r'^[0-9]{14}-[0-9a-f]{8}$')
+
+
+class ProfileStore:
+    """Directory of parse profiles: <id>.prof (cProfile stats) next to <id>.json (summary).
+
+    The summary holds the input's SHA-256 digest, the trigger, the elapsed time,
+    the top functions by cumulative time and the top allocation sites seen by
+    tracemalloc. Only the newest max_captures profiles are kept.
+    """
+
+    def __init__(self, directory: str, max_captures: int = 100):
+        self.directory = directory
+        self.max_captures = max_captures
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, capture_id: str, extension: str) -> str:
+        if not _CAPTURE_ID_RE.match(capture_id):
+            raise KeyError(capture_id)
+        return os.path.join(self.directory, f"{capture_id}.{extension}")
+
+    def save(self, profile: cProfile.Profile, summary: Dict) -> str:
+        capture_id = f"{time.strftime('%Y%m%d%H%M%S', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+        summary = dict(summary, id=capture_id)
+
+        profile.dump_stats(self._path(capture_id, 'prof'))
+        # The summary is written last; a capture without one is incomplete and not listed
+        temp_path = self._path(capture_id, 'json') + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self._path(capture_id, 'json'))
+
+        self._prune()
+        return capture_id
+
+    def list(self) -> List[Dict]:
+        """Summaries of every stored capture, newest first, without the detailed tables."""
+        captures = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if not name.endswith('.json'):
+                continue
+            try:
+                summary = self.load(name[:-len('.json')])
+            except (KeyError, OSError, ValueError):
+                continue
+            captures.append({key: value for key, value in summary.items()
+                             if key not in ('top_functions', 'top_allocations')})
+        return captures
+
+    def load(self, capture_id: str) -> Dict:
+        try:
+            with open(self._path(capture_id, 'json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(capture_id)
+
+    def stats_path(self, capture_id: str) -> str:
+        """Path of the binary cProfile stats, loadable with pstats or snakeviz."""
+        path = self._path(capture_id, 'prof')
+        if not os.path.exists(path):
+            raise KeyError(capture_id)
+        return path
+
+    def _prune(self) -> None:
+        summaries = sorted(name for name in os.listdir(self.directory) if name.endswith('.json'))
+        for name in summaries[:max(0, len(summaries) - self.max_captures)]:
+            capture_id = name[:-len('.json')]
+            for extension in ('json', 'prof'):
+                try:
+                    os.remove(self._path(capture_id, extension))
+                except (FileNotFoundError, KeyError):
+                    pass
+
+
+class ParseProfiler:
+    """Opt-in cProfile/tracemalloc capture around a parse function.
+
+    A parse is profiled when the caller asks for it (e.g. a request header),
+    with probability sample_rate, or - after the fact - when an unprofiled
+    parse took longer than slow_seconds: the same input is then parsed again
+    under the profiler on a background thread. Profiled parses run one at a
+    time since tracemalloc is process-wide.
+    """
+
+    def __init__(self, store: ProfileStore, sample_rate: float = 0.0, slow_seconds: float = 0.0,
+                 top: int = 30):
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.top = top
+        self._lock = threading.Lock()
+        self._slow_lock = threading.Lock()
+        self._slow_digests = set()
+
+    def parse(self, parse: Callable[[str], Optional[Dict]], filepath: str, digest: str,
+              force: bool = False, **context) -> Optional[Dict]:
+        """Run parse(filepath), profiling it when one of the triggers fires.
+
+        context (e.g. the original filename) is stored with the capture.
+        """
+        if force:
+            return self._profile(parse, filepath, digest, 'request', context)[0]
+        if self.sample_rate and random.random() < self.sample_rate:
+            return self._profile(parse, filepath, digest, 'sample', context)[0]
+
+        started = time.perf_counter()
+        result = parse(filepath)
+        elapsed = time.perf_counter() - started
+
+        if self.slow_seconds and elapsed >= self.slow_seconds:
+            self._profile_later(parse, filepath, digest, dict(context, original_seconds=round(elapsed, 3)))
+        return result
+
+    def _profile_later(self, parse, filepath: str, digest: str, context: Dict) -> None:
+        # Each slow input is captured once per process
+        with self._slow_lock:
+            if digest in self._slow_digests:
+                return
+            self._slow_digests.add(digest)
+
+        def run():
+            try:
+                self._profile(parse, filepath, digest, 'slow', context)
+            except Exception as e:
+                self.logger.warning(f"Slow parse profile failed for {digest}: {str(e)}")
+
+        threading.Thread(target=run, name='parse-profile', daemon=True).start()
+
+    def _profile(self, parse, filepath: str, digest: str, trigger: str, context: Dict):
+        with self._lock:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+
+            profile = cProfile.Profile()
+            started = time.perf_counter()
+            try:
+                result = profile.runcall(parse, filepath)
+            finally:
+                elapsed = time.perf_counter() - started
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                if started_tracing:
+                    tracemalloc.stop()
+
+        summary = dict(
+            context,
+            file_sha256=digest,
+            trigger=trigger,
+            created_at=time.time(),
+            seconds=round(elapsed, 3),
+            succeeded=result is not None,
+            traced_peak_bytes=peak,
+            top_functions=self._top_functions(profile),
+            top_allocations=[
+                {'location': str(stat.traceback[0]), 'size_bytes': stat.size, 'count': stat.count}
+                for stat in snapshot.filter_traces([
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                ]).statistics('lineno')[:self.top]
+            ],
+        )
+
+        try:
+            capture_id = self.store.save(profile, summary)
+            self.logger.info(f"Stored {trigger} parse profile {capture_id} for {digest}")
+        except OSError as e:
+            self.logger.warning(f"Could not store parse profile for {digest}: {str(e)}")
+            capture_id = None
+        return result, capture_id
+
+    def _top_functions(self, profile: cProfile.Profile) -> List[Dict]:
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({
+                'function': f"{os.path.basename(filename)}:{line}({function})",
+                'calls': calls,
+                'own_seconds': round(own, 4),
+                'cumulative_seconds': round(cumulative, 4),
+            })
+        rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+        return rows[:self.top]
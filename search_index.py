@@ -0,0 +1,246 @@
+import html
+import logging
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Turkish letters folded to their ASCII base so 'İŞLEM', 'işlem' and 'islem' match.
+# Every mapping is one character to one character, which keeps offsets in the
+# folded text valid for the original text (see _mark_original).
+_FOLD_TABLE = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i', 'Î': 'i', 'î': 'i',
+    'Ş': 's', 'ş': 's',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ç': 'c', 'ç': 'c',
+    'Ö': 'o', 'ö': 'o',
+    'Ü': 'u', 'ü': 'u', 'Û': 'u', 'û': 'u',
+    'Â': 'a', 'â': 'a',
+})
+
+_WORD_RE = re.compile(r'\w+')
+
+# Match markers used while building snippets; they never occur in parsed text
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+# Every match is ranked by BM25, but only the best RANK_WINDOW of them can be
+# paged through: very broad queries report total capped at the window and
+# truncated set, so every counted hit can be paged to. Narrower queries are exact.
+RANK_WINDOW = 20000
+
+
+def turkish_fold(text: str) -> str:
+    """Case- and diacritic-fold Turkish text without changing its length."""
+    folded = text.translate(_FOLD_TABLE).lower()
+    if len(folded) != len(text):
+        # A few non-Turkish characters lower-case to several code points; keep those as they are
+        folded = ''.join(c.lower() if len(c.lower()) == 1 else c for c in text.translate(_FOLD_TABLE))
+    return folded
+
+
+def query_words(query: str) -> List[str]:
+    return _WORD_RE.findall(turkish_fold(query))
+
+
+def build_match_query(words: List[str]) -> str:
+    """Turn folded query words into an FTS5 query: every word must match as a prefix.
+
+    Prefix matching lets a stem find its suffixed forms ('danışman' finds
+    'danışmanın'), and quoting each word keeps user input from being read as
+    FTS5 syntax.
+    """
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def mark_matches(text: str, words: List[str]) -> str:
+    """Wrap every word of text that starts with one of the query words in match markers.
+
+    Matching runs on the folded text; since folding keeps offsets, the
+    markers land on the same spans of the original text.
+    """
+    pattern = re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(word) for word in words) + r')\w*')
+    marked = []
+    position = 0
+    for match in pattern.finditer(turkish_fold(text)):
+        marked.append(text[position:match.start()])
+        marked.append(_MARK_START + text[match.start():match.end()] + _MARK_END)
+        position = match.end()
+    marked.append(text[position:])
+    return ''.join(marked)
+
+
+def make_snippet(marked: str, width: int = 200) -> str:
+    """Cut a window around the first match and render it as escaped HTML with <mark> tags."""
+    first = marked.find(_MARK_START)
+    start = max(0, first - width // 3)
+    end = min(len(marked), start + width)
+
+    # Move the window edges to word boundaries
+    if start > 0:
+        space = marked.find(' ', start)
+        start = space + 1 if 0 <= space < first else start
+    if end < len(marked):
+        space = marked.rfind(' ', start, end)
+        end = space if space > first else end
+
+    window = marked[start:end]
+    if window.count(_MARK_START) > window.count(_MARK_END):
+        window += _MARK_END
+    if window.count(_MARK_END) > window.count(_MARK_START):
+        window = _MARK_START + window
+
+    snippet = html.escape(window).replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+    return ('…' if start > 0 else '') + snippet + ('…' if end < len(marked) else '')
+
+
+class SearchIndex:
+    """SQLite FTS5 index over parsed documents at fıkra granularity.
+
+    Each fıkra is one row; its Turkish-folded text is indexed while the
+    original text is kept for snippets. Documents are re-indexed as a whole
+    whenever they are parsed or saved; an edit that changed only some articles
+    re-indexes just those (index_articles).
+    """
+
+    def __init__(self, db_path: str):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS fikra_rows (
+                    id INTEGER PRIMARY KEY,
+                    document TEXT NOT NULL,
+                    title TEXT,
+                    article_index INTEGER NOT NULL,
+                    madde_numarasi TEXT,
+                    fikra_index INTEGER NOT NULL,
+                    text TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS fikra_rows_by_document ON fikra_rows (document);
+                CREATE VIRTUAL TABLE IF NOT EXISTS fikra_fts USING fts5(
+                    body, tokenize = 'unicode61 remove_diacritics 2'
+                );
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _delete(self, conn: sqlite3.Connection, name: str) -> None:
+        conn.execute('DELETE FROM fikra_fts WHERE rowid IN (SELECT id FROM fikra_rows WHERE document = ?)',
+                     (name,))
+        conn.execute('DELETE FROM fikra_rows WHERE document = ?', (name,))
+
+    @staticmethod
+    def _rows(name: str, document: Dict, articles: Iterable[Tuple[int, Dict]]) -> List[Tuple]:
+        title = document.get('mevzuat_basligi')
+        return [
+            (name, title, article_index, article.get('madde_numarasi'), fikra_index, text)
+            for article_index, article in articles
+            for fikra_index, text in enumerate(article.get('fikralar') or [])
+            if isinstance(text, str) and text
+        ]
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, rows: List[Tuple]) -> None:
+        for row in rows:
+            cursor = conn.execute(
+                'INSERT INTO fikra_rows (document, title, article_index, madde_numarasi, fikra_index, text) '
+                'VALUES (?, ?, ?, ?, ?, ?)', row)
+            conn.execute('INSERT INTO fikra_fts (rowid, body) VALUES (?, ?)',
+                         (cursor.lastrowid, turkish_fold(row[-1])))
+
+    def index_document(self, name: str, document: Dict) -> int:
+        """(Re)index every fıkra of a document; returns the number of rows indexed."""
+        rows = self._rows(name, document, enumerate(document.get('maddeler') or []))
+
+        with self._connect() as conn:
+            self._delete(conn, name)
+            self._insert(conn, rows)
+
+        return len(rows)
+
+    def index_articles(self, name: str, document: Dict, article_indexes: Iterable[int]) -> int:
+        """Re-index only the given articles of an indexed document; returns the number of rows indexed.
+
+        Only valid when the edit kept every other article at its position and
+        left the title alone (see json_patch.changed_items).
+        """
+        articles = document.get('maddeler') or []
+        article_indexes = sorted(set(article_indexes))
+        rows = self._rows(name, document, ((i, articles[i]) for i in article_indexes if i < len(articles)))
+
+        with self._connect() as conn:
+            for article_index in article_indexes:
+                conn.execute('DELETE FROM fikra_fts WHERE rowid IN '
+                             '(SELECT id FROM fikra_rows WHERE document = ? AND article_index = ?)',
+                             (name, article_index))
+                conn.execute('DELETE FROM fikra_rows WHERE document = ? AND article_index = ?',
+                             (name, article_index))
+            self._insert(conn, rows)
+
+        return len(rows)
+
+    def remove_document(self, name: str) -> None:
+        with self._connect() as conn:
+            self._delete(conn, name)
+
+    def search(self, query: str, page: int = 1, per_page: int = 20,
+               document: Optional[str] = None) -> Dict:
+        """Return a page of fıkra hits ordered by relevance (BM25).
+
+        total counts the hits that can be paged through; truncated is True when
+        the query matched more than RANK_WINDOW fıkralar and only the best-ranked
+        RANK_WINDOW of them can be paged to.
+        """
+        words = query_words(query)
+        if not words:
+            return {'total': 0, 'truncated': False, 'page': page, 'per_page': per_page, 'hits': []}
+        params = [build_match_query(words)]
+
+        if document:
+            matches = ('SELECT fikra_fts.rowid, rank FROM fikra_fts JOIN fikra_rows r ON r.id = fikra_fts.rowid '
+                       'WHERE fikra_fts MATCH ? AND r.document = ?')
+            params.append(document)
+        else:
+            matches = 'SELECT rowid, rank FROM fikra_fts WHERE fikra_fts MATCH ?'
+
+        with self._connect() as conn:
+            # Counting stops one past the window, which is all truncation needs to know
+            total = conn.execute(f'SELECT count(*) FROM (SELECT 1 FROM ({matches}) LIMIT ?)',
+                                 params + [RANK_WINDOW + 1]).fetchone()[0]
+            # The page is cut from the matches in rank order, so the window keeps the
+            # best hits, not the first ones in rowid order
+            offset = (page - 1) * per_page
+            limit = max(0, min(per_page, RANK_WINDOW - offset))
+            rows = conn.execute(
+                f'SELECT r.document, r.title, r.article_index, r.madde_numarasi, r.fikra_index, r.text '
+                f'FROM ({matches} ORDER BY rank LIMIT ? OFFSET ?) m JOIN fikra_rows r ON r.id = m.rowid '
+                f'ORDER BY m.rank',
+                params + [limit, offset]).fetchall()
+
+        hits = []
+        for name, title, article_index, madde_numarasi, fikra_index, text in rows:
+            hits.append({
+                'document': name,
+                'mevzuat_basligi': title,
+                'article_index': article_index,
+                'madde_numarasi': madde_numarasi,
+                'fikra_index': fikra_index,
+                'snippet': make_snippet(mark_matches(text, words))
+            })
+
+        return {'total': min(total, RANK_WINDOW), 'truncated': total > RANK_WINDOW,
+                'page': page, 'per_page': per_page, 'hits': hits}
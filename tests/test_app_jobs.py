@@ -0,0 +1,34 @@
+import glob
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SAMPLE_PDF = sorted(glob.glob(os.path.join(ROOT, 'attached_assets', '*.pdf')))[0]
+
+# The job queue is built at import time from the environment, so the app runs in its own interpreter
+SCRIPT = '''
+import sys, time
+sys.path.insert(0, sys.argv[1])
+import app as app_module
+client = app_module.app.test_client()
+with open(sys.argv[2], 'rb') as f:
+    response = client.post('/upload', data={'file': (f, 'yonerge.pdf')})
+job_id = response.headers['Location'].rsplit('/', 1)[-1]
+for _ in range(100):
+    job = client.get(f'/api/legal-parser/jobs/{job_id}')
+    if job.status_code != 200 or job.get_json()['status'] in ('done', 'failed'):
+        break
+    time.sleep(0.1)
+print(job.status_code, job.get_json()['status'])
+print(client.post('/api/legal-parser/jobs').status_code)
+'''
+
+
+def test_api_job_status_reads_the_jobs_created_by_upload(tmp_path):
+    env = dict(os.environ, ASYNC_PARSE_MIN_BYTES='1', PARSE_JOB_DB=str(tmp_path / 'jobs.sqlite3'),
+               SEARCH_DB=str(tmp_path / 'search.sqlite3'))
+    output = subprocess.run([sys.executable, '-c', SCRIPT, os.path.abspath(ROOT), SAMPLE_PDF], cwd=str(tmp_path),
+                            env=env, capture_output=True, text=True, check=True).stdout
+
+    assert output.split('\n')[-3:] == ['200 done', '404', '']
@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.mark.parametrize('argv, env, expected', [
+    (['/usr/bin/gunicorn', '--bind', '0.0.0.0:5000', 'main:app'], {}, 1),
+    (['/usr/bin/gunicorn', '-w', '4', 'main:app'], {}, 4),
+    (['/usr/bin/gunicorn', '-w4', 'main:app'], {}, 4),
+    (['/usr/bin/gunicorn', '--workers=3', 'main:app'], {}, 3),
+    (['/usr/bin/gunicorn', 'main:app'], {'GUNICORN_CMD_ARGS': '--bind 0.0.0.0 --workers 2'}, 2),
+    (['/usr/bin/gunicorn', 'main:app'], {'WEB_CONCURRENCY': '5'}, 5),
+    # Other programs' flags are not read as Gunicorn's
+    (['flask', 'run', '-w', '4'], {}, 1),
+])
+def test_server_worker_count(app_module, monkeypatch, argv, env, expected):
+    monkeypatch.delenv('GUNICORN_CMD_ARGS', raising=False)
+    monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(app_module.sys, 'argv', argv)
+
+    assert app_module.server_worker_count() == expected
+
+
+def test_metrics_refuse_to_serve_one_of_several_workers(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.metrics, 'enabled', True)
+    client = app_module.app.test_client()
+
+    monkeypatch.setattr(app_module, 'SERVER_WORKERS', 1)
+    assert client.get('/metrics').status_code == 200
+
+    monkeypatch.setattr(app_module, 'SERVER_WORKERS', 4)
+    response = client.get('/metrics')
+    assert response.status_code == 503
+    assert b'4 workers' in response.data
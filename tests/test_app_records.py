@@ -0,0 +1,75 @@
+import io
+import os
+
+
+def pdf_record(app_module, data=b'%PDF-1.4 test'):
+    _, blob_path = app_module.upload_store.save(io.BytesIO(data), 'pdf')
+    metadata = {'original_filename': 'yonetmelik.pdf', 'original_file_path': blob_path, 'file_type': 'pdf'}
+    name = app_module.document_store.create({'mevzuat_basligi': 'T', 'maddeler': [], '_metadata': metadata})
+    return name, metadata
+
+
+def test_full_save_keeps_the_stored_metadata(app_module):
+    name, metadata = pdf_record(app_module)
+    client = app_module.app.test_client()
+
+    response = client.post(f'/save/{name}', json={
+        'mevzuat_basligi': 'Yeni',
+        'maddeler': [],
+        '_metadata': {'original_file_path': '../../etc/passwd', 'file_type': 'pdf', 'version': 99}
+    })
+
+    stored = app_module.document_store.load(name)
+    assert response.get_json()['success']
+    assert stored['mevzuat_basligi'] == 'Yeni'
+    assert stored['_metadata'] == dict(metadata, version=1)
+
+
+def test_full_save_does_not_create_records(app_module):
+    response = app_module.app.test_client().post('/save/mevzuat_missing.json', json={'maddeler': []})
+
+    assert response.status_code == 404
+    assert not app_module.document_store.exists('mevzuat_missing.json')
+
+
+def test_pdf_view_only_serves_blobs(app_module, tmp_path):
+    secret = tmp_path / 'secret.pdf'
+    secret.write_bytes(b'%PDF-1.4 secret')
+    name, _ = pdf_record(app_module, b'%PDF-1.4 served')
+    outside = app_module.document_store.create({'mevzuat_basligi': 'T', 'maddeler': [], '_metadata': {
+        'original_file_path': os.path.relpath(str(secret), app_module.app.config['UPLOAD_FOLDER']),
+        'file_type': 'pdf'
+    }})
+    client = app_module.app.test_client()
+
+    assert client.get(f'/view-pdf/{name}').data == b'%PDF-1.4 served'
+    assert client.get(f'/view-pdf/{outside}').status_code == 404
+
+
+def test_blueprint_full_save_keeps_the_stored_metadata(tmp_path):
+    from flask import Flask
+
+    from blueprint_conversion import legal_parser
+    from document_store import DocumentStore
+
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config['LEGAL_PARSER_UPLOAD_FOLDER'] = str(tmp_path)
+    app.register_blueprint(legal_parser)
+    metadata = {'original_filename': 'yonetmelik.pdf', 'file_type': 'pdf'}
+    name = DocumentStore(str(tmp_path)).create({'mevzuat_basligi': 'T', 'maddeler': [], '_metadata': metadata})
+
+    app.test_client().post(f'/legal-parser/save/{name}', json={
+        'mevzuat_basligi': 'Yeni', 'maddeler': [], '_metadata': {'original_file_path': '/etc/passwd'}
+    })
+
+    assert DocumentStore(str(tmp_path)).load(name)['_metadata'] == dict(metadata, version=1)
+
+
+def test_app_serves_only_the_read_routes_of_the_api(app_module):
+    client = app_module.app.test_client()
+
+    assert client.get('/api/legal-parser/search?q=madde').status_code == 200
+    assert client.post('/api/legal-parser/parse').status_code == 404
+    assert client.post('/api/legal-parser/parse-batch').status_code == 404
+    assert client.post('/api/legal-parser/jobs').status_code == 404
+    assert 'legal_parser_batch_executor' not in app_module.app.extensions
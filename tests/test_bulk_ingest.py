@@ -0,0 +1,30 @@
+import glob
+import os
+import shutil
+
+import json_codec
+from bulk_ingest import ingest
+from document_parser import PARSER_VERSION, options_version
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SAMPLE_PDF = sorted(glob.glob(os.path.join(ROOT, 'attached_assets', '*.pdf')))[0]
+
+
+def test_options_version_matches_the_cache_key_format():
+    assert options_version() == PARSER_VERSION
+    assert options_version('chars', True, True) == f"{PARSER_VERSION}+chars+docx-numbering+structured"
+
+
+def test_documents_are_only_skipped_for_the_same_options(tmp_path):
+    source = tmp_path / 'arsiv'
+    source.mkdir()
+    shutil.copy(SAMPLE_PDF, str(source / 'yonerge.pdf'))
+    output = str(tmp_path / 'mevzuat.jsonl')
+
+    assert ingest([str(source)], output, workers=1)['parsed'] == 1
+    assert ingest([str(source)], output, workers=1, structured=True)['parsed'] == 1
+    assert ingest([str(source)], output, workers=1, structured=True)['skipped'] == 1
+
+    with open(output, encoding='utf-8') as f:
+        versions = [json_codec.loads(line)['_metadata']['parser_version'] for line in f]
+    assert versions == [PARSER_VERSION, f"{PARSER_VERSION}+structured"]
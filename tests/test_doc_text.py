@@ -0,0 +1,203 @@
+import struct
+
+import pytest
+from docx import Document
+
+import doc_text
+from doc_text import DocFormatError, OLE_SIGNATURE
+from document_parser import DocumentParser
+
+SECTOR = 512
+END_OF_CHAIN = 0xFFFFFFFE
+FREE_SECTOR = 0xFFFFFFFF
+FAT_SECTOR = 0xFFFFFFFD
+
+# FIB layout used by the fixtures: 14 fibRgW words and 22 fibRgLw longs, so the
+# fibRgFcLcb array starts at 154 and fcClx/lcbClx (its 34th pair) at 418
+TEXT_OFFSET = 1024
+
+
+def _sectors(data: bytes) -> int:
+    return -(-len(data) // SECTOR)
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b'\0' * (_sectors(data) * SECTOR - len(data))
+
+
+def _directory_entry(name: str, entry_type: int, start: int, size: int) -> bytes:
+    encoded = (name + '\0').encode('utf-16-le')
+    entry = bytearray(128)
+    entry[:len(encoded)] = encoded
+    struct.pack_into('<HB', entry, 64, len(encoded), entry_type)
+    struct.pack_into('<IQ', entry, 116, start, size)
+    return bytes(entry)
+
+
+def compound_file(streams, fat_patch=None) -> bytes:
+    """A version 3 Compound File with one FAT sector, one directory sector and the given streams.
+
+    Streams are stored in regular sectors (the mini stream cutoff is 0);
+    fat_patch maps sector numbers to replacement FAT entries.
+    """
+    fat = [FAT_SECTOR, END_OF_CHAIN]
+    entries = [_directory_entry('Root Entry', 5, END_OF_CHAIN, 0)]
+    body = b''
+    for name, data in streams.items():
+        first = len(fat)
+        count = _sectors(data)
+        fat.extend(list(range(first + 1, first + count)) + [END_OF_CHAIN])
+        entries.append(_directory_entry(name, 2, first, len(data)))
+        body += _pad(data)
+    for sector, value in (fat_patch or {}).items():
+        fat[sector] = value
+    fat += [FREE_SECTOR] * (SECTOR // 4 - len(fat))
+
+    header = bytearray(SECTOR)
+    header[:8] = OLE_SIGNATURE
+    struct.pack_into('<HHHHH', header, 0x18, 0x3E, 3, 0xFFFE, 9, 6)
+    struct.pack_into('<IIIIIIII', header, 0x2C, 1, 1, 0, 0, END_OF_CHAIN, 0, END_OF_CHAIN, 0)
+    struct.pack_into('<109I', header, 0x4C, 0, *[FREE_SECTOR] * 108)
+    directory = b''.join(entries) + bytes(128 * (4 - len(entries)))
+    return bytes(header) + struct.pack(f'<{len(fat)}I', *fat) + directory + body
+
+
+def word_document(pieces, ccp_text=None, n_fib=0x00C1, flags=0, fat_patch=None) -> bytes:
+    """A Word 97 file whose piece table holds one piece per (text, eight_bit) pair."""
+    text = b''
+    cps = [0]
+    descriptors = []
+    for piece, eight_bit in pieces:
+        offset = TEXT_OFFSET + len(text)
+        if eight_bit:
+            descriptors.append(0x40000000 | offset * 2)
+            text += piece.encode('cp1252')
+        else:
+            descriptors.append(offset)
+            text += piece.encode('utf-16-le')
+        cps.append(cps[-1] + len(piece))
+
+    word = bytearray(TEXT_OFFSET)
+    struct.pack_into('<HH', word, 0, 0xA5EC, n_fib)
+    struct.pack_into('<H', word, 0x0A, flags)
+    struct.pack_into('<H', word, 32, 14)
+    struct.pack_into('<H', word, 62, 22)
+    struct.pack_into('<I', word, 76, cps[-1] if ccp_text is None else ccp_text)
+    struct.pack_into('<H', word, 152, 93)
+
+    plc = struct.pack(f'<{len(cps)}I', *cps) + b''.join(struct.pack('<HIH', 0, fc, 0) for fc in descriptors)
+    clx = b'\x02' + struct.pack('<I', len(plc)) + plc
+    struct.pack_into('<II', word, 418, 0, len(clx))
+    return compound_file({'WordDocument': bytes(word) + text, '0Table': clx}, fat_patch)
+
+
+def write(tmp_path, data: bytes, name='belge.doc') -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_reads_eight_bit_and_utf16_pieces_in_order(tmp_path):
+    # Characters outside cp1252 (ğ, ı, ş) only occur in UTF-16 pieces
+    path = write(tmp_path, word_document([
+        ('Öğrenci İşleri ', False),
+        ('Yönetmelik\rMADDE 1 – ', True),
+        ('Bu yönetmeliğin amacı; sınav işlerini düzenlemektir.\r', False),
+    ]))
+
+    assert doc_text.extract_text(path) == (
+        'Öğrenci İşleri Yönetmelik\nMADDE 1 – Bu yönetmeliğin amacı; sınav işlerini düzenlemektir.\n')
+
+
+def test_skips_text_after_the_main_document(tmp_path):
+    main = 'Ana metin\r'
+    path = write(tmp_path, word_document([(main, True), ('Sayfa üstbilgisi\r', False)], ccp_text=len(main)))
+
+    assert list(doc_text.iter_paragraph_texts(path)) == ['Ana metin', '']
+
+
+def test_control_characters_and_fields_in_a_document(tmp_path):
+    path = write(tmp_path, word_document([('Sayfa \x13 PAGE \x143\x15\x0bgeçici\x1emadde\x07', False)]))
+
+    assert doc_text.extract_text(path) == 'Sayfa 3\ngeçici-madde\n'
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('düz metin', 'düz metin'),
+    ('Sayfa \x13 PAGE \x1442\x15 / 50', 'Sayfa 42 / 50'),
+    ('önce\x13 HYPERLINK "x" \x14bağlantı\x15sonra', 'öncebağlantısonra'),
+    # A field without a result leaves nothing behind
+    ('a\x13 TC "başlık" \x15b', 'ab'),
+    # Nested field inside another field's code: only the outer result is kept
+    ('\x13 IF \x13 PAGE \x141\x15 = 1 "x" \x14ilk\x15 sayfa', 'ilk sayfa'),
+    # Nested field inside the result is replaced by its own result
+    ('\x13 REF a \x14madde \x13 SEQ \x147\x15\x15.', 'madde 7.'),
+    # Stray marks do not drop the following text
+    ('x\x15y\x13 A \x14b\x15', 'xyb'),
+])
+def test_strip_fields(text, expected):
+    assert doc_text._strip_fields(text) == expected
+
+
+def test_rejects_encrypted_documents(tmp_path):
+    path = write(tmp_path, word_document([('gizli', True)], flags=0x0100))
+
+    with pytest.raises(DocFormatError, match='Encrypted'):
+        doc_text.extract_text(path)
+
+
+def test_rejects_word95_documents(tmp_path):
+    path = write(tmp_path, word_document([('eski', True)], n_fib=0x0065))
+
+    with pytest.raises(DocFormatError, match='Word 6.0/95'):
+        doc_text.extract_text(path)
+
+
+@pytest.mark.parametrize('fat_patch, message', [
+    # WordDocument occupies sectors 2-5: send the chain back to its first sector
+    ({4: 2}, 'does not terminate'),
+    ({3: 3}, 'does not terminate'),
+    ({3: 100_000}, 'outside the allocation table'),
+    # Listed in the FAT but past the end of the file
+    ({3: 100}, 'out of range'),
+])
+def test_rejects_broken_sector_chains(tmp_path, fat_patch, message):
+    path = write(tmp_path, word_document([('metin ' * 100, True)], fat_patch=fat_patch))
+
+    with pytest.raises(DocFormatError, match=message):
+        doc_text.extract_text(path)
+
+
+def test_rejects_files_that_are_not_compound_files(tmp_path):
+    path = write(tmp_path, b'{\\rtf1 ' + bytes(600))
+
+    assert not doc_text.is_ole_file(path)
+    with pytest.raises(DocFormatError):
+        doc_text.extract_text(path)
+
+
+def test_parser_reads_binary_doc(tmp_path):
+    path = write(tmp_path, word_document([
+        ('SINAV YÖNETMELİĞİ\rMADDE 1 – ', False),
+        ('(1) Bu Yönetmeliğin amacı sınavları düzenlemektir.\r', False),
+        ('MADDE 2 – (1) Bu Yönetmelik Rektör yürütür.\r', True),
+    ]))
+
+    result = DocumentParser().parse_document(path)
+
+    assert len(result['maddeler']) == 2
+
+
+def test_parser_dispatches_on_content_not_extension(tmp_path):
+    # A .docx package saved under a .doc name is read as a .docx
+    document = Document()
+    for text in ('SINAV YÖNETMELİĞİ', 'MADDE 1 – (1) Bu Yönetmeliğin amacı sınavları düzenlemektir.',
+                 'MADDE 2 – (1) Yönetmelik yayımı tarihinde yürürlüğe girer.'):
+        document.add_paragraph(text)
+    path = str(tmp_path / 'yonetmelik.doc')
+    document.save(path)
+
+    assert not doc_text.is_ole_file(path)
+    result = DocumentParser().parse_document(path)
+
+    assert len(result['maddeler']) == 2
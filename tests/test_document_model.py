@@ -0,0 +1,44 @@
+import glob
+import os
+import sys
+
+import pytest
+
+import json_codec
+from document_model import ParsedDocument
+from document_parser import DocumentParser
+from metrics import Metrics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from corpus import synthetic_regulation  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SAMPLE_PDF = sorted(glob.glob(os.path.join(ROOT, 'attached_assets', '*.pdf')))[0]
+
+
+@pytest.mark.parametrize('structured', [False, True])
+def test_dumps_document_matches_the_dict(structured):
+    document = DocumentParser()._parse_legal_stream([synthetic_regulation(articles=50, bent_depth=2)],
+                                                   structured=structured)
+    metadata = {'_metadata': {'original_filename': 'yönetmelik.pdf', 'parser_version': '1.2.0'}}
+
+    assert json_codec.dumps_document(document, metadata) == \
+        json_codec.dumps_bytes(dict(document.to_dict(), **metadata))
+
+
+@pytest.mark.parametrize('structured', [False, True])
+def test_parse_document_builds_the_dict_directly(structured):
+    metrics = Metrics()
+    parser = DocumentParser(metrics=metrics)
+
+    result = parser.parse_document(SAMPLE_PDF, structured=structured)
+    document = parser.parse_document_model(SAMPLE_PDF, structured=structured)
+
+    assert isinstance(result, dict)
+    assert isinstance(document, ParsedDocument)
+    assert result == document.to_dict()
+    # Both paths feed the same article and fıkra counters
+    counters = metrics._counters
+    assert set(counters['parser_articles_total'].values()) == {2 * len(document)}
+    assert set(counters['parser_paragraphs_total'].values()) == {2 * document.paragraph_count}
@@ -0,0 +1,52 @@
+import multiprocessing
+import os
+
+import pytest
+
+from document_store import LOCK_DIRNAME, LOCK_STRIPES, DocumentStore, SqliteDocumentStore
+
+DOCUMENT = {
+    'mevzuat_basligi': 'SINAV YÖNETMELİĞİ',
+    'maddeler': [{'madde_numarasi': '1', 'fikralar': ['Bu Yönetmeliğin amacı sınavları düzenlemektir.']}],
+}
+
+
+def _read_title(store, name, inherited, results):
+    title = store.load(name)['mevzuat_basligi']
+    results.put((title, store._pool.queue[0] is not inherited))
+
+
+def test_schema_connection_is_not_pooled(tmp_path):
+    store = SqliteDocumentStore(str(tmp_path / 'documents.sqlite3'))
+
+    assert store._pool.empty()
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs fork')
+def test_forked_process_opens_its_own_connections(tmp_path):
+    store = SqliteDocumentStore(str(tmp_path / 'documents.sqlite3'))
+    name = store.create(dict(DOCUMENT))
+    inherited = store._pool.queue[0]
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    child = context.Process(target=_read_title, args=(store, name, inherited, results))
+    child.start()
+    title, own_connection = results.get(timeout=10)
+    child.join(10)
+
+    assert child.exitcode == 0
+    assert title == DOCUMENT['mevzuat_basligi']
+    assert own_connection
+    # The parent's pooled connection is still the one it uses
+    assert store._pool.queue == [inherited]
+    assert store.load(name)['mevzuat_basligi'] == DOCUMENT['mevzuat_basligi']
+
+
+def test_json_store_lock_files_do_not_grow_with_the_archive(tmp_path):
+    store = DocumentStore(str(tmp_path))
+    for _ in range(LOCK_STRIPES * 3):
+        name = store.create(dict(DOCUMENT))
+        store.update(name, lambda document: document)
+
+    assert len(os.listdir(tmp_path / LOCK_DIRNAME)) <= LOCK_STRIPES
@@ -0,0 +1,57 @@
+import pytest
+from flask import Flask
+
+import json_codec
+from blueprint_conversion import legal_parser
+from document_store import create_document_store, download_payload
+
+DOCUMENT = {
+    'mevzuat_basligi': 'Yönetmelik',
+    'maddeler': [{'madde_numarasi': 'MADDE 1', 'fikralar': ['(1) Amaç.']}],
+    '_metadata': {'original_filename': 'yonetmelik.pdf'}
+}
+
+
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+def test_plain_records_are_pretty_printed(tmp_path, backend):
+    documents = create_document_store(backend, str(tmp_path), db_path=str(tmp_path / 'documents.db'))
+    name = documents.create(dict(DOCUMENT))
+
+    data, encoding, varies = download_payload(documents, name, lambda encoding: True)
+
+    assert encoding is None and not varies
+    assert data.startswith(b'{\n  "mevzuat_basligi"')
+    assert json_codec.loads(data)['maddeler'] == DOCUMENT['maddeler']
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config['LEGAL_PARSER_UPLOAD_FOLDER'] = str(tmp_path)
+    app.register_blueprint(legal_parser)
+    return app.test_client()
+
+
+def test_blueprint_download_pretty_prints_plain_records(client, tmp_path):
+    name = create_document_store('json', str(tmp_path)).create(dict(DOCUMENT))
+
+    response = client.get(f'/legal-parser/download/{name}')
+
+    assert response.status_code == 200
+    assert response.headers.get('Content-Encoding') is None
+    assert response.data == json_codec.dumps_bytes(json_codec.read_record(str(tmp_path / name)), pretty=True)
+
+
+def test_blueprint_download_passes_compressed_records_through(client, tmp_path):
+    client.application.config['LEGAL_PARSER_DOCUMENT_COMPRESSION'] = 'gzip'
+    name = create_document_store('json', str(tmp_path), compression='gzip').create(dict(DOCUMENT))
+
+    accepted = client.get(f'/legal-parser/download/{name}', headers={'Accept-Encoding': 'gzip'})
+    refused = client.get(f'/legal-parser/download/{name}', headers={'Accept-Encoding': 'identity'})
+
+    assert accepted.headers['Content-Encoding'] == 'gzip'
+    assert accepted.data == (tmp_path / name).read_bytes()
+    assert 'Accept-Encoding' in accepted.headers['Vary']
+    assert refused.headers.get('Content-Encoding') is None
+    assert refused.data.startswith(b'{\n  "mevzuat_basligi"')
+    assert 'Accept-Encoding' in refused.headers['Vary']
@@ -0,0 +1,76 @@
+import pytest
+
+from json_patch import changed_items, touches_member
+
+
+@pytest.mark.parametrize('operation', [
+    {'op': 'replace', 'path': '/_metadata/version', 'value': 9},
+    {'op': 'remove', 'path': '/_metadata'},
+    {'op': 'move', 'from': '/_metadata', 'path': '/foo'},
+    {'op': 'move', 'from': '/_metadata/original_file_path', 'path': '/foo'},
+    {'op': 'copy', 'from': '/_metadata', 'path': '/foo'},
+])
+def test_metadata_operations_are_detected(operation):
+    assert touches_member([operation], '_metadata')
+
+
+def test_other_members_are_not_metadata():
+    patch = [
+        {'op': 'replace', 'path': '/mevzuat_basligi', 'value': 'x'},
+        {'op': 'move', 'from': '/maddeler/0', 'path': '/maddeler/1'},
+        {'op': 'add', 'path': '/_metadata_notes', 'value': 'x'},
+    ]
+    assert not touches_member(patch, '_metadata')
+
+
+def test_patch_cannot_move_metadata_away(app_module):
+    metadata = {'original_file_path': 'blobs/ab/abcd.pdf', 'file_type': 'pdf'}
+    name = app_module.document_store.create({'mevzuat_basligi': 'T', 'maddeler': [], '_metadata': dict(metadata)})
+
+    response = app_module.app.test_client().patch(f'/save/{name}', json={
+        'version': 0,
+        'patch': [{'op': 'move', 'from': '/_metadata', 'path': '/foo'}],
+    })
+
+    assert response.status_code == 400
+    stored = app_module.document_store.load(name)
+    assert stored['_metadata'] == metadata
+    assert 'foo' not in stored
+
+
+@pytest.mark.parametrize('patch, expected', [
+    ([{'op': 'replace', 'path': '/maddeler/3/fikralar/0', 'value': 'x'}], {3}),
+    ([{'op': 'add', 'path': '/maddeler/3/fikralar/-', 'value': 'x'},
+      {'op': 'replace', 'path': '/maddeler/7', 'value': {}}], {3, 7}),
+    ([{'op': 'move', 'from': '/maddeler/1/fikralar/0', 'path': '/maddeler/2/fikralar/0'}], {1, 2}),
+    ([{'op': 'copy', 'from': '/maddeler/1/fikralar/0', 'path': '/maddeler/2/fikralar/0'}], {2}),
+    ([{'op': 'test', 'path': '/maddeler', 'value': []}], set()),
+    ([{'op': 'replace', 'path': '/mevzuat_basligi', 'value': 'x'}], set()),
+    ([{'op': 'add', 'path': '/maddeler/3', 'value': {}}], None),
+    ([{'op': 'remove', 'path': '/maddeler/3'}], None),
+    ([{'op': 'move', 'from': '/maddeler/3', 'path': '/maddeler/1/x'}], None),
+    ([{'op': 'replace', 'path': '/maddeler', 'value': []}], None),
+    ([{'op': 'add', 'path': '/maddeler/-', 'value': {}}], None),
+])
+def test_changed_items(patch, expected):
+    assert changed_items(patch, 'maddeler') == expected
+
+
+def test_autosave_reindexes_only_the_patched_article(app_module, monkeypatch):
+    document = {'mevzuat_basligi': 'T', 'maddeler': [
+        {'madde_numarasi': f'MADDE {i}', 'fikralar': [f'({i}) Öğrenci kaydı.']} for i in range(1, 4)
+    ]}
+    name = app_module.document_store.create(document)
+    app_module.search_index.index_document(name, document)
+    monkeypatch.setattr(app_module.search_index, 'index_document',
+                        lambda *args: pytest.fail('whole document re-indexed'))
+
+    response = app_module.app.test_client().patch(f'/save/{name}', json={
+        'version': 0,
+        'patch': [{'op': 'replace', 'path': '/maddeler/1/fikralar/0', 'value': '(1) Danışman ataması.'}],
+    })
+
+    assert response.status_code == 200
+    hits = app_module.search_index.search('danışman', document=name)['hits']
+    assert [hit['madde_numarasi'] for hit in hits] == ['MADDE 2']
+    assert app_module.search_index.search('öğrenci', document=name)['total'] == 2
@@ -0,0 +1,77 @@
+import io
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask
+
+from blueprint_conversion import api_version
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.register_blueprint(api_version.api)
+    app.config['LEGAL_PARSER_CACHE_BACKEND'] = 'none'
+    return app
+
+
+def archive(members):
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, 'w', zipfile.ZIP_DEFLATED) as z:
+        for name, content in members.items():
+            z.writestr(name, content)
+    return io.BytesIO(data.getvalue())
+
+
+def refuses_before_extracting(app, monkeypatch, **config):
+    app.config.update(config)
+    upload = archive({f'{i}.pdf': b'\0' * 4096 for i in range(3)})
+    opened = []
+    original_open = zipfile.ZipFile.open
+    monkeypatch.setattr(zipfile.ZipFile, 'open',
+                        lambda self, *args, **kwargs: opened.append(args) or original_open(self, *args, **kwargs))
+    response = app.test_client().post('/api/legal-parser/parse-batch', data={'files': [(upload, 'arsiv.zip')]})
+    assert opened == []
+    return response
+
+
+def test_archive_with_too_many_members_is_refused_before_extraction(app, monkeypatch):
+    response = refuses_before_extracting(app, monkeypatch, LEGAL_PARSER_BATCH_MAX_FILES=2)
+    assert response.status_code == 400
+    assert response.json['error'] == 'Invalid batch size'
+
+
+def test_archive_over_total_size_is_refused_before_extraction(app, monkeypatch):
+    response = refuses_before_extracting(app, monkeypatch, LEGAL_PARSER_BATCH_MAX_BYTES=10000)
+    assert response.status_code == 413
+    assert response.json['error'] == 'Batch too large'
+
+
+def test_closed_ndjson_stream_waits_for_running_parses(app, monkeypatch):
+    release = threading.Event()
+    seen = []
+
+    def slow_parse(filepath):
+        release.wait(5)
+        seen.append(os.path.exists(filepath))
+        return None
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(api_version, '_parse_in_worker', slow_parse)
+    monkeypatch.setattr(api_version, 'get_batch_executor', lambda: executor)
+
+    files = [(io.BytesIO(b'%PDF-1.4'), 'a.pdf'), (io.BytesIO(b'%PDF-1.4'), 'b.pdf'), (io.BytesIO(b'x'), 'c.txt')]
+    response = app.test_client().post('/api/legal-parser/parse-batch?stream=ndjson',
+                                      data={'files': files}, buffered=False)
+    lines = iter(response.response)
+    assert b'Invalid file type' in next(lines)
+
+    threading.Timer(0.2, release.set).start()
+    response.close()
+    executor.shutdown()
+
+    # The running parse saw its file; the queued one was cancelled, not run on a deleted folder
+    assert seen == [True]
@@ -0,0 +1,61 @@
+import os
+
+import parse_cache
+from parse_cache import DiskCacheBackend
+
+
+def test_disk_cache_evicts_least_recently_used_entries(tmp_path):
+    backend = DiskCacheBackend(str(tmp_path), max_bytes=250)
+    backend.set('a', b'a' * 100)
+    backend.set('b', b'b' * 100)
+    os.utime(tmp_path / 'a.json', (1, 1))
+    os.utime(tmp_path / 'b.json', (2, 2))
+
+    backend.set('c', b'c' * 100)
+
+    assert backend.get('a') is None
+    assert backend.get('b') == b'b' * 100
+    assert backend.current_bytes == 200
+
+
+def test_disk_cache_scans_only_when_the_estimate_overflows(tmp_path, monkeypatch):
+    backend = DiskCacheBackend(str(tmp_path), max_bytes=1000)
+    backend.set('first', b'x' * 100)
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(parse_cache.os, 'scandir', lambda path: scans.append(path) or scandir(path))
+
+    for index in range(8):
+        backend.set(f'k{index}', b'x' * 100)
+    # Rewriting an entry replaces its size instead of adding to it
+    backend.set('k0', b'x' * 100)
+    assert scans == []
+    assert backend.current_bytes == 900
+
+    backend.set('k9', b'x' * 200)
+    assert len(scans) == 1
+    assert backend.current_bytes <= 1000
+
+
+def test_disk_cache_rescans_after_the_interval(tmp_path, monkeypatch):
+    backend = DiskCacheBackend(str(tmp_path), max_bytes=1000, rescan_seconds=0)
+    backend.set('a', b'x' * 10)
+    # Written by another worker
+    (tmp_path / 'other.json').write_bytes(b'y' * 50)
+
+    backend.set('b', b'x' * 10)
+
+    assert backend.current_bytes == 70
+
+
+def test_disk_cache_get_misses_when_the_entry_is_evicted_concurrently(tmp_path, monkeypatch):
+    backend = DiskCacheBackend(str(tmp_path))
+    backend.set('a', b'payload')
+
+    def evicted(path):
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(parse_cache.os, 'utime', evicted)
+
+    assert backend.get('a') is None
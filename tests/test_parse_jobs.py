@@ -0,0 +1,84 @@
+import time
+
+from parse_jobs import JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, STALE_JOB_ERROR, JobQueue, JobStore
+
+
+def age(store, job_id, column, seconds):
+    with store._connect() as conn:
+        conn.execute(f'UPDATE jobs SET {column} = ? WHERE id = ?', (time.time() - seconds, job_id))
+
+
+def test_jobs_left_by_a_crashed_worker_fail_when_the_store_opens(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    store = JobStore(db_path, stale_seconds=60)
+    for job_id in ('queued', 'running', 'recent', 'done'):
+        store.create(job_id, f'{job_id}.pdf')
+    store.mark_running('running')
+    store.mark_running('done')
+    store.mark_done('done', {'json_filename': 'mevzuat_1.json'})
+    age(store, 'queued', 'created_at', 120)
+    age(store, 'running', 'started_at', 120)
+    age(store, 'done', 'started_at', 120)
+
+    # The crashed process is gone; a new one opens the same file
+    reopened = JobStore(db_path, stale_seconds=60)
+
+    statuses = {job_id: reopened.get(job_id)['status'] for job_id in ('queued', 'running', 'recent', 'done')}
+    assert statuses == {'queued': JOB_FAILED, 'running': JOB_FAILED, 'recent': JOB_QUEUED, 'done': JOB_DONE}
+    assert reopened.get('running')['error'] == STALE_JOB_ERROR
+    assert reopened.get('running')['finished_at'] is not None
+
+
+def test_polling_fails_a_job_that_timed_out(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'), stale_seconds=60)
+    store.create('job', 'yonetmelik.pdf')
+    store.mark_running('job')
+    assert store.get('job')['status'] == JOB_RUNNING
+
+    age(store, 'job', 'started_at', 120)
+
+    assert store.get('job')['status'] == JOB_FAILED
+
+
+def test_a_job_failed_as_stale_is_not_run(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'), stale_seconds=60)
+    store.create('job', 'yonetmelik.pdf')
+    age(store, 'job', 'created_at', 120)
+    store.fail_stale()
+    ran = []
+
+    queue = JobQueue(store)
+    # As submit() would have done for this job
+    queue._slots.acquire()
+    queue._run('job', lambda: ran.append(True) or {'json_filename': 'mevzuat_1.json'})
+
+    assert ran == []
+    assert store.get('job')['status'] == JOB_FAILED
+
+
+def test_cleanup_runs_when_a_stale_job_is_skipped(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'), stale_seconds=60)
+    store.create('job', 'yonetmelik.pdf')
+    age(store, 'job', 'created_at', 120)
+    store.fail_stale()
+    cleaned = []
+
+    queue = JobQueue(store)
+    queue._slots.acquire()
+    queue._run('job', lambda: {'json_filename': 'mevzuat_1.json'}, lambda: cleaned.append(True))
+
+    assert cleaned == [True]
+
+
+def test_a_slow_job_does_not_overwrite_a_stale_failure(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'), stale_seconds=60)
+    store.create('job', 'yonetmelik.pdf')
+    store.mark_running('job')
+    age(store, 'job', 'started_at', 120)
+    store.fail_stale()
+
+    store.mark_done('job', {'json_filename': 'mevzuat_1.json'})
+    store.mark_failed('job', 'Parsing failed')
+
+    job = store.get('job')
+    assert (job['status'], job['error'], job['result']) == (JOB_FAILED, STALE_JOB_ERROR, None)
@@ -0,0 +1,47 @@
+import search_index
+from search_index import SearchIndex
+
+
+def index_with(tmp_path, fikralar):
+    index = SearchIndex(str(tmp_path / 'search.sqlite3'))
+    index.index_document('mevzuat_1.json', {
+        'mevzuat_basligi': 'Yönetmelik',
+        'maddeler': [{'madde_numarasi': 'MADDE 1', 'fikralar': fikralar}]
+    })
+    return index
+
+
+def test_total_is_capped_at_the_ranking_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(search_index, 'RANK_WINDOW', 5)
+    index = index_with(tmp_path, [f'({i}) Öğrenci danışman seçer.' for i in range(1, 9)])
+
+    first = index.search('öğrenci', page=1, per_page=3)
+    last = index.search('öğrenci', page=2, per_page=3)
+
+    assert (first['total'], first['truncated']) == (5, True)
+    # Every counted hit can be paged to, and no further
+    assert len(first['hits']) + len(last['hits']) == 5
+    assert index.search('öğrenci', page=3, per_page=3)['hits'] == []
+
+
+def test_narrow_queries_are_exact(tmp_path, monkeypatch):
+    monkeypatch.setattr(search_index, 'RANK_WINDOW', 5)
+    index = index_with(tmp_path, ['(1) Öğrenci danışman seçer.', '(2) Tez savunması yapılır.'])
+
+    result = index.search('danışman')
+
+    assert (result['total'], result['truncated']) == (1, False)
+    assert len(result['hits']) == 1
+
+
+def test_window_keeps_the_best_ranked_hits(tmp_path, monkeypatch):
+    monkeypatch.setattr(search_index, 'RANK_WINDOW', 3)
+    # The best match (the term repeated in a short fıkra) is indexed last
+    fikralar = [f'({i}) Öğrenci ' + 'ders seçimi ve kayıt işlemleri ' * 5 for i in range(1, 9)]
+    fikralar.append('(9) Öğrenci öğrenci öğrenci.')
+    index = index_with(tmp_path, fikralar)
+
+    result = index.search('öğrenci', per_page=3)
+
+    assert result['truncated']
+    assert result['hits'][0]['fikra_index'] == 8
@@ -0,0 +1,108 @@
+import os
+import random
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from corpus import synthetic_regulation  # noqa: E402
+import document_parser  # noqa: E402
+from document_parser import ARTICLE_PATTERNS, DocumentParser  # noqa: E402
+
+# An article whose first fıkra starts with a reference to another article
+HEADER_THEN_REFERENCE = "BAŞLIK\nMADDE 5 –\nMadde 3'te belirtilen esaslar\n(2) x"
+
+
+def reference_segments(text):
+    """The original segmentation: every pattern scanned separately, sorted, then de-duplicated."""
+    matches = []
+    for pattern in ARTICLE_PATTERNS:
+        for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
+            matches.append((match.start(), match.end(), match.group().strip()))
+    matches.sort(key=lambda x: x[0])
+
+    kept = []
+    for start, end, header in matches:
+        if not any(abs(start - existing) <= 10 for existing, _, _ in kept):
+            kept.append((start, end, header))
+    return kept
+
+
+def mutated(text, rng):
+    """Split lines after article headers and glue references to the next line, as PDFs do."""
+    lines = text.split('\n')
+    out = []
+    for line in lines:
+        if rng.random() < 0.2 and re.match(r'(?i)madde \d+ [–.]', line):
+            head, _, rest = line.partition(' ')
+            number, _, rest = rest.partition(' ')
+            out.append(f'{head} {number} –')
+            line = f'Madde {rng.randint(1, 99)}\'de {rest}'
+        elif rng.random() < 0.05:
+            line = f'  {line}'
+        out.append(line)
+    return '\n'.join(out)
+
+
+def test_reference_to_another_article_is_not_a_header():
+    result = DocumentParser()._parse_legal_content(HEADER_THEN_REFERENCE)
+    assert result['maddeler'] == [
+        {'madde_numarasi': 'Madde 5', 'fikralar': ["Madde 3'te belirtilen esaslar", '(2) x']},
+    ]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_segments_match_the_original_algorithm(seed):
+    text = synthetic_regulation(articles=300, bent_depth=2, seed=seed)
+    text = mutated(text, random.Random(seed)) + HEADER_THEN_REFERENCE
+    assert DocumentParser()._segment_articles(text) == reference_segments(text)
+
+
+def random_chunks(text, rng, max_size):
+    """Split text at random positions, including inside article headers."""
+    chunks = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, max_size)
+        chunks.append(text[position:position + size])
+        position += size
+    return chunks
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_chunked_articles_match_a_full_rescan(seed, monkeypatch):
+    rng = random.Random(seed)
+    text = synthetic_regulation(articles=40, bent_depth=2, seed=seed)
+    text = mutated(text, rng) + HEADER_THEN_REFERENCE
+    chunks = random_chunks(text, rng, 400)
+    parser = DocumentParser()
+
+    incremental = list(parser._iter_articles(chunks, structured=True))
+    # A lookback longer than any buffer rescans from the start on every chunk
+    monkeypatch.setattr(document_parser, 'HEADER_LOOKBACK', len(text))
+    rescanned = list(parser._iter_articles(chunks, structured=True))
+
+    assert incremental == rescanned
+    assert len(incremental) > 30
+
+
+def test_long_article_is_not_rescanned_for_every_chunk(monkeypatch):
+    # One article (and text before it) arriving in many small chunks
+    chunks = ['Giriş metni ' * 5 + '\n'] * 200 + ['MADDE 1 – (1) Birinci fıkra.\n']
+    chunks += ['devam eden metin ' * 5 + '\n'] * 500 + ['MADDE 2 – (1) Son fıkra.']
+    whole = list(DocumentParser()._iter_articles([''.join(chunks)]))
+    scanned = []
+    segment = DocumentParser._segment_articles
+
+    def counting(self, text, start=0):
+        scanned.append(len(text) - start)
+        return segment(self, text, start)
+
+    monkeypatch.setattr(DocumentParser, '_segment_articles', counting)
+    articles = list(DocumentParser()._iter_articles(chunks))
+
+    assert articles == whole
+    assert len(articles) >= 1
+    assert sum(scanned) < 3 * sum(len(chunk) for chunk in chunks)
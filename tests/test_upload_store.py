@@ -0,0 +1,83 @@
+import io
+import os
+import sqlite3
+import time
+
+import pytest
+
+from document_store import create_document_store
+from upload_store import BLOB_DIRNAME, UploadStore
+
+
+def test_reupload_restarts_grace_period(tmp_path):
+    store = UploadStore(str(tmp_path))
+    _, relative_path = store.save(io.BytesIO(b'%PDF-1.4 test'), 'pdf')
+    full_path = os.path.join(str(tmp_path), relative_path)
+    old = time.time() - 2 * 3600
+    os.utime(full_path, (old, old))
+
+    assert store.save(io.BytesIO(b'%PDF-1.4 test'), 'pdf')[1] == relative_path
+    stats = store.collect_garbage(grace_seconds=3600, records=[])
+
+    assert stats['removed'] == []
+    assert os.path.exists(full_path)
+
+
+@pytest.fixture(params=['json', 'sqlite'])
+def documents(request, tmp_path):
+    return create_document_store(request.param, str(tmp_path), db_path=str(tmp_path / 'documents.db'))
+
+
+def legacy_record(tmp_path, documents, filename='1234_yonetmelik.pdf'):
+    (tmp_path / filename).write_bytes(b'%PDF-1.4 legacy')
+    return documents.create({
+        'mevzuat_basligi': 'Yönetmelik',
+        'maddeler': [],
+        '_metadata': {'original_file_path': filename, 'version': 1}
+    })
+
+
+def test_import_legacy_repoints_through_the_document_store(tmp_path, documents):
+    store = UploadStore(str(tmp_path))
+    name = legacy_record(tmp_path, documents)
+
+    stats = store.import_legacy(documents)
+
+    metadata = documents.load_metadata(name)
+    assert stats == {'records_updated': 1, 'legacy_files': 1}
+    assert metadata['original_file_path'].startswith(BLOB_DIRNAME + os.sep)
+    assert metadata['version'] == 2
+    assert os.path.exists(os.path.join(str(tmp_path), metadata['original_file_path']))
+    assert not (tmp_path / '1234_yonetmelik.pdf').exists()
+
+
+def test_import_legacy_keeps_file_when_record_update_fails(tmp_path, documents, monkeypatch):
+    store = UploadStore(str(tmp_path))
+    name = legacy_record(tmp_path, documents)
+
+    def failing_update(*args, **kwargs):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(documents, 'update', failing_update)
+    stats = store.import_legacy(documents)
+
+    assert stats == {'records_updated': 0, 'legacy_files': 0}
+    assert documents.load_metadata(name)['original_file_path'] == '1234_yonetmelik.pdf'
+    assert (tmp_path / '1234_yonetmelik.pdf').exists()
+
+
+def test_import_legacy_leaves_records_edited_meanwhile(tmp_path, documents):
+    store = UploadStore(str(tmp_path))
+    name = legacy_record(tmp_path, documents)
+    listed = list(documents.iter_metadata())
+    # Someone saves the record between the metadata scan and the import's write
+    documents.update(name, lambda document: dict(document, mevzuat_basligi='Düzeltilmiş'))
+    documents.iter_metadata = lambda: iter(listed)
+
+    stats = store.import_legacy(documents)
+
+    metadata = documents.load_metadata(name)
+    assert stats == {'records_updated': 0, 'legacy_files': 0}
+    assert metadata['original_file_path'] == '1234_yonetmelik.pdf'
+    assert metadata['version'] == 2
+    assert (tmp_path / '1234_yonetmelik.pdf').exists()
@@ -0,0 +1,201 @@
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+import json_codec
+from document_store import DocumentRepository, VersionConflictError
+
+BLOB_DIRNAME = 'blobs'
+
+
+class UploadStore:
+    """Content-addressed store for uploaded source documents.
+
+    Each distinct file is kept exactly once under blobs/<aa>/<sha256>.<ext>
+    inside the upload folder. The mevzuat_*.json records point at their blob
+    through _metadata.original_file_path, which is what reference counts and
+    garbage collection are based on.
+    """
+
+    def __init__(self, upload_folder: str, chunk_size: int = 1024 * 1024):
+        self.logger = logging.getLogger(__name__)
+        self.upload_folder = upload_folder
+        self.blob_folder = os.path.join(upload_folder, BLOB_DIRNAME)
+        self.chunk_size = chunk_size
+        os.makedirs(self.blob_folder, exist_ok=True)
+
+    def blob_path(self, digest: str, extension: str) -> str:
+        """Path of a blob relative to the upload folder."""
+        return os.path.join(BLOB_DIRNAME, digest[:2], f"{digest}.{extension}")
+
+    def resolve(self, relative_path: str) -> Optional[str]:
+        """Absolute path of a blob, or None if relative_path points outside the blob store."""
+        blob_folder = os.path.realpath(self.blob_folder)
+        full_path = os.path.realpath(os.path.join(self.upload_folder, relative_path))
+        if os.path.commonpath([blob_folder, full_path]) != blob_folder or full_path == blob_folder:
+            return None
+        return full_path
+
+    def save(self, stream: BinaryIO, extension: str) -> Tuple[str, str]:
+        """Store a file stream, hashing it while it is written.
+
+        Returns (digest, path relative to the upload folder). If a blob with the
+        same content already exists the new copy is discarded and the existing
+        blob's mtime refreshed, so garbage collection's grace period starts over.
+        """
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.blob_folder, suffix='.part')
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in iter(lambda: stream.read(self.chunk_size), b''):
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            hex_digest = digest.hexdigest()
+            relative_path = self.blob_path(hex_digest, extension)
+            full_path = os.path.join(self.upload_folder, relative_path)
+
+            if os.path.exists(full_path):
+                self.logger.debug(f"Upload already stored as {relative_path}")
+                os.remove(temp_path)
+                # The blob may be unreferenced and past the grace period already;
+                # this upload's record is not written yet
+                os.utime(full_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.replace(temp_path, full_path)
+
+            return hex_digest, relative_path
+
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _records(self) -> List[str]:
+        return glob.glob(os.path.join(self.upload_folder, 'mevzuat_*.json'))
+
+    def _record_metadata(self) -> Iterable[Dict]:
+        for record_path in self._records():
+            try:
+                yield json_codec.read_record(record_path).get('_metadata') or {}
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Skipping unreadable record {record_path}: {str(e)}")
+
+    def reference_counts(self, records: Optional[Iterable[Dict]] = None) -> Counter:
+        """Count how many parse records reference each stored file.
+
+        records is an iterable of record _metadata blocks; by default the
+        mevzuat_*.json files in the upload folder are scanned.
+        """
+        counts = Counter()
+
+        for metadata in (self._record_metadata() if records is None else records):
+            if metadata.get('original_file_path'):
+                counts[os.path.normpath(metadata['original_file_path'])] += 1
+
+        return counts
+
+    def iter_blobs(self):
+        """Yield (relative path, absolute path) for every stored blob."""
+        for dirpath, _, filenames in os.walk(self.blob_folder):
+            for filename in filenames:
+                if filename.endswith('.part'):
+                    continue
+                full_path = os.path.join(dirpath, filename)
+                yield os.path.relpath(full_path, self.upload_folder), full_path
+
+    def collect_garbage(self, grace_seconds: int = 3600, dry_run: bool = False,
+                        records: Optional[Iterable[Dict]] = None) -> Dict:
+        """Remove blobs no record references any more.
+
+        Blobs younger than grace_seconds are kept so uploads whose record has
+        not been written yet are not collected.
+        """
+        counts = self.reference_counts(records)
+        cutoff = time.time() - grace_seconds
+        removed = []
+        freed_bytes = 0
+        kept = 0
+
+        for relative_path, full_path in self.iter_blobs():
+            stat = os.stat(full_path)
+            if counts[os.path.normpath(relative_path)] or stat.st_mtime > cutoff:
+                kept += 1
+                continue
+
+            if not dry_run:
+                os.remove(full_path)
+            removed.append(relative_path)
+            freed_bytes += stat.st_size
+
+        # Leftovers from interrupted uploads
+        for part_path in glob.glob(os.path.join(self.blob_folder, '*.part')):
+            if os.stat(part_path).st_mtime <= cutoff and not dry_run:
+                os.remove(part_path)
+
+        return {'removed': removed, 'freed_bytes': freed_bytes, 'kept': kept}
+
+    def import_legacy(self, documents: DocumentRepository, dry_run: bool = False) -> Dict:
+        """Move {uuid}_{filename} uploads into the blob store and repoint their records.
+
+        Records are rewritten through documents (the configured document
+        store), so the change takes the record's lock and bumps its version
+        like any other edit. The update is a compare-and-set against the
+        version the metadata was read at: a record edited in the meantime is
+        left alone (running the import again picks it up). A legacy file is
+        deleted only after every record pointing at it has been updated.
+        """
+        records_updated = 0
+        legacy_files = set()
+        # Legacy files some record could not be repointed from; they must stay
+        kept_files = set()
+
+        for name, metadata in list(documents.iter_metadata()):
+            original_path = metadata.get('original_file_path')
+            if not original_path or original_path.startswith(BLOB_DIRNAME + os.sep):
+                continue
+
+            legacy_path = os.path.join(self.upload_folder, original_path)
+            if not os.path.exists(legacy_path):
+                continue
+
+            extension = original_path.rsplit('.', 1)[-1].lower()
+            if dry_run:
+                records_updated += 1
+                legacy_files.add(legacy_path)
+                continue
+
+            with open(legacy_path, 'rb') as f:
+                _, relative_path = self.save(f, extension)
+
+            def repoint(document, relative_path=relative_path):
+                document.setdefault('_metadata', {})['original_file_path'] = relative_path
+                return document
+
+            try:
+                documents.update(name, repoint, expected_version=metadata.get('version', 0))
+            except VersionConflictError:
+                self.logger.warning(f"{name} changed during the import, keeping {original_path}")
+                kept_files.add(legacy_path)
+                continue
+            except Exception as e:
+                self.logger.warning(f"Could not repoint {name}, keeping {original_path}: {str(e)}")
+                kept_files.add(legacy_path)
+                continue
+
+            records_updated += 1
+            legacy_files.add(legacy_path)
+
+        # Legacy copies are only removed once every record pointing at them moved
+        if not dry_run:
+            for legacy_path in legacy_files - kept_files:
+                os.remove(legacy_path)
+
+        return {'records_updated': records_updated, 'legacy_files': len(legacy_files - kept_files)}